@@ -5,53 +5,66 @@
 import streamlit as st
 import pandas as pd
 import requests
-import plotly.express as px
 import plotly.graph_objects as go
-import indicadores
-from typing import Dict, List, Optional, Tuple
+from PIL import Image
+from nucleo.api import (
+    ESTADOS_DISJUNTOR, PRIORIDADE_INTERATIVA, APIClient, ChamadaUnica, CircuitoAberto, Disjuntor, EsperaExcedida,
+    FalhaRecente, Governador, Revalidador, TransporteHTTP
+)
+from nucleo.cache_respostas import CacheRespostas
+from nucleo.config import ConfigNucleo
+from nucleo.exportacao import FORMATOS, CacheExportacoes
+from nucleo.graficos import CORES_CICLOS, GeradorGraficos
+from nucleo.payloads import PayloadGeral, PayloadHabilidades
+from nucleo.processamento import ORDEM_CICLOS, AgregadosPainel, ProcessadorDados
+from nucleo.telemetria import METRICAS, Rastreamento, medir, rastrear
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
+from datetime import datetime
+import contextvars
+import functools
+import io
 import logging
+import logging.handlers
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as PrazoExcedido, as_completed
 
 # --------------------------------------------------------------------------
 # 1. CONFIGURAÇÕES E CONSTANTES
 # --------------------------------------------------------------------------
 
-@dataclass
-class ConfigApp:
-    """Classe para centralizar configurações da aplicação"""
+@dataclass(frozen=True)
+class ConfigApp(ConfigNucleo):
+    """Classe para centralizar configurações da aplicação (API, cache e dimensões em ConfigNucleo)"""
     PAGE_TITLE: str = "CECOM/CREDE 01 - Painel de Resultados"
     PAGE_ICON: str = "painel_cecom.png"
     LAYOUT: str = "wide"
     
-    # URLs e endpoints
-    API_URL: str = "https://criancaalfabetizada.caeddigital.net/portal/functions/getDadosResultado"
-    
-    # Timeout para requisições
-    REQUEST_TIMEOUT: int = 30
-    
-    # Etapas disponíveis
-    ETAPAS: set = frozenset({1, 2, 3, 4, 5})
-    
-    # Ciclos de avaliação
-    CICLOS: Dict[str, str] = frozenset({
-        "1": "1º Ciclo",
-        "2": "2º Ciclo",
-        "3": "3º Ciclo",
-    }.items())
-    
-    # Componentes curriculares
-    COMPONENTES: Dict[str, str] = frozenset({
-        "Língua Portuguesa": "LÍNGUA PORTUGUESA",
-        "Matemática": "MATEMÁTICA"
-    }.items())
-    
-    # Escolas indígenas (códigos conhecidos)
-    ESCOLAS_INDIGENAS: set = frozenset({
-        "23000291", "23244755", "23239174", "23564067", "23283610", 
-        "23215674", "23263423", "23061642", "23462353", "23062770",
-        "23241462", "23235411", "23241454", "23215682", "23263555"
-    })
+    # Imagens: reduzidas uma vez por processo para a largura de exibição e
+    # recodificadas em PNG com paleta (os logos têm poucas cores)
+    CORES_IMAGENS: int = 256
+    LARGURA_ICONE: int = 32
+    
+    # Cache de figuras, compartilhado pelo processo (bytes do JSON das figuras)
+    CACHE_FIGURAS_BYTES: int = 64 * 1024 * 1024
+    
+    # Gráfico de habilidades: habilidades por página/ranking e teto de habilidades
+    # por gráfico (limita o JSON enviado ao navegador)
+    HABILIDADES_POR_PAGINA: int = 15
+    MAX_HABILIDADES_GRAFICO: int = 40
+    
+    # Busca concorrente dos ciclos (gerais + habilidades)
+    BUSCA_CONCORRENTE: bool = True
+    # Threads de busca do processo, compartilhadas pelas sessões (as chamadas à
+    # API são limitadas pelo governador; acertos do cache não ocupam vaga)
+    TRABALHADORES_BUSCA: int = 24
+    # Prazo total (s) para todas as requisições de uma página
+    PRAZO_TOTAL_BUSCA: int = 40
+    # Exibe cada ciclo assim que seus dados chegam (requer a busca concorrente)
+    RENDERIZACAO_PROGRESSIVA: bool = True
 
 # Instância global da configuração
 config = ConfigApp()
@@ -60,11 +73,25 @@ config = ConfigApp()
 # 2. CONFIGURAÇÃO INICIAL E LOGGING
 # --------------------------------------------------------------------------
 
+@st.cache_resource(show_spinner=False)
+def configurar_logging():
+    """Grava a telemetria (uma linha JSON por etapa medida) em arquivo rotativo, uma vez por processo"""
+    Path(config.TELEMETRIA_LOG).parent.mkdir(parents=True, exist_ok=True)
+    manipulador = logging.handlers.RotatingFileHandler(
+        config.TELEMETRIA_LOG, maxBytes=config.TELEMETRIA_LOG_TAMANHO_MAXIMO, backupCount=2, encoding="utf-8"
+    )
+    manipulador.setFormatter(logging.Formatter("%(message)s"))
+    
+    log_telemetria = logging.getLogger("nucleo.telemetria")
+    log_telemetria.setLevel(logging.INFO)
+    log_telemetria.propagate = False
+    log_telemetria.addHandler(manipulador)
+
 def configurar_pagina():
     """Configura a página do Streamlit"""
     st.set_page_config(
         page_title=config.PAGE_TITLE,
-        page_icon=config.PAGE_ICON,
+        page_icon=carregar_imagem(config.PAGE_ICON, config.LARGURA_ICONE) or config.PAGE_ICON,
         layout=config.LAYOUT,
         initial_sidebar_state="expanded"
     )
@@ -262,6 +289,7 @@ def inicializar_sessao():
     session_defaults = {
         'authenticated': False,
         'codigo': None,
+        'admin': False,
         'dados_cache': {}
     }
     
@@ -269,6 +297,37 @@ def inicializar_sessao():
         if key not in st.session_state:
             st.session_state[key] = value
 
+@st.cache_resource(show_spinner=False)
+def carregar_imagem(arquivo: str, largura: int) -> Optional[bytes]:
+    """
+    Lê, reduz e recodifica uma imagem uma única vez por processo
+    
+    Sem isso, o st.image abre o PNG original (até 3000 px), reduz e
+    recodifica a imagem a cada execução do script. Já na largura de exibição
+    e em PNG, os bytes são repassados sem reprocessamento e a URL de mídia,
+    derivada do conteúdo, é a mesma em todas as execuções.
+    
+    Args:
+        arquivo: Caminho da imagem original
+        largura: Largura de exibição (px)
+        
+    Returns:
+        Bytes do PNG reduzido, ou None se o arquivo não existir
+    """
+    caminho = Path(arquivo)
+    if not caminho.exists():
+        return None
+    
+    with Image.open(caminho) as imagem:
+        largura_final = min(imagem.width, largura)
+        altura_final = max(1, round(imagem.height * largura_final / imagem.width))
+        reduzida = imagem.resize((largura_final, altura_final), Image.LANCZOS)
+    
+    paleta = reduzida.quantize(config.CORES_IMAGENS, method=Image.Quantize.FASTOCTREE)
+    saida = io.BytesIO()
+    paleta.save(saida, "PNG", optimize=True)
+    return saida.getvalue()
+
 def exibir_logos():
     """Exibe os logos institucionais"""
     # Logos institucionais
@@ -283,8 +342,9 @@ def exibir_logos():
     
     for i, (logo, width) in enumerate(logos):
         with cols[i]:
-            if Path(logo).exists():
-                st.image(logo, width=width)
+            imagem = carregar_imagem(logo, width)
+            if imagem:
+                st.image(imagem, width=width)
             else:
                 st.warning(f"Logo {logo} não encontrado")
 
@@ -302,85 +362,108 @@ def carregar_credenciais() -> Tuple[Dict, Dict, str, str]:
         st.error(f" Erro na configuração: {e}. Verifique o arquivo secrets.toml")
         st.stop()
 
+def carregar_agregado_crede() -> Optional[str]:
+    """Código do agregado da CREDE usado na comparação regional (opcional)"""
+    try:
+        return st.secrets["regional"]["agregado"]
+    except KeyError:
+        return None
+
 # --------------------------------------------------------------------------
-# 3. CLASSES DE DADOS
+# 3. CLIENTE DA API
 # --------------------------------------------------------------------------
+# Payloads, cliente e processamento ficam no pacote nucleo; aqui ficam apenas
+# as instâncias compartilhadas pelo processo e o retorno na interface.
 
-@dataclass
-class PayloadBase:
-    """Classe base para payloads da API"""
-    entidade: str
-    componente: str
-    etapa: int
-    ciclo: str
-    installation_id: str
-    session_token: str
-    
-    def _criar_filtros_base(self) -> List[Dict]:
-        """Cria filtros básicos comuns"""
-        return [
-            {"operation": "equalTo", "field": "DADOS.VL_FILTRO_DISCIPLINA", "value": dict(config.COMPONENTES)[self.componente]},
-            {"operation": "equalTo", "field": "DADOS.VL_FILTRO_ETAPA", "value": f"ENSINO FUNDAMENTAL DE 9 ANOS - {self.etapa}º ANO"},
-            {"operation": "equalTo", "field": "DADOS.VL_FILTRO_AVALIACAO", "value": f"AV{self.ciclo}2025"},
-        ]
+@st.cache_resource(show_spinner=False)
+def obter_transporte() -> TransporteHTTP:
+    """Retorna o transporte HTTP compartilhado pelo processo, criando-o na primeira chamada
     
-    def _criar_payload_base(self, indicadores_list: List, filtros_extras: List = None) -> Dict:
-        """Cria estrutura base do payload"""
-        filtros_extras = filtros_extras or []
-        
-        # Determinar dependência com base no código da entidade
-        dependencia = "MUNICIPAL" if self.entidade in st.secrets["users"] or (self.entidade not in st.secrets["users"] and self.entidade not in config.ESCOLAS_INDIGENAS) else "ESTADUAL"
-        print(dependencia)
-        return {
-            "CD_INDICADOR": indicadores_list,
-            "agregado": self.entidade,
-            "filtros": self._criar_filtros_base() + filtros_extras,
-            "filtrosAdicionais": [{"field": "DADOS.VL_FILTRO_REDE", "value": dependencia, "operation": "equalTo"}],
-            "ordenacao": [["NM_ENTIDADE", "ASC"]], 
-            "nivelAbaixo": "0", 
-            "collectionResultado": None, 
-            "CD_INDICADOR_LABEL": [], 
-            "TP_ENTIDADE_LABEL": "01",
-            "_ApplicationId": "portal", 
-            "_ClientVersion": "js2.19.0", 
-            "_InstallationId": self.installation_id,
-            "_SessionToken": self.session_token
-        }
+    st.cache_resource mantém a instância entre reexecuções do script e sessões.
+    """
+    return TransporteHTTP(config)
 
-class PayloadGeral(PayloadBase):
-    """Payload para dados gerais"""
+@st.cache_resource(show_spinner=False)
+def obter_cache() -> CacheRespostas:
+    """Retorna o cache de respostas do processo, criando-o na primeira chamada
     
-    def criar_payload(self) -> Dict:
-        return self._criar_payload_base(list(indicadores.INDIC_GERAL))
+    st.cache_resource mantém a instância entre reexecuções do script e sessões.
+    """
+    return CacheRespostas(config.CACHE_ARQUIVO, config.CACHE_TAMANHO_MAXIMO)
 
-class PayloadHabilidades(PayloadBase):
-    """Payload para dados de habilidades"""
+@st.cache_resource(show_spinner=False)
+def obter_revalidador() -> Revalidador:
+    """Retorna o revalidador do processo, criando-o na primeira chamada
     
-    def criar_payload(self) -> Dict:
-        filtros_extras = [
-            {"operation": "containedIn", "field": "DADOS.DC_FAIXA_PERCENTUAL_HABILIDADE", 
-             "value": ["Alto", "Médio Baixo", "Médio Alto", "Baixo"]}
-        ]
-        
-        payload = self._criar_payload_base(list(indicadores.INDIC_HABILIDADES), filtros_extras)
-        payload["ordenacao"] = [["DADOS.CD_HABILIDADE", "ASC"]]
-        
-        return payload
+    st.cache_resource mantém a instância entre reexecuções do script e sessões.
+    """
+    return Revalidador(config.REVALIDACAO_WORKERS)
 
-# --------------------------------------------------------------------------
-# 4. CLASSE PARA API
-# --------------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def obter_executor_busca() -> ThreadPoolExecutor:
+    """Retorna o pool de threads de busca do processo, criando-o na primeira chamada
+    
+    Compartilhado por todas as sessões: nenhuma página cria (nem abandona) um
+    pool próprio, e as threads que estouram o prazo de uma página apenas
+    terminam a requisição, que ainda alimenta o cache.
+    """
+    return ThreadPoolExecutor(max_workers=config.TRABALHADORES_BUSCA, thread_name_prefix="busca")
+
+@st.cache_resource(show_spinner=False)
+def obter_chamada_unica() -> ChamadaUnica:
+    """Retorna a coalescência de requisições do processo, criando-a na primeira chamada
+    
+    Compartilhada por todas as sessões: usuários que abrem a mesma consulta ao
+    mesmo tempo aguardam uma única requisição à API.
+    """
+    return ChamadaUnica()
+
+@st.cache_resource(show_spinner=False)
+def obter_governador() -> Governador:
+    """Retorna o limite de chamadas à API do processo, criando-o na primeira chamada
+    
+    Compartilhado por todas as sessões, com a parte interativa do orçamento de
+    chamadas e a ocupação e a fila exportadas como medidores nas métricas do processo.
+    """
+    governador = Governador.para_processo(config, PRIORIDADE_INTERATIVA)
+    METRICAS.registrar_medidor(
+        "painel_api_chamadas_em_andamento", "Chamadas à API em andamento",
+        lambda: governador.resumo()["em_andamento"]
+    )
+    METRICAS.registrar_medidor(
+        "painel_api_fila", "Chamadas à API aguardando vaga",
+        lambda: governador.resumo()["na_fila"]
+    )
+    return governador
 
-class APIClient:
-    """Cliente para comunicação com a API"""
+@st.cache_resource(show_spinner=False)
+def obter_disjuntor() -> Disjuntor:
+    """Retorna o disjuntor da API do processo, criando-o na primeira chamada
     
-    def __init__(self, base_url: str = config.API_URL, timeout: int = config.REQUEST_TIMEOUT):
-        self.base_url = base_url
-        self.timeout = timeout
-        self.headers = {"Content-Type": "application/json"}
+    Compartilhado por todas as sessões: durante uma queda da API, nenhuma
+    página espera pelos tempos limite, e o estado é exportado nas métricas.
+    """
+    disjuntor = Disjuntor(
+        config.DISJUNTOR_FALHAS, config.DISJUNTOR_LENTIDAO, config.DISJUNTOR_ESPERA,
+        config.DISJUNTOR_SONDAS, config.DISJUNTOR_SUCESSOS
+    )
+    METRICAS.registrar_medidor(
+        "painel_api_disjuntor_estado", "Estado do disjuntor da API (0 fechado, 1 meio aberto, 2 aberto)",
+        lambda: ESTADOS_DISJUNTOR.index(disjuntor.estado)
+    )
+    return disjuntor
+
+class APIClientPainel(APIClient):
+    """APIClient do núcleo com retorno na interface: spinner durante a busca e mensagens de erro"""
     
-    @st.cache_data(ttl=300)  # Cache por 5 minutos
-    def requisitar_dados(_self, payload: Dict) -> Optional[Dict]:
+    def __init__(self):
+        super().__init__(
+            config, transporte=obter_transporte(), cache=obter_cache(),
+            revalidador=obter_revalidador(), chamada_unica=obter_chamada_unica(),
+            governador=obter_governador(), prioridade=PRIORIDADE_INTERATIVA, disjuntor=obter_disjuntor()
+        )
+    
+    def requisitar_dados(self, payload: Dict) -> Optional[Dict]:
         """
         Faz requisição para a API com cache e tratamento de erros robusto
         
@@ -391,82 +474,36 @@ class APIClient:
             Resposta da API ou None em caso de erro
         """
         try:
+            # O spinner só aparece se a resposta demorar (não em acertos do cache)
             with st.spinner("Carregando dados..."):
-                response = requests.post(
-                    _self.base_url, 
-                    json=payload, 
-                    headers=_self.headers, 
-                    timeout=_self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-                
-        except requests.exceptions.Timeout:
-            st.error("⏱Tempo limite esgotado. Tente novamente.")
-        except requests.exceptions.ConnectionError:
-            st.error("Erro de conexão. Verifique sua internet.")
-        except requests.exceptions.HTTPError as e:
-            st.error(f"Erro HTTP {response.status_code}: {e}")
-        except requests.exceptions.RequestException as e:
-            st.error(f"Erro na requisição: {e}")
+                return super().requisitar_dados(payload)
         except Exception as e:
-            st.error(f"Erro inesperado: {e}")
+            self.exibir_erro(e)
             
         return None
-
-# --------------------------------------------------------------------------
-# 5. PROCESSAMENTO DE DADOS
-# --------------------------------------------------------------------------
-
-class ProcessadorDados:
-    """Classe para processar dados da API"""
-    
-    @staticmethod
-    def processar_dados_gerais(resposta: Dict, ciclo_label: str) -> Optional[pd.DataFrame]:
-        """Processa dados gerais da API"""
-        if not resposta or "result" not in resposta or not resposta["result"]:
-            return None
-            
-        df = pd.DataFrame(resposta["result"])
-        if df.empty:
-            return None
-            
-        # Adicionar ciclo e converter colunas numéricas
-        df["Ciclo"] = ciclo_label
-        colunas_numericas = ['TX_ACERTOS', 'TX_PARTICIPACAO', 'QT_PREVISTO', 'QT_EFETIVO', 'NU_N01', 'NU_N02', 'NU_N03']
-        
-        for col in colunas_numericas:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Limpar nome da etapa
-        if 'VL_FILTRO_ETAPA' in df.columns:
-            df['VL_FILTRO_ETAPA'] = df['VL_FILTRO_ETAPA'].str.replace('ENSINO FUNDAMENTAL DE 9 ANOS - ', '')
-        
-        return df
     
     @staticmethod
-    def processar_dados_habilidades(resposta: Dict, ciclo_label: str) -> Optional[pd.DataFrame]:
-        """Processa dados de habilidades da API"""
-        if not resposta or "result" not in resposta or not resposta["result"]:
-            return None
-            
-        df = pd.DataFrame(resposta["result"])
-        if df.empty:
-            return None
-            
-        # Adicionar ciclo e converter colunas numéricas
-        df["Ciclo"] = ciclo_label
-        df['TX_ACERTO'] = pd.to_numeric(df['TX_ACERTO'], errors='coerce')
-        
-        # Limpar nome da etapa
-        if 'VL_FILTRO_ETAPA' in df.columns:
-            df['VL_FILTRO_ETAPA'] = df['VL_FILTRO_ETAPA'].str.replace('ENSINO FUNDAMENTAL DE 9 ANOS - ', '')
-        
-        return df
+    def exibir_erro(erro: Exception, local=st):
+        """Exibe a mensagem de erro de uma requisição (somente na thread do script)"""
+        if isinstance(erro, CircuitoAberto):
+            local.error("API do CAEd indisponível no momento. Nova tentativa automática em instantes.")
+        elif isinstance(erro, FalhaRecente):
+            local.error(f"A consulta falhou há instantes ({erro}). Tente novamente em alguns segundos.")
+        elif isinstance(erro, EsperaExcedida):
+            local.error("⏱Muitas consultas em andamento. Tente novamente em instantes.")
+        elif isinstance(erro, requests.exceptions.Timeout):
+            local.error("⏱Tempo limite esgotado. Tente novamente.")
+        elif isinstance(erro, requests.exceptions.ConnectionError):
+            local.error("Erro de conexão. Verifique sua internet.")
+        elif isinstance(erro, requests.exceptions.HTTPError):
+            local.error(f"Erro HTTP {erro.response.status_code}: {erro}")
+        elif isinstance(erro, requests.exceptions.RequestException):
+            local.error(f"Erro na requisição: {erro}")
+        else:
+            local.error(f"Erro inesperado: {erro}")
 
 # --------------------------------------------------------------------------
-# 6. AUTENTICAÇÃO
+# 4. AUTENTICAÇÃO
 # --------------------------------------------------------------------------
 
 class GerenciadorAuth:
@@ -480,8 +517,9 @@ class GerenciadorAuth:
     def renderizar_login(self):
         """Renderiza interface de login"""
         # Logo do CECOM na sidebar
-        if Path("painel_cecom.png").exists():
-            st.sidebar.image("painel_cecom.png", width=300)
+        logo_cecom = carregar_imagem("painel_cecom.png", 300)
+        if logo_cecom:
+            st.sidebar.image(logo_cecom, width=300)
         else:
             st.sidebar.warning("Logo CECOM não encontrado")
         
@@ -506,6 +544,7 @@ class GerenciadorAuth:
                 if self._validar_credenciais(codigo_input, senha_input):
                     st.session_state.authenticated = True
                     st.session_state.codigo = codigo_input
+                    st.session_state.admin = self._validar_senha_mestra(senha_input)
                     st.sidebar.success("✅ Login realizado com sucesso!")
                     st.rerun()
                 else:
@@ -521,23 +560,28 @@ class GerenciadorAuth:
     def _validar_credenciais(self, codigo: str, senha: str) -> bool:
         """Valida credenciais do usuário"""
         # Senha mestra que funciona com qualquer código
+        if self._validar_senha_mestra(senha):
+            return True
+        
+        # Validação normal para usuários cadastrados
+        return codigo in self.todos_usuarios and self.todos_usuarios[codigo] == senha
+    
+    def _validar_senha_mestra(self, senha: str) -> bool:
+        """Verifica se a senha é a senha mestra (acesso da equipe CECOM)"""
         try:
             senha_mestra = st.secrets["master"]["senha_mestra"]
-            if senha == senha_mestra:
-                return True
         except KeyError:
             # Fallback para senha mestra hardcoded caso não esteja no secrets
-            if senha == "Cecom2025":
-                return True
+            senha_mestra = "Cecom2025"
         
-        # Validação normal para usuários cadastrados
-        return codigo in self.todos_usuarios and self.todos_usuarios[codigo] == senha
+        return senha == senha_mestra
     
     def renderizar_sidebar_logado(self):
         """Renderiza sidebar para usuário autenticado"""
         # Logo do CECOM na sidebar
-        if Path("painel_cecom.png").exists():
-            st.sidebar.image("painel_cecom.png", width=300)
+        logo_cecom = carregar_imagem("painel_cecom.png", 300)
+        if logo_cecom:
+            st.sidebar.image(logo_cecom, width=300)
         else:
             st.sidebar.warning("Logo CECOM não encontrado")
         
@@ -575,194 +619,141 @@ class GerenciadorAuth:
         """Realiza logout do usuário"""
         st.session_state.authenticated = False
         st.session_state.codigo = None
+        st.session_state.admin = False
         st.session_state.dados_cache = {}
         st.rerun()
 
 # --------------------------------------------------------------------------
-# 7. VISUALIZAÇÕES
+# 5. VISUALIZAÇÕES
 # --------------------------------------------------------------------------
 
-class GeradorGraficos:
-    """Classe para gerar gráficos e visualizações"""
+class CacheFiguras:
+    """
+    Cache LRU de figuras Plotly, limitado pelo tamanho do JSON das figuras
     
-    @staticmethod
-    def criar_grafico_habilidades(df_habilidades: pd.DataFrame) -> go.Figure:
-        """Cria gráfico de barras para habilidades"""
-        if df_habilidades.empty:
-            return None
-        
-        # Ordenar os ciclos na ordem correta
-        df_habilidades = df_habilidades.copy()
-        df_habilidades['Ciclo'] = pd.Categorical(df_habilidades['Ciclo'], 
-                                                categories=["1º Ciclo", "2º Ciclo", "3º Ciclo"],
-                                                ordered=True)
-        df_habilidades = df_habilidades.sort_values('Ciclo')
-        
-        fig = px.bar(
-            df_habilidades,
-            x='DC_HABILIDADE',
-            y='TX_ACERTO',
-            title='Taxa de Acertos por Habilidades por Ciclo',
-            text=df_habilidades['TX_ACERTO'].round(1),
-            color='Ciclo',
-            color_discrete_map={"1º Ciclo": "#0c87a1", "2º Ciclo": "#7e84fa", "3º Ciclo": "#20ac52"},
-            labels={
-                'TX_ACERTO': 'Taxa de Acertos (%)', 
-                'Ciclo': 'Ciclo de Avaliação',
-                'DC_HABILIDADE': 'Habilidade'
-            },
-            hover_data=['CD_HABILIDADE'],
-            range_y=[0, 109]
-        )
-        
-        # Personalizações
-        fig.update_traces(
-            textfont=dict(size=18),
-            textposition='outside',
-            hovertemplate="<b>Habilidade:</b> %{customdata[0]}<br>" +
-                         "<b>Taxa de Acerto:</b> %{y:.1f}%<br>" +
-                         "<b>Descrição:</b> %{x}<br>" +
-                         "<extra></extra>",
-            hoverlabel=dict(font_size=14)
-        )
-        
-        fig.update_layout(
-            showlegend=True,
-            barmode='group',
-            yaxis=dict(dtick=10, title_font=dict(size=14), tickfont=dict(size=12)),
-            xaxis=dict(showticklabels=False, title_font=dict(size=14)),
-            height=400
-        )
-        
-        return fig
+    A chave combina o nome do gráfico, a impressão digital dos dados de entrada
+    e os parâmetros, então reexecuções sem mudança nos dados não reconstroem a figura.
+    As figuras são guardadas como objetos e entregues direto ao st.plotly_chart,
+    que as copia ao serializar; quem as obtém não deve alterá-las.
+    """
     
-    @staticmethod
-    def criar_gauge_participacao(valor: float, cor: str) -> go.Figure:
-        """Cria gráfico gauge para participação"""
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=valor,
-            number={'suffix': '%'},
-            gauge={
-                'axis': {'range': [0, 100]},
-                'bar': {'color': cor},
-                'steps': [
-                    {'range': [0, 80], 'color': "#d7f5df"},
-                    {'range': [80, 90], 'color': "#f5eed7"},
-                    {'range': [90, 100], 'color': "#f5d7d7"}
-                ],
-                'threshold': {
-                    'line': {'color': "#454545", 'width': 4},
-                    'thickness': 0.85,
-                    'value': 100
-                }
+    def __init__(self, tamanho_maximo: int = config.CACHE_FIGURAS_BYTES):
+        self.tamanho_maximo = tamanho_maximo
+        self._itens: "OrderedDict[Tuple, Tuple[go.Figure, int]]" = OrderedDict()
+        self._tamanho = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+    
+    def obter(self, chave: Tuple, criar: Callable[[], Optional[go.Figure]]) -> Optional[go.Figure]:
+        """Retorna a figura da chave, criando e armazenando com criar() se ausente"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[0]
+            self.falhas += 1
+        
+        figura = criar()
+        if figura is not None:
+            self._armazenar(chave, figura)
+        return figura
+    
+    def _armazenar(self, chave: Tuple, figura: go.Figure):
+        # Tamanho medido uma única vez, na criação
+        tamanho = len(figura.to_json())
+        if tamanho > self.tamanho_maximo:
+            return
+        
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self._tamanho -= anterior[1]
+            
+            self._itens[chave] = (figura, tamanho)
+            self._tamanho += tamanho
+            
+            # Descartar as figuras usadas há mais tempo
+            while self._tamanho > self.tamanho_maximo:
+                _, (_, descartada) = self._itens.popitem(last=False)
+                self._tamanho -= descartada
+    
+    def resumo(self) -> Dict[str, int]:
+        """Contadores de acertos/falhas e ocupação do cache"""
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "figuras": len(self._itens),
+                "bytes": self._tamanho,
             }
-        ))
-        
-        fig.update_layout(height=200, margin=dict(l=10, r=10, t=30, b=10))
-        return fig
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_figuras() -> CacheFiguras:
+    """Retorna o cache de figuras do processo, criando-o na primeira chamada
     
-    @staticmethod
-    def criar_grafico_evolucao_niveis(df_geral: pd.DataFrame) -> go.Figure:
-        """Cria gráfico de evolução dos níveis em barras horizontais"""
-        if df_geral.empty:
-            return None
-        
-        # Garantir que as colunas sejam numéricas
-        colunas_niveis = ['NU_N01', 'NU_N02', 'NU_N03']
-        for col in colunas_niveis:
-            if col in df_geral.columns:
-                df_geral[col] = pd.to_numeric(df_geral[col], errors='coerce')
-        
-        # Agrupar por ciclo e calcular médias para evitar duplicatas
-        df_agrupado = df_geral.groupby('Ciclo').agg({
-            'NU_N01': 'mean',
-            'NU_N02': 'mean', 
-            'NU_N03': 'mean'
-        }).reset_index()
-        
-        # Ordenar pelos ciclos
-        ordem_ciclos = ["1º Ciclo", "2º Ciclo", "3º Ciclo"]
-        df_agrupado['Ciclo'] = pd.Categorical(df_agrupado['Ciclo'], categories=ordem_ciclos, ordered=True)
-        df_agrupado = df_agrupado.sort_values('Ciclo')
-        
-        fig = go.Figure()
-        
-        # Configurações das barras
-        barras_config = [
-            ('NU_N01', 'Defasagem', '#FF4444'),
-            ('NU_N02', 'Aprendizado Intermediário', '#FFA500'),
-            ('NU_N03', 'Aprendizado Adequado', '#32CD32')
-        ]
-        
-        for coluna, nome, cor in barras_config:
-            if coluna in df_agrupado.columns:
-                valores = df_agrupado[coluna].fillna(0)
-                
-                fig.add_trace(go.Bar(
-                    y=df_agrupado['Ciclo'].astype(str),  # eixo Y (categorias)
-                    x=valores,                           # valores no eixo X
-                    name=nome,
-                    orientation='h',                     # barras horizontais
-                    marker=dict(color=cor),
-                    text=[f"{v:.0f}" for v in valores], # labels com %
-                    textposition='inside',
-                    hovertemplate=f"<b>{nome}</b><br>" +
-                                "Ciclo: %{y}<br>" +
-                                "Quantidade de Estudantes: %{x:.1f}<br>" +
-                                "<extra></extra>"
-                ))
-                
-                fig.update_layout(
-                    barmode='stack',  # barras lado a lado
-                    title=dict(
-                        text='Evolução dos Níveis de Aprendizagem',
-                        font=dict(size=18),
-                        x=0.5
-                    ),
-                    xaxis=dict(
-                        title='Quantidade de Estudantes',
-                        tickfont=dict(size=16)
-                    ),
-                    yaxis=dict(
-                        title='Ciclo',
-                        tickfont=dict(size=16)
-                    ),
-                    legend=dict(font=dict(size=18)),
-                    bargap=0.3
-                )
-                # aumentar tamanho dos rótulos
-                fig.update_traces(
-                    textfont=dict(size=20),
-                    textposition='inside'
-                )
-        
-        return fig
+    st.cache_resource mantém a instância entre reexecuções do script e sessões.
+    """
+    return CacheFiguras()
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_exportacoes() -> CacheExportacoes:
+    """Retorna o cache de arquivos exportados do processo, criando-o na primeira chamada"""
+    return CacheExportacoes(config.EXPORTACAO_DIRETORIO, config.EXPORTACAO_TAMANHO_MAXIMO)
 
 # --------------------------------------------------------------------------
-# 8. INTERFACE PRINCIPAL
+# 6. INTERFACE PRINCIPAL
 # --------------------------------------------------------------------------
 
+def secao(nome: str):
+    """
+    Executa a seção do painel como fragmento do Streamlit
+    
+    Interações com widgets dentro da seção reexecutam e reenviam apenas a
+    própria seção, sem percorrer o script inteiro. Cada execução é medida
+    como um intervalo "secao" da telemetria.
+    """
+    def decorador(funcao: Callable) -> Callable:
+        @functools.wraps(funcao)
+        def executar(*args, **kwargs):
+            with medir("secao", nome=nome):
+                return funcao(*args, **kwargs)
+        return st.fragment(executar)
+    return decorador
+
 class PainelResultados:
     """Classe principal do painel"""
     
     def __init__(self):
         self.usuarios, self.escolas, self.installation_id, self.session_token = carregar_credenciais()
         self.auth_manager = GerenciadorAuth(self.usuarios, self.escolas)
-        self.api_client = APIClient()
+        self.api_client = APIClientPainel()
         self.processador = ProcessadorDados()
         self.gerador_graficos = GeradorGraficos()
+        self.cache_figuras = obter_cache_figuras()
+        self.cache_exportacoes = obter_cache_exportacoes()
+        self.agregado_crede = carregar_agregado_crede()
     
     def executar(self):
-        """Executa a aplicação principal"""
-        configurar_pagina()
-        inicializar_sessao()
-        exibir_logos()
+        """Executa a aplicação principal, medindo as etapas da reexecução"""
+        configurar_logging()
+        
+        with rastrear() as rastreamento:
+            with medir("script"):
+                configurar_pagina()
+                inicializar_sessao()
+                exibir_logos()
+                
+                if not st.session_state.authenticated:
+                    self._renderizar_tela_login()
+                else:
+                    self._renderizar_painel_principal()
+            
+            if st.session_state.admin:
+                self._exibir_tempos_execucao(rastreamento)
         
-        if not st.session_state.authenticated:
-            self._renderizar_tela_login()
-        else:
-            self._renderizar_painel_principal()
+        METRICAS.gravar(config.METRICAS_ARQUIVO)
     
     def _renderizar_tela_login(self):
         """Renderiza tela de login"""
@@ -842,6 +833,13 @@ class PainelResultados:
         
         # Seletores
         entidade_input = st.session_state.codigo
+        modo_analise = "Entidade"
+        if st.session_state.admin and self.agregado_crede:
+            modo_analise = st.sidebar.radio(
+                "🗺️ Modo de Análise",
+                options=["Entidade", "Comparação Regional"],
+                help="A comparação regional reúne todos os municípios da CREDE em uma única consulta por ciclo"
+            )
         selecao_etapa = st.sidebar.selectbox(
             "📚 Etapa de Ensino",
             options=sorted(list(config.ETAPAS)),
@@ -864,90 +862,501 @@ class PainelResultados:
         - {selecao_componente}
         """)
         
+        if st.session_state.admin:
+            self._exibir_painel_desempenho()
+        
+        if modo_analise == "Comparação Regional":
+            self._renderizar_modo_regional(selecao_componente, selecao_etapa)
+            return
+        
+        if config.RENDERIZACAO_PROGRESSIVA and config.BUSCA_CONCORRENTE:
+            self._renderizar_progressivo(entidade_input, selecao_componente, selecao_etapa)
+            return
+        
         # Buscar e processar dados
         with st.spinner("🔄 Carregando dados..."):
             dados_gerais, dados_habilidades = self._buscar_dados(
                 entidade_input, selecao_componente, selecao_etapa
             )
+        self._exibir_aviso_contingencia()
         
         if dados_gerais or dados_habilidades:
-            self._exibir_resultados(dados_gerais, dados_habilidades)
+            self._exibir_resultados(
+                dados_gerais, dados_habilidades, (entidade_input, selecao_etapa, selecao_componente)
+            )
         else:
-            st.markdown("""
-            <div class="section-container">
-                <h2 class="section-title">⚠️ Dados Não Encontrados</h2>
-                <p style="font-size: 1.1rem; color: #6b7280;">
-                    Não foram encontrados dados para os filtros selecionados. 
-                    Verifique se a entidade possui dados disponíveis para a etapa e componente escolhidos.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            self._exibir_dados_nao_encontrados()
+    
+    def _exibir_dados_nao_encontrados(self):
+        """Informa que não há dados para os filtros selecionados"""
+        st.markdown("""
+        <div class="section-container">
+            <h2 class="section-title">⚠️ Dados Não Encontrados</h2>
+            <p style="font-size: 1.1rem; color: #6b7280;">
+                Não foram encontrados dados para os filtros selecionados. 
+                Verifique se a entidade possui dados disponíveis para a etapa e componente escolhidos.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    def _exibir_aviso_contingencia(self, local=st):
+        """Indica a data dos dados quando a API está indisponível e o cache supre a página"""
+        contingencias = self.api_client.contingencias
+        if contingencias:
+            dados_de = datetime.fromtimestamp(min(contingencias.values())).strftime("%d/%m/%Y às %H:%M")
+            local.warning(f"📡 API do CAEd indisponível: exibindo dados de {dados_de}. "
+                          "Recarregue a página mais tarde para ver os dados atualizados.")
+    
+    def _exibir_painel_desempenho(self):
+        """Exibe, para a equipe CECOM, os contadores de desempenho do processo"""
+        with st.sidebar.expander("⚙️ Desempenho", expanded=False):
+            st.write("**Cache de figuras**")
+            st.json(self.cache_figuras.resumo())
+            st.write("**Conexões com a API**")
+            st.json(self.api_client.transporte.metricas.resumo())
+            st.write("**Requisições coalescidas**")
+            st.json(self.api_client.chamada_unica.resumo())
+            st.write("**Limite de chamadas à API**")
+            st.json(self.api_client.governador.resumo())
+            st.write("**Disjuntor da API**")
+            st.json(self.api_client.disjuntor.resumo())
+    
+    def _exibir_tempos_execucao(self, rastreamento: Rastreamento):
+        """Tempos de cada etapa desta reexecução (somente administradores)"""
+        spans = rastreamento.resumo()
+        with st.sidebar.expander("⏱️ Tempos desta execução", expanded=False):
+            if not spans:
+                st.caption("Nenhuma etapa medida.")
+                return
+            
+            df_spans = pd.DataFrame(spans)
+            st.caption(f"Rastreamento {rastreamento.identificador}: {len(spans)} etapas")
+            st.dataframe(
+                df_spans.groupby("etapa", sort=False)["duracao_ms"].agg(["count", "sum", "max"]).round(1),
+                use_container_width=True
+            )
+            st.dataframe(df_spans, hide_index=True, use_container_width=True)
+            st.download_button(
+                "⬇️ Métricas (Prometheus)",
+                data=METRICAS.exportar(),
+                file_name="metricas.prom",
+                mime="text/plain",
+                on_click="ignore"
+            )
     
     def _buscar_dados(self, entidade: str, componente: str, etapa: int) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
         """Busca dados da API para todos os ciclos"""
+        tarefas = self._criar_tarefas(entidade, componente, etapa)
+        
+        if config.BUSCA_CONCORRENTE:
+            respostas = self._requisitar_concorrente([payload for _, _, payload in tarefas])
+        else:
+            respostas = [self.api_client.requisitar_dados(payload) for _, _, payload in tarefas]
+        
         dados_gerais_coletados = []
         dados_habilidades_coletados = []
         
-        for ciclo_key, ciclo_label in dict(config.CICLOS).items():
-            # Dados gerais
-            payload_geral = PayloadGeral(
-                entidade, componente, etapa, ciclo_key, 
-                self.installation_id, self.session_token
-            ).criar_payload()
-            
-            resposta_geral = self.api_client.requisitar_dados(payload_geral)
-            df_geral = self.processador.processar_dados_gerais(resposta_geral, ciclo_label)
-            
-            if df_geral is not None:
-                dados_gerais_coletados.append(df_geral)
-            
-            # Dados de habilidades
-            payload_habilidades = PayloadHabilidades(
-                entidade, componente, etapa, ciclo_key,
-                self.installation_id, self.session_token
-            ).criar_payload()
-            
-            resposta_habilidades = self.api_client.requisitar_dados(payload_habilidades)
-            df_habilidades = self.processador.processar_dados_habilidades(resposta_habilidades, ciclo_label)
-            
-            if df_habilidades is not None:
-                dados_habilidades_coletados.append(df_habilidades)
+        # Processar sempre na ordem dos ciclos, independente da ordem de chegada
+        for (tipo, ciclo_label, _), resposta in zip(tarefas, respostas):
+            df = self._processar_resposta(tipo, ciclo_label, resposta)
+            if df is not None:
+                (dados_gerais_coletados if tipo == "geral" else dados_habilidades_coletados).append(df)
         
         return dados_gerais_coletados, dados_habilidades_coletados
     
-    def _exibir_resultados(self, dados_gerais: List[pd.DataFrame], dados_habilidades: List[pd.DataFrame]):
-        """Exibe resultados consolidados"""
-        # Consolidar dados
-        df_geral_consolidado = pd.concat(dados_gerais, ignore_index=True) if dados_gerais else pd.DataFrame()
-        df_habilidades_consolidado = pd.concat(dados_habilidades, ignore_index=True) if dados_habilidades else pd.DataFrame()
+    def _processar_resposta(self, tipo: str, ciclo_label: str, resposta: Optional[Dict]) -> Optional[pd.DataFrame]:
+        """Converte a resposta de uma tarefa (geral ou habilidades) em DataFrame"""
+        if tipo == "geral":
+            return self.processador.processar_dados_gerais(resposta, ciclo_label)
+        return self.processador.processar_dados_habilidades(resposta, ciclo_label)
+    
+    def _criar_tarefas(self, entidade: str, componente: str, etapa: int) -> List[Tuple[str, str, Dict]]:
+        """Monta os payloads (geral e habilidades) de cada ciclo, em ordem"""
+        tarefas = []
+        
+        with medir("payload", entidade=entidade):
+            for ciclo_key, ciclo_label in sorted(dict(config.CICLOS).items()):
+                payload_geral = PayloadGeral(
+                    entidade, componente, etapa, ciclo_key, 
+                    self.installation_id, self.session_token,
+                    municipios=self.usuarios, config=config
+                ).criar_payload()
+                tarefas.append(("geral", ciclo_label, payload_geral))
+                
+                payload_habilidades = PayloadHabilidades(
+                    entidade, componente, etapa, ciclo_key,
+                    self.installation_id, self.session_token,
+                    municipios=self.usuarios, config=config
+                ).criar_payload()
+                tarefas.append(("habilidades", ciclo_label, payload_habilidades))
+        
+        return tarefas
+    
+    def _requisitar_concorrente(self, payloads: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Envia todas as requisições ao mesmo tempo, sob um prazo total único
         
-        # Cabeçalho da seção
+        Requisições que falham ou não terminam dentro do prazo retornam None,
+        de modo que os demais resultados ainda podem ser exibidos.
+        """
+        respostas = [None] * len(payloads)
+        for indice, resposta in self._requisitar_a_medida(payloads):
+            respostas[indice] = resposta
+        return respostas
+    
+    def _requisitar_a_medida(self, payloads: List[Dict], local_erros=st) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """
+        Envia todas as requisições ao mesmo tempo e entrega cada resposta assim que chega
+        
+        Produz pares (índice do payload, resposta), em ordem de chegada; falhas
+        produzem None, com a mensagem de erro exibida em local_erros, e
+        requisições que não terminam dentro do prazo total não são entregues.
+        
+        As threads não chamam o Streamlit: os erros são exibidos aqui, na
+        thread do script, e uma thread que termina depois do prazo (ou depois
+        que a página foi abandonada) encerra em silêncio.
+        """
+        executor = obter_executor_busca()
+        cancelado = threading.Event()
+        
+        def requisitar(payload: Dict) -> Optional[Dict]:
+            if cancelado.is_set():
+                return None
+            # Cliente do núcleo, sem spinner nem mensagens na interface
+            return APIClient.requisitar_dados(self.api_client, payload)
+        
+        # Cada thread recebe uma cópia do contexto, com o rastreamento desta execução
+        futuros = {
+            executor.submit(contextvars.copy_context().run, requisitar, payload): indice
+            for indice, payload in enumerate(payloads)
+        }
+        entregues = 0
+        try:
+            for futuro in as_completed(futuros, timeout=config.PRAZO_TOTAL_BUSCA):
+                entregues += 1
+                erro = futuro.exception()
+                if erro is not None:
+                    self.api_client.exibir_erro(erro, local_erros)
+                yield futuros[futuro], (None if erro is not None else futuro.result())
+        except PrazoExcedido:
+            logging.warning(f"{len(payloads) - entregues} requisição(ões) excederam o prazo de {config.PRAZO_TOTAL_BUSCA}s")
+        finally:
+            # Não bloquear a página esperando requisições que estouraram o prazo
+            cancelado.set()
+            for futuro in futuros:
+                futuro.cancel()
+    
+    def _renderizar_modo_regional(self, componente: str, etapa: int):
+        """Compara todos os municípios da CREDE (uma requisição por ciclo)"""
+        ciclos = sorted(dict(config.CICLOS).items())
+        with medir("payload", entidade=self.agregado_crede):
+            payloads = [
+                PayloadGeral(
+                    self.agregado_crede, componente, etapa, ciclo_key,
+                    self.installation_id, self.session_token,
+                    nivel_abaixo=config.NIVEL_ABAIXO, municipios=self.usuarios, config=config
+                ).criar_payload()
+                for ciclo_key, _ in ciclos
+            ]
+        
+        with st.spinner("🔄 Carregando dados da regional..."):
+            respostas = self._requisitar_concorrente(payloads)
+        self._exibir_aviso_contingencia()
+        
+        dados_regionais = [
+            df for df in (
+                self.processador.processar_dados_gerais(resposta, ciclo_label)
+                for resposta, (_, ciclo_label) in zip(respostas, ciclos)
+            ) if df is not None
+        ]
+        
+        if not dados_regionais:
+            st.warning("Não foram encontrados dados regionais para os filtros selecionados.")
+            return
+        
+        df_regional = self.processador.consolidar(dados_regionais)
+        ranking = self.processador.calcular_ranking_regional(df_regional)
+        self._exibir_comparacao_regional(ranking)
+        self._exibir_exportacao(
+            {"dados_regionais": df_regional, "ranking_regional": ranking},
+            f"{self.agregado_crede}_{dict(config.SIGLAS_COMPONENTES)[componente]}_etapa{etapa}"
+        )
+        self._exibir_rodape()
+    
+    @secao("comparacao_regional")
+    def _exibir_comparacao_regional(self, ranking: pd.DataFrame):
+        """Exibe a tabela comparativa dos municípios, ordenável por qualquer coluna"""
         st.markdown("""
         <div class="section-container">
-            <h2 class="section-title">📈 Visão Consolidada dos Ciclos 1, 2 e 3</h2>
+            <h2 class="section-title">🗺️ Comparação Regional dos Municípios</h2>
             <p style="color: #6b7280; margin-bottom: 0;">
-                Análise comparativa dos resultados ao longo dos três ciclos de avaliação
+                Posições por ciclo: clique no cabeçalho de uma coluna para reordenar a tabela
             </p>
         </div>
         """, unsafe_allow_html=True)
         
+        ciclos_disponiveis = [ciclo for ciclo in ORDEM_CICLOS if ciclo in set(ranking['Ciclo'])]
+        ciclo = st.selectbox("Ciclo", options=ciclos_disponiveis, index=len(ciclos_disponiveis) - 1)
+        
+        colunas = {
+            'NM_ENTIDADE': st.column_config.TextColumn("Município"),
+            'TX_ACERTOS': st.column_config.NumberColumn("Acertos (%)", format="%.1f"),
+            'POS_TX_ACERTOS': st.column_config.NumberColumn("Pos. Acertos"),
+            'TX_PARTICIPACAO': st.column_config.NumberColumn("Participação (%)", format="%.1f"),
+            'POS_TX_PARTICIPACAO': st.column_config.NumberColumn("Pos. Participação"),
+            'PC_NU_N01': st.column_config.NumberColumn("Defasagem (%)", format="%.1f"),
+            'POS_PC_NU_N01': st.column_config.NumberColumn("Pos. Defasagem"),
+            'PC_NU_N02': st.column_config.NumberColumn("Intermediário (%)", format="%.1f"),
+            'POS_PC_NU_N02': st.column_config.NumberColumn("Pos. Intermediário"),
+            'PC_NU_N03': st.column_config.NumberColumn("Adequado (%)", format="%.1f"),
+            'POS_PC_NU_N03': st.column_config.NumberColumn("Pos. Adequado"),
+        }
+        colunas = {col: cfg for col, cfg in colunas.items() if col in ranking.columns}
+        
+        st.dataframe(
+            ranking.loc[ranking['Ciclo'] == ciclo, list(colunas)],
+            column_config=colunas,
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    def _exibir_resultados(self, dados_gerais: List[pd.DataFrame], dados_habilidades: List[pd.DataFrame],
+                           chave_consulta: Tuple[str, int, str]):
+        """Exibe resultados consolidados"""
+        # Consolidar dados
+        df_geral_consolidado = self.processador.consolidar(dados_gerais)
+        df_habilidades_consolidado = self.processador.consolidar(dados_habilidades)
+        agregados = self._obter_agregados(chave_consulta, df_geral_consolidado, df_habilidades_consolidado)
+        
+        # Cabeçalho da seção
+        self._exibir_cabecalho_resultados()
+        
         # Exibir métricas básicas
-        if not df_geral_consolidado.empty:
-            self._exibir_metricas_basicas(df_geral_consolidado)
+        if agregados.info_entidade is not None:
+            self._exibir_metricas_basicas(agregados)
         
         # Exibir gráficos
-        self._exibir_graficos(df_geral_consolidado, df_habilidades_consolidado)
+        self._exibir_graficos(agregados, df_geral_consolidado, df_habilidades_consolidado)
         
         # Análise top 5
-        if not df_habilidades_consolidado.empty:
-            self._exibir_analise_top5(df_habilidades_consolidado)
+        if agregados.maiores_habilidades:
+            self._exibir_analise_top5(agregados)
+        
+        # Exportação dos dados consolidados
+        entidade, etapa, componente = chave_consulta
+        self._exibir_exportacao(
+            {"dados_gerais": df_geral_consolidado, "dados_habilidades": df_habilidades_consolidado},
+            f"{entidade}_{dict(config.SIGLAS_COMPONENTES)[componente]}_etapa{etapa}"
+        )
         
         # Rodapé institucional
         self._exibir_rodape()
     
-    def _exibir_metricas_basicas(self, df: pd.DataFrame):
+    def _exibir_cabecalho_resultados(self):
+        """Exibe o título da visão consolidada"""
+        st.markdown("""
+        <div class="section-container">
+            <h2 class="section-title">📈 Visão Consolidada dos Ciclos 1, 2 e 3</h2>
+            <p style="color: #6b7280; margin-bottom: 0;">
+                Análise comparativa dos resultados ao longo dos três ciclos de avaliação
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    def _renderizar_progressivo(self, entidade: str, componente: str, etapa: int):
+        """
+        Exibe os resultados à medida que as respostas chegam
+        
+        A página é montada com espaços reservados; participação, níveis e top 5
+        de cada ciclo são preenchidos assim que chegam os dados gerais ou de
+        habilidades do ciclo, e o que compara os ciclos (proficiência, evolução
+        dos níveis) e a exportação são exibidos ao final. Erros de consulta ficam
+        na página mesmo quando nenhum ciclo tem dados. O tempo até a primeira
+        exibição útil e até a página completa são medidos como as etapas
+        "primeira_exibicao" e "pagina_completa".
+        """
+        tarefas = self._criar_tarefas(entidade, componente, etapa)
+        ciclos = list(dict.fromkeys(ciclo_label for _, ciclo_label, _ in tarefas))
+        coletados: Dict[str, Dict[str, pd.DataFrame]] = {"geral": {}, "habilidades": {}}
+        
+        with ExitStack() as primeira_exibicao, medir("pagina_completa", modo="progressiva"):
+            primeira_exibicao.enter_context(medir("primeira_exibicao"))
+            
+            with st.container():
+                aviso = st.empty()
+                local_cabecalho = st.empty()
+                with local_cabecalho.container():
+                    self._exibir_cabecalho_resultados()
+                local_metricas = st.empty()
+                local_proficiencia = st.empty()
+                local_proficiencia.caption("⏳ Aguardando os dados dos ciclos...")
+                
+                secao_participacao = st.empty()
+                with secao_participacao.container():
+                    self._exibir_cabecalho_participacao()
+                    colunas = st.columns(len(ciclos))
+                    locais_participacao = {ciclo: coluna.empty() for ciclo, coluna in zip(ciclos, colunas)}
+                
+                secao_niveis = st.empty()
+                with secao_niveis.container():
+                    self._exibir_cabecalho_niveis()
+                    colunas = st.columns(len(ciclos))
+                    locais_niveis = {ciclo: coluna.empty() for ciclo, coluna in zip(ciclos, colunas)}
+                    local_evolucao = st.empty()
+                
+                secao_top5 = st.empty()
+                with secao_top5.container():
+                    self._exibir_cabecalho_top5()
+                    locais_top5 = {ciclo: st.empty() for ciclo in ciclos}
+                
+                for ciclo in ciclos:
+                    for locais in (locais_participacao, locais_niveis, locais_top5):
+                        locais[ciclo].caption(f"⏳ {ciclo}: carregando...")
+                
+                # Preencher cada ciclo na ordem de chegada
+                for indice, resposta in self._requisitar_a_medida([payload for _, _, payload in tarefas]):
+                    tipo, ciclo, _ = tarefas[indice]
+                    df = self._processar_resposta(tipo, ciclo, resposta)
+                    if df is None:
+                        continue
+                    
+                    coletados[tipo][ciclo] = df
+                    if tipo == "geral":
+                        parciais = self.processador.calcular_agregados(df, pd.DataFrame())
+                        if len(coletados["geral"]) == 1 and parciais.info_entidade is not None:
+                            with local_metricas.container():
+                                self._exibir_metricas_basicas(parciais)
+                        if ciclo in parciais.por_ciclo.index:
+                            with locais_participacao[ciclo].container():
+                                self._exibir_participacao_ciclo(ciclo, parciais.por_ciclo.loc[ciclo])
+                            with locais_niveis[ciclo].container():
+                                self._exibir_niveis_ciclo(ciclo, parciais.por_ciclo.loc[ciclo])
+                    else:
+                        parciais = self.processador.calcular_agregados(pd.DataFrame(), df)
+                        if ciclo in parciais.maiores_habilidades:
+                            with locais_top5[ciclo].container():
+                                self._exibir_top5_ciclo(ciclo, parciais)
+                    
+                    primeira_exibicao.close()
+                
+                self._exibir_aviso_contingencia(aviso)
+                dados_gerais = [coletados["geral"][ciclo] for ciclo in ciclos if ciclo in coletados["geral"]]
+                dados_habilidades = [
+                    coletados["habilidades"][ciclo] for ciclo in ciclos if ciclo in coletados["habilidades"]
+                ]
+                
+                if dados_gerais or dados_habilidades:
+                    # Ciclos sem dados liberam seus espaços
+                    for tipo, locais in (
+                        ("geral", locais_participacao), ("geral", locais_niveis), ("habilidades", locais_top5)
+                    ):
+                        for ciclo, local in locais.items():
+                            if ciclo not in coletados[tipo]:
+                                local.empty()
+                    if not dados_gerais:
+                        secao_participacao.empty()
+                        secao_niveis.empty()
+                    if not dados_habilidades:
+                        secao_top5.empty()
+                    
+                    df_geral_consolidado = self.processador.consolidar(dados_gerais)
+                    df_habilidades_consolidado = self.processador.consolidar(dados_habilidades)
+                    agregados = self._obter_agregados(
+                        (entidade, etapa, componente), df_geral_consolidado, df_habilidades_consolidado
+                    )
+                    
+                    with local_proficiencia.container():
+                        self._exibir_proficiencia(agregados, df_habilidades_consolidado)
+                    if not agregados.por_ciclo.empty:
+                        with local_evolucao.container():
+                            self._exibir_evolucao_niveis(agregados, df_geral_consolidado)
+                    
+                    self._exibir_exportacao(
+                        {"dados_gerais": df_geral_consolidado, "dados_habilidades": df_habilidades_consolidado},
+                        f"{entidade}_{dict(config.SIGLAS_COMPONENTES)[componente]}_etapa{etapa}"
+                    )
+                    self._exibir_rodape()
+                else:
+                    # Sem dados: o aviso ocupa o lugar do cabeçalho e os erros exibidos continuam abaixo
+                    for local in (local_metricas, local_proficiencia, secao_participacao, secao_niveis, secao_top5):
+                        local.empty()
+                    with local_cabecalho.container():
+                        self._exibir_dados_nao_encontrados()
+    
+    def _obter_agregados(self, chave_consulta: Tuple[str, int, str], df_geral: pd.DataFrame,
+                         df_habilidades: pd.DataFrame) -> AgregadosPainel:
+        """Retorna os agregados da consulta, recalculando apenas quando os dados mudam"""
+        with medir("agregacao", cache="acerto") as span:
+            impressao = self.processador.impressao_digital(df_geral, df_habilidades)
+            em_cache = st.session_state.dados_cache.get(chave_consulta)
+            
+            if em_cache is None or em_cache[0] != impressao:
+                span.atributos["cache"] = "falha"
+                em_cache = (impressao, self.processador.calcular_agregados(df_geral, df_habilidades))
+                st.session_state.dados_cache[chave_consulta] = em_cache
+        
+        return em_cache[1]
+    
+    def _obter_figura(self, nome: str, frames: Tuple[pd.DataFrame, ...], parametros: Tuple,
+                      criar: Callable[[], Optional[go.Figure]]) -> Optional[go.Figure]:
+        """Obtém a figura do cache de figuras, construindo-a apenas se os dados ou parâmetros mudaram"""
+        with medir("figura", nome=nome, cache="acerto") as span:
+            def criar_medindo() -> Optional[go.Figure]:
+                span.atributos["cache"] = "falha"
+                return criar()
+            
+            chave = (nome, self.processador.impressao_digital(*frames), parametros)
+            return self.cache_figuras.obter(chave, criar_medindo)
+    
+    def _exibir_figura(self, nome: str, figura: go.Figure):
+        """Envia a figura ao navegador, medindo a serialização como etapa de renderização"""
+        with medir("renderizacao", nome=nome):
+            st.plotly_chart(figura, use_container_width=True)
+    
+    @secao("exportacao")
+    def _exibir_exportacao(self, conjuntos: Dict[str, pd.DataFrame], prefixo: str):
+        """
+        Oferece o download dos DataFrames consolidados em Parquet, Arrow IPC ou CSV
+        
+        Os arquivos são gerados somente no clique (download adiado), direto dos
+        DataFrames tipados e em lotes, e reaproveitados enquanto os dados não mudarem.
+        """
+        conjuntos = {nome: df for nome, df in conjuntos.items() if not df.empty}
+        if not conjuntos:
+            return
+        
+        with st.expander("📥 Exportar dados", expanded=False):
+            formato = st.radio(
+                "Formato",
+                options=list(FORMATOS),
+                format_func=lambda chave: FORMATOS[chave].rotulo,
+                horizontal=True,
+                key=f"formato_exportacao_{prefixo}"
+            )
+            
+            colunas = st.columns(len(conjuntos))
+            for coluna, (nome, df) in zip(colunas, conjuntos.items()):
+                # O Streamlit guarda em memória os bytes de cada download gerado (um
+                # arquivo aberto também seria lido por inteiro), então read_bytes é a
+                # única cópia além do arquivo em disco
+                def gerar_arquivo(df: pd.DataFrame = df) -> bytes:
+                    impressao = self.processador.impressao_digital(df)
+                    return self.cache_exportacoes.obter(df, impressao, formato).read_bytes()
+                
+                with coluna:
+                    st.download_button(
+                        f"⬇️ {nome.replace('_', ' ').capitalize()} ({len(df)} linhas)",
+                        data=gerar_arquivo,
+                        file_name=f"{nome}_{prefixo}{FORMATOS[formato].extensao}",
+                        mime=FORMATOS[formato].mimetype,
+                        on_click="ignore",
+                        key=f"exportar_{nome}_{prefixo}",
+                        use_container_width=True
+                    )
+    
+    def _exibir_metricas_basicas(self, agregados: AgregadosPainel):
         """Exibe métricas básicas do município/escola"""
-        info = df.iloc[0]
+        info = agregados.info_entidade
         
         st.markdown("""
         <div class="section-container">
@@ -1004,9 +1413,17 @@ class PainelResultados:
                 st.write("**Dados de Habilidades Consolidados**")
                 st.dataframe(df_habilidades, use_container_width=True, hide_index=True)
     
-    def _exibir_graficos(self, df_geral: pd.DataFrame, df_habilidades: pd.DataFrame):
+    def _exibir_graficos(self, agregados: AgregadosPainel, df_geral: pd.DataFrame, df_habilidades: pd.DataFrame):
         """Exibe gráficos principais"""
-        # Seção de Proficiência
+        self._exibir_proficiencia(agregados, df_habilidades)
+        
+        if not agregados.por_ciclo.empty:
+            self._exibir_participacao(agregados)
+            self._exibir_niveis(agregados, df_geral)
+    
+    @secao("proficiencia")
+    def _exibir_proficiencia(self, agregados: AgregadosPainel, df_habilidades: pd.DataFrame):
+        """Exibe as médias de proficiência por ciclo e o gráfico de habilidades"""
         st.markdown("""
         <div class="section-container">
             <h3 class="section-title">📊 Análise de Proficiência</h3>
@@ -1016,9 +1433,9 @@ class PainelResultados:
         col1, col2 = st.columns([0.3, 0.7])
         
         with col1:
-            if not df_geral.empty:
-                # Calcular médias por ciclo
-                medias = df_geral.groupby('Ciclo')['TX_ACERTOS'].mean()
+            if not agregados.por_ciclo.empty:
+                # Médias por ciclo
+                medias = agregados.por_ciclo['TX_ACERTOS']
                 
                 st.markdown("""
                 <div class="metric-card">
@@ -1042,108 +1459,201 @@ class PainelResultados:
                     <h3>🎯 Taxa de Acertos por Habilidades</h3>
                 </div>
                 """, unsafe_allow_html=True)
-                fig_habilidades = self.gerador_graficos.criar_grafico_habilidades(df_habilidades)
-                if fig_habilidades:
-                    st.plotly_chart(fig_habilidades, use_container_width=True)
+                self._exibir_grafico_habilidades(df_habilidades)
+    
+    def _exibir_grafico_habilidades(self, df_habilidades: pd.DataFrame):
+        """Exibe o gráfico de habilidades com seleção de ciclos, ranking ou paginação"""
+        modos = {
+            "maiores": "🥇 Maiores acertos",
+            "menores": "⚠️ Menores acertos",
+            "todas": "📄 Todas (por página)",
+        }
+        ciclos_disponiveis = [ciclo for ciclo in ORDEM_CICLOS if ciclo in set(df_habilidades['Ciclo'])]
+        total_habilidades = df_habilidades['CD_HABILIDADE'].nunique()
+        
+        col_ciclos, col_modo, col_quantidade = st.columns([0.4, 0.35, 0.25])
+        with col_ciclos:
+            ciclos = st.multiselect("Ciclos", options=ciclos_disponiveis, default=ciclos_disponiveis)
+        with col_modo:
+            modo = st.selectbox("Exibir", options=list(modos), format_func=modos.get)
+        
+        quantidade, pagina = config.HABILIDADES_POR_PAGINA, 1
+        with col_quantidade:
+            if modo == "todas":
+                total_paginas = max(1, -(-total_habilidades // quantidade))
+                pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1,
+                                         help=f"{total_habilidades} habilidades, {quantidade} por página")
+            else:
+                limite = max(1, min(total_habilidades, config.MAX_HABILIDADES_GRAFICO))
+                quantidade = st.number_input("Quantidade", min_value=1, max_value=limite,
+                                             value=min(10, limite))
+        
+        if not ciclos:
+            st.info("Selecione ao menos um ciclo.")
+            return
+        
+        fig_habilidades = self._obter_figura(
+            "habilidades", (df_habilidades,), (tuple(ciclos), modo, quantidade, pagina),
+            lambda: self.gerador_graficos.criar_grafico_habilidades(
+                self.processador.selecionar_habilidades(df_habilidades, ciclos, modo, quantidade, pagina)[0],
+                config
+            )
+        )
+        if fig_habilidades:
+            self._exibir_figura("habilidades", fig_habilidades)
+    
+    @secao("niveis")
+    def _exibir_niveis(self, agregados: AgregadosPainel, df_geral: pd.DataFrame):
+        """Exibe a distribuição dos estudantes por nível de aprendizagem"""
+        self._exibir_cabecalho_niveis()
         
-        # Gráficos de participação
-        if not df_geral.empty:
-            self._exibir_participacao(df_geral)
+        ciclos = [ciclo for ciclo in ORDEM_CICLOS if ciclo in agregados.por_ciclo.index]
+        for coluna, ciclo in zip(st.columns(len(ciclos)), ciclos):
+            with coluna:
+                self._exibir_niveis_ciclo(ciclo, agregados.por_ciclo.loc[ciclo])
         
-        # Gráfico de evolução
-        if not df_geral.empty:
-            st.markdown("""
-            <div class="section-container">
-                <h3 class="section-title">📈 Distribuição dos Estudantes por Nível de Aprendizagem</h3>
-                <p style="color: #6b7280; margin-bottom: 1rem;">
-                    Evolução da distribuição dos estudantes nos diferentes níveis de aprendizagem ao longo dos ciclos
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Debug: mostrar dados disponíveis
-            with st.expander("🔍 Dados dos Níveis (Modo Debug)", expanded=False):
-                st.write("**Dados disponíveis:**")
-                colunas_debug = ['Ciclo', 'NU_N01', 'NU_N02', 'NU_N03']
-                colunas_existentes = [col for col in colunas_debug if col in df_geral.columns]
-                st.dataframe(df_geral[colunas_existentes])
-            
-            fig_evolucao = self.gerador_graficos.criar_grafico_evolucao_niveis(df_geral)
-            if fig_evolucao:
-                st.plotly_chart(fig_evolucao, use_container_width=True)
-                
-                # Adicionar explicação dos níveis
-                with st.expander("📚 Entenda os Níveis de Aprendizagem", expanded=False):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.markdown("""
-                        <div class="metric-card">
-                            <h3>🔴 Defasagem</h3>
-                            <p>Os estudantes neste nível apresentam uma aprendizagem insuficiente para o ano de escolaridade avaliado. Necessitam de práticas de recomposição e recuperação de aprendizagens para avançarem.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown("""
-                        <div class="metric-card">
-                            <h3>🟡 Aprendizado Intermediário</h3>
-                            <p>Os alunos ainda não consolidaram todas as aprendizagens esperadas para o período. Precisam de reforço para progredir sem dificuldades.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        st.markdown("""
-                        <div class="metric-card">
-                            <h3>🟢 Aprendizado Adequado</h3>
-                            <p>Este é o nível de aprendizagem esperado, onde os estudantes desenvolveram as habilidades adequadas. Para estes, devem ser realizadas ações para aprofundamento e ampliação das aprendizagens.</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-            else:
-                st.warning("Não foi possível gerar o gráfico de distribuição. Verifique se os dados dos níveis estão disponíveis.")
+        self._exibir_evolucao_niveis(agregados, df_geral)
     
-    def _exibir_participacao(self, df_geral: pd.DataFrame):
-        """Exibe gráficos de participação"""
+    def _exibir_cabecalho_niveis(self):
+        """Exibe o título da seção de níveis de aprendizagem"""
         st.markdown("""
         <div class="section-container">
-            <h3 class="section-title">👥 Participação dos Estudantes</h3>
+            <h3 class="section-title">📈 Distribuição dos Estudantes por Nível de Aprendizagem</h3>
             <p style="color: #6b7280; margin-bottom: 1rem;">
-                Análise da participação dos estudantes nas avaliações por ciclo
+                Evolução da distribuição dos estudantes nos diferentes níveis de aprendizagem ao longo dos ciclos
             </p>
         </div>
         """, unsafe_allow_html=True)
+    
+    def _exibir_niveis_ciclo(self, ciclo: str, linha: pd.Series):
+        """Exibe a quantidade de estudantes em cada nível de aprendizagem de um ciclo"""
+        niveis = [
+            (coluna, rotulo) for coluna, rotulo in
+            (('NU_N01', "🔴 Defasagem"), ('NU_N02', "🟡 Intermediário"), ('NU_N03', "🟢 Adequado"))
+            if coluna in linha.index
+        ]
+        if not niveis:
+            return
         
-        col1, col2, col3 = st.columns(3)
-        cores = {"1º Ciclo": "#0c87a1", "2º Ciclo": "#7e84fa", "3º Ciclo": "#20ac52"}
+        st.markdown(f"""
+        <div class="metric-card" style="text-align: center;">
+            <h3 style="color: {CORES_CICLOS[ciclo]}; margin-bottom: 1rem;">{ciclo}</h3>
+        </div>
+        """, unsafe_allow_html=True)
         
-        for i, ciclo in enumerate(["1º Ciclo", "2º Ciclo", "3º Ciclo"]):
-            df_ciclo = df_geral[df_geral['Ciclo'] == ciclo]
+        for subcoluna, (coluna, rotulo) in zip(st.columns(len(niveis)), niveis):
+            with subcoluna:
+                st.metric(rotulo, f"{linha[coluna]:.0f}")
+    
+    def _exibir_evolucao_niveis(self, agregados: AgregadosPainel, df_geral: pd.DataFrame):
+        """Exibe o gráfico de evolução dos níveis ao longo dos ciclos"""
+        # Debug: mostrar dados disponíveis
+        with st.expander("🔍 Dados dos Níveis (Modo Debug)", expanded=False):
+            st.write("**Dados disponíveis:**")
+            colunas_debug = ['Ciclo', 'NU_N01', 'NU_N02', 'NU_N03']
+            colunas_existentes = [col for col in colunas_debug if col in df_geral.columns]
+            st.dataframe(df_geral[colunas_existentes])
+        
+        # Médias por ciclo
+        df_niveis = agregados.por_ciclo[[col for col in colunas_debug if col in agregados.por_ciclo.columns]]
+        fig_evolucao = self._obter_figura(
+            "evolucao_niveis", (df_niveis,), (),
+            lambda: self.gerador_graficos.criar_grafico_evolucao_niveis(df_niveis)
+        )
+        if fig_evolucao:
+            self._exibir_figura("evolucao_niveis", fig_evolucao)
             
-            if not df_ciclo.empty:
-                participacao = df_ciclo['TX_PARTICIPACAO'].mean()
-                previstos = df_ciclo['QT_PREVISTO'].sum()
-                efetivos = df_ciclo['QT_EFETIVO'].sum()
+            # Adicionar explicação dos níveis
+            with st.expander("📚 Entenda os Níveis de Aprendizagem", expanded=False):
+                col1, col2, col3 = st.columns(3)
                 
-                with [col1, col2, col3][i]:
-                    st.markdown(f"""
-                    <div class="metric-card" style="text-align: center;">
-                        <h3 style="color: {cores[ciclo]}; margin-bottom: 1rem;">{ciclo}</h3>
+                with col1:
+                    st.markdown("""
+                    <div class="metric-card">
+                        <h3>🔴 Defasagem</h3>
+                        <p>Os estudantes neste nível apresentam uma aprendizagem insuficiente para o ano de escolaridade avaliado. Necessitam de práticas de recomposição e recuperação de aprendizagens para avançarem.</p>
                     </div>
                     """, unsafe_allow_html=True)
-                    
-                    # Gauge de participação
-                    fig_gauge = self.gerador_graficos.criar_gauge_participacao(participacao, cores[ciclo])
-                    st.plotly_chart(fig_gauge, use_container_width=True)
-                    
-                    # Métricas de alunos
-                    subcol1, subcol2 = st.columns(2)
-                    with subcol1:
-                        st.metric("📋 Previstos", f"{previstos:.0f}")
-                    with subcol2:
-                        st.metric("✅ Efetivos", f"{efetivos:.0f}")
-    
-    def _exibir_analise_top5(self, df_habilidades: pd.DataFrame):
+                
+                with col2:
+                    st.markdown("""
+                    <div class="metric-card">
+                        <h3>🟡 Aprendizado Intermediário</h3>
+                        <p>Os alunos ainda não consolidaram todas as aprendizagens esperadas para o período. Precisam de reforço para progredir sem dificuldades.</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col3:
+                    st.markdown("""
+                    <div class="metric-card">
+                        <h3>🟢 Aprendizado Adequado</h3>
+                        <p>Este é o nível de aprendizagem esperado, onde os estudantes desenvolveram as habilidades adequadas. Para estes, devem ser realizadas ações para aprofundamento e ampliação das aprendizagens.</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+        else:
+            st.warning("Não foi possível gerar o gráfico de distribuição. Verifique se os dados dos níveis estão disponíveis.")
+
+    @secao("participacao")
+    def _exibir_participacao(self, agregados: AgregadosPainel):
+        """Exibe gráficos de participação"""
+        self._exibir_cabecalho_participacao()
+        
+        col1, col2, col3 = st.columns(3)
+        
+        for i, ciclo in enumerate(["1º Ciclo", "2º Ciclo", "3º Ciclo"]):
+            if ciclo in agregados.por_ciclo.index:
+                with [col1, col2, col3][i]:
+                    self._exibir_participacao_ciclo(ciclo, agregados.por_ciclo.loc[ciclo])
+    
+    def _exibir_cabecalho_participacao(self):
+        """Exibe o título da seção de participação"""
+        st.markdown("""
+        <div class="section-container">
+            <h3 class="section-title">👥 Participação dos Estudantes</h3>
+            <p style="color: #6b7280; margin-bottom: 1rem;">
+                Análise da participação dos estudantes nas avaliações por ciclo
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    def _exibir_participacao_ciclo(self, ciclo: str, linha: pd.Series):
+        """Exibe o gauge de participação e os totais de estudantes de um ciclo"""
+        cores = CORES_CICLOS
+        participacao = linha['TX_PARTICIPACAO']
+        previstos = linha['QT_PREVISTO']
+        efetivos = linha['QT_EFETIVO']
+        
+        st.markdown(f"""
+        <div class="metric-card" style="text-align: center;">
+            <h3 style="color: {cores[ciclo]}; margin-bottom: 1rem;">{ciclo}</h3>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Gauge de participação
+        fig_gauge = self._obter_figura(
+            "gauge_participacao", (), (float(participacao), cores[ciclo]),
+            lambda: self.gerador_graficos.criar_gauge_participacao(participacao, cores[ciclo])
+        )
+        self._exibir_figura("gauge_participacao", fig_gauge)
+        
+        # Métricas de alunos
+        subcol1, subcol2 = st.columns(2)
+        with subcol1:
+            st.metric("📋 Previstos", f"{previstos:.0f}")
+        with subcol2:
+            st.metric("✅ Efetivos", f"{efetivos:.0f}")
+    
+    @secao("top5")
+    def _exibir_analise_top5(self, agregados: AgregadosPainel):
         """Exibe análise das 5 melhores e piores habilidades"""
+        self._exibir_cabecalho_top5()
+        
+        for ciclo in ["1º Ciclo", "2º Ciclo", "3º Ciclo"]:
+            if ciclo in agregados.maiores_habilidades:
+                self._exibir_top5_ciclo(ciclo, agregados)
+    
+    def _exibir_cabecalho_top5(self):
+        """Exibe o título da seção de top 5 habilidades"""
         st.markdown("""
         <div class="section-container">
             <h3 class="section-title">🏆 Top 5 Habilidades por Desempenho</h3>
@@ -1152,38 +1662,36 @@ class PainelResultados:
             </p>
         </div>
         """, unsafe_allow_html=True)
+    
+    def _exibir_top5_ciclo(self, ciclo: str, agregados: AgregadosPainel):
+        """Exibe as 5 habilidades com maiores e menores desempenhos de um ciclo"""
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3 style="text-align: center; color: #1e40af; margin-bottom: 1.5rem;">{ciclo}</h3>
+        </div>
+        """, unsafe_allow_html=True)
         
-        for ciclo in ["1º Ciclo", "2º Ciclo", "3º Ciclo"]:
-            df_ciclo = df_habilidades[df_habilidades['Ciclo'] == ciclo]
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            <div class="metric-card">
+                <h3 style="color: #059669; margin-bottom: 1rem;">🥇 Maiores Desempenhos</h3>
+            </div>
+            """, unsafe_allow_html=True)
+            top_5 = agregados.maiores_habilidades[ciclo]
+            top_5 = top_5.assign(TX_ACERTO=top_5['TX_ACERTO'].round(1).astype(str) + '%')
+            st.dataframe(top_5, hide_index=True, use_container_width=True)
             
-            if not df_ciclo.empty:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h3 style="text-align: center; color: #1e40af; margin-bottom: 1.5rem;">{ciclo}</h3>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("""
-                    <div class="metric-card">
-                        <h3 style="color: #059669; margin-bottom: 1rem;">🥇 Maiores Desempenhos</h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    top_5 = df_ciclo.nlargest(5, 'TX_ACERTO')[['CD_HABILIDADE', 'DC_HABILIDADE', 'TX_ACERTO']]
-                    top_5['TX_ACERTO'] = top_5['TX_ACERTO'].round(1).astype(str) + '%'
-                    st.dataframe(top_5, hide_index=True, use_container_width=True)
-                    
-                with col2:
-                    st.markdown("""
-                    <div class="metric-card">
-                        <h3 style="color: #dc2626; margin-bottom: 1rem;">⚠️ Menores Desempenhos</h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    bottom_5 = df_ciclo.nsmallest(5, 'TX_ACERTO')[['CD_HABILIDADE', 'DC_HABILIDADE', 'TX_ACERTO']]
-                    bottom_5['TX_ACERTO'] = bottom_5['TX_ACERTO'].round(1).astype(str) + '%'
-                    st.dataframe(bottom_5, hide_index=True, use_container_width=True)
+        with col2:
+            st.markdown("""
+            <div class="metric-card">
+                <h3 style="color: #dc2626; margin-bottom: 1rem;">⚠️ Menores Desempenhos</h3>
+            </div>
+            """, unsafe_allow_html=True)
+            bottom_5 = agregados.menores_habilidades[ciclo]
+            bottom_5 = bottom_5.assign(TX_ACERTO=bottom_5['TX_ACERTO'].round(1).astype(str) + '%')
+            st.dataframe(bottom_5, hide_index=True, use_container_width=True)
     
     def _exibir_rodape(self):
         """Exibe rodapé institucional"""
@@ -1199,7 +1707,7 @@ class PainelResultados:
         """, unsafe_allow_html=True)
 
 # --------------------------------------------------------------------------
-# 9. EXECUÇÃO PRINCIPAL
+# 7. EXECUÇÃO PRINCIPAL
 # --------------------------------------------------------------------------
 
 def main():
@@ -0,0 +1,140 @@
+# --------------------------------------------------------------------------
+# AQUECIMENTO DO CACHE DE RESPOSTAS
+# --------------------------------------------------------------------------
+# Pré-carrega no cache persistente todas as combinações de entidade x etapa x
+# componente x ciclo (dados gerais e habilidades), para que os primeiros
+# acessos do dia não paguem a latência da API. Pode ser executado pelo cron,
+# sem iniciar o Streamlit:
+#
+#   python aquecer_cache.py --concorrencia 4 --relatorio aquecimento.json
+#
+# As credenciais são lidas do mesmo .streamlit/secrets.toml usado pelo painel.
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from nucleo.api import PRIORIDADE_SEGUNDO_PLANO, APIClient
+from nucleo.config import CONFIG_PADRAO as config
+from nucleo.payloads import PayloadGeral, PayloadHabilidades
+from nucleo.segredos import carregar_segredos
+
+
+@dataclass
+class ResultadoAquecimento:
+    """Resultado do aquecimento de uma combinação"""
+    entidade: str
+    etapa: int
+    componente: str
+    ciclo: str
+    dataset: str
+    status: str
+    latencia: float = 0.0
+    erro: Optional[str] = None
+
+
+def listar_entidades(segredos: Dict) -> List[str]:
+    """Municípios e escolas cadastrados, mais as escolas indígenas conhecidas"""
+    return sorted(set(segredos["users"]) | set(segredos["schools"]) | set(config.ESCOLAS_INDIGENAS))
+
+
+def listar_combinacoes(entidades: List[str], municipios: List[str], installation_id: str,
+                       session_token: str) -> List[tuple]:
+    """Monta (dimensões, payload) para cada entidade x etapa x componente x ciclo x dataset"""
+    combinacoes = []
+
+    for entidade in entidades:
+        for etapa in sorted(config.ETAPAS):
+            for componente in sorted(dict(config.COMPONENTES)):
+                for ciclo in sorted(dict(config.CICLOS)):
+                    for dataset, classe in (("geral", PayloadGeral), ("habilidades", PayloadHabilidades)):
+                        payload = classe(entidade, componente, etapa, ciclo, installation_id, session_token,
+                                         municipios=municipios, config=config).criar_payload()
+                        combinacoes.append(((entidade, etapa, componente, ciclo, dataset), payload))
+
+    return combinacoes
+
+
+def aquecer(api_client: APIClient, dimensoes: tuple, payload: Dict, forcar: bool) -> ResultadoAquecimento:
+    """Busca uma combinação na API e grava no cache, registrando latência e falhas"""
+    if not forcar and api_client.em_cache(payload):
+        return ResultadoAquecimento(*dimensoes, status="em_cache")
+
+    inicio = time.perf_counter()
+    try:
+        api_client.atualizar_cache(payload)
+        return ResultadoAquecimento(*dimensoes, status="ok", latencia=time.perf_counter() - inicio)
+    except Exception as e:
+        return ResultadoAquecimento(*dimensoes, status="falha", latencia=time.perf_counter() - inicio, erro=str(e))
+
+
+def imprimir_resumo(resultados: List[ResultadoAquecimento], duracao: float):
+    """Imprime o resumo do aquecimento"""
+    latencias = sorted(r.latencia for r in resultados if r.status == "ok")
+    contagem = {status: sum(r.status == status for r in resultados) for status in ("ok", "em_cache", "falha")}
+
+    print(f"\nCombinações: {len(resultados)} em {duracao:.1f}s")
+    print(f"  atualizadas: {contagem['ok']}  já em cache: {contagem['em_cache']}  falhas: {contagem['falha']}")
+
+    if latencias:
+        p95 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))]
+        print(f"  latência: mediana {statistics.median(latencias):.2f}s  p95 {p95:.2f}s  máx {latencias[-1]:.2f}s")
+
+    for r in sorted(resultados, key=lambda r: (r.entidade, r.etapa, r.componente, r.ciclo, r.dataset)):
+        if r.status == "falha":
+            print(f"  FALHA {r.entidade} {r.etapa}º ano {r.componente} ciclo {r.ciclo} {r.dataset}: {r.erro}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pré-carrega o cache de respostas da API do painel")
+    parser.add_argument("--concorrencia", type=int, default=4, help="requisições simultâneas à API (padrão: 4)")
+    parser.add_argument("--entidades", nargs="*", help="restringe o aquecimento a estes códigos")
+    parser.add_argument("--forcar", action="store_true", help="atualiza mesmo as entradas ainda válidas")
+    parser.add_argument("--relatorio", help="grava o resultado de cada combinação neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        segredos = carregar_segredos()
+        installation_id = segredos["api"]["installation_id"]
+        session_token = segredos["api"]["session_token"]
+        municipios = list(segredos["users"])
+        entidades = args.entidades or listar_entidades(segredos)
+    except (KeyError, FileNotFoundError, tomllib.TOMLDecodeError) as e:
+        print(f"Erro na configuração: {e}. Verifique o arquivo secrets.toml", file=sys.stderr)
+        return 2
+
+    combinacoes = listar_combinacoes(entidades, municipios, installation_id, session_token)
+    api_client = APIClient(config, prioridade=PRIORIDADE_SEGUNDO_PLANO)
+    resultados = []
+    inicio = time.perf_counter()
+
+    print(f"Aquecendo {len(combinacoes)} combinações de {len(entidades)} entidades "
+          f"com concorrência {args.concorrencia}...")
+
+    with ThreadPoolExecutor(max_workers=args.concorrencia) as executor:
+        futuros = [executor.submit(aquecer, api_client, dimensoes, payload, args.forcar) for dimensoes, payload in combinacoes]
+
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            print(f"[{len(resultados):>5}/{len(combinacoes)}] {resultado.entidade} {resultado.etapa}º ano "
+                  f"{resultado.componente} ciclo {resultado.ciclo} {resultado.dataset}: "
+                  f"{resultado.status} {resultado.latencia:.2f}s", flush=True)
+
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+
+    if args.relatorio:
+        with open(args.relatorio, "w", encoding="utf-8") as arquivo:
+            json.dump([asdict(r) for r in resultados], arquivo, ensure_ascii=False, indent=2)
+
+    return 1 if any(r.status == "falha" for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
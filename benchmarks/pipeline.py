@@ -0,0 +1,313 @@
+# --------------------------------------------------------------------------
+# BENCHMARK DO PIPELINE PAYLOAD → REQUISIÇÃO → PROCESSAMENTO → GRÁFICOS
+# --------------------------------------------------------------------------
+# Mede separadamente cada etapa do caminho percorrido pelo painel para uma
+# entidade (três ciclos, dados gerais e habilidades), com dados sintéticos em
+# 1x, 10x e 100x o tamanho de uma entidade. Roda sem rede: as respostas são
+# geradas pelo simulador (simulador_caed.py), servido em uma porta local.
+#
+#   python -m benchmarks.pipeline --saida benchmarks/resultados/base.json
+#   python -m benchmarks.pipeline --comparar benchmarks/resultados/base.json
+#   python -m benchmarks.pipeline --comparar base.json atual.json
+#
+# Cada etapa é executada uma vez para aquecimento, --repeticoes vezes para o
+# tempo (mediana e mínimo) e uma vez com tracemalloc, para o pico de memória
+# alocada pelo Python.
+
+import argparse
+import dataclasses
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import plotly
+
+from nucleo.api import APIClient
+from nucleo.config import CONFIG_PADRAO
+from nucleo.graficos import CORES_CICLOS, GeradorGraficos
+from nucleo.json_incremental import decodificar_em_colunas
+from nucleo.payloads import PayloadGeral, PayloadHabilidades
+from nucleo.processamento import ProcessadorDados
+from simulador_caed import ENTIDADES_POR_NIVEL, Simulador, criar_servidor, gerar_resposta
+
+ESCALAS_PADRAO = (1, 10, 100)
+
+# Consulta de referência (uma entidade, todos os ciclos)
+ENTIDADE = "2300101"
+COMPONENTE = "Língua Portuguesa"
+ETAPA = 2
+
+# Razão entre medianas (atual / base) acima da qual a etapa é apontada como regressão
+LIMIAR_REGRESSAO = 1.25
+
+
+@dataclass
+class MedicaoEtapa:
+    """Tempo e memória de uma etapa do pipeline"""
+    mediana_ms: float
+    minimo_ms: float
+    pico_kb: float
+    repeticoes: int
+
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> MedicaoEtapa:
+    """Cronometra funcao() e mede o pico de memória em uma execução à parte"""
+    # Execução de aquecimento (imports tardios, caches do pandas), descartada
+    funcao()
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    # tracemalloc distorce os tempos, então a memória é medida separadamente
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return MedicaoEtapa(
+        mediana_ms=round(statistics.median(tempos), 3),
+        minimo_ms=round(min(tempos), 3),
+        pico_kb=round(pico / 1024, 1),
+        repeticoes=repeticoes
+    )
+
+
+def montar_payloads(escala: int) -> List[Tuple[str, str, Dict]]:
+    """(ciclo, dataset, payload) da consulta de referência
+
+    Na escala 1 a consulta é a da própria entidade; nas demais, um nível abaixo,
+    com escala entidades, o que multiplica as linhas de cada resposta.
+    """
+    nivel = CONFIG_PADRAO.NIVEL_ENTIDADE if escala == 1 else CONFIG_PADRAO.NIVEL_ABAIXO
+    return [
+        (ciclo_label, dataset, classe(ENTIDADE, COMPONENTE, ETAPA, ciclo_key, "benchmark", "benchmark",
+                                      nivel_abaixo=nivel).criar_payload())
+        for ciclo_key, ciclo_label in sorted(dict(CONFIG_PADRAO.CICLOS).items())
+        for dataset, classe in (("geral", PayloadGeral), ("habilidades", PayloadHabilidades))
+    ]
+
+
+class ServidorLocal:
+    """Simulador servido em uma porta local livre, com as respostas pré-geradas"""
+
+    def __init__(self, respostas: List[Tuple[Dict, Dict]]):
+        simulador = Simulador()
+        for payload, resposta in respostas:
+            simulador.adicionar_fixture(payload, resposta)
+
+        self.servidor = criar_servidor(simulador, porta=0)
+        host, porta = self.servidor.server_address[:2]
+        self.url = f"http://{host}:{porta}/"
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+    def encerrar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+def medir_escala(escala: int, repeticoes: int) -> Dict:
+    """Executa todas as etapas do pipeline em uma escala"""
+    processador, gerador = ProcessadorDados(), GeradorGraficos()
+    consultas = montar_payloads(escala)
+
+    # Preparação (fora das medições): respostas sintéticas e seus corpos JSON
+    fator = 1.0 if escala == 1 else escala / ENTIDADES_POR_NIVEL
+    respostas = [gerar_resposta(payload, fator) for _, _, payload in consultas]
+    corpos = [json.dumps(resposta, ensure_ascii=False).encode() for resposta in respostas]
+    tamanho_pedaco = CONFIG_PADRAO.TAMANHO_PEDACO
+
+    def construir_payloads():
+        return montar_payloads(escala)
+
+    def decodificar_json():
+        return [json.loads(corpo) for corpo in corpos]
+
+    def decodificar_incremental():
+        return [
+            decodificar_em_colunas(corpo[i:i + tamanho_pedaco] for i in range(0, len(corpo), tamanho_pedaco))
+            for corpo in corpos
+        ]
+
+    colunares = decodificar_incremental()
+
+    def construir_dataframes():
+        gerais, habilidades = [], []
+        for (ciclo, dataset, _), resposta in zip(consultas, colunares):
+            if dataset == "geral":
+                gerais.append(processador.processar_dados_gerais(resposta, ciclo))
+            else:
+                habilidades.append(processador.processar_dados_habilidades(resposta, ciclo))
+        return processador.consolidar(gerais), processador.consolidar(habilidades)
+
+    df_geral, df_habilidades = construir_dataframes()
+    ciclos = list(CORES_CICLOS)
+
+    def agregar():
+        processador.impressao_digital(df_geral, df_habilidades)
+        agregados = processador.calcular_agregados(df_geral, df_habilidades)
+        selecionadas, _ = processador.selecionar_habilidades(df_habilidades, ciclos, "maiores", 10)
+        ranking = processador.calcular_ranking_regional(df_geral)
+        return agregados, selecionadas, ranking
+
+    agregados, selecionadas, _ = agregar()
+    niveis = agregados.por_ciclo[['NU_N01', 'NU_N02', 'NU_N03']]
+
+    def construir_figuras():
+        return [
+            gerador.criar_grafico_habilidades(selecionadas),
+            gerador.criar_grafico_evolucao_niveis(niveis),
+            *(gerador.criar_gauge_participacao(agregados.por_ciclo.loc[ciclo, 'TX_PARTICIPACAO'], CORES_CICLOS[ciclo])
+              for ciclo in agregados.por_ciclo.index)
+        ]
+
+    figuras = construir_figuras()
+
+    def serializar_figuras():
+        return [figura.to_json() for figura in figuras]
+
+    # Requisições por HTTP local, com decodificação e gravação no cache
+    servidor = ServidorLocal([(payload, resposta) for (_, _, payload), resposta in zip(consultas, respostas)])
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Sem limite de taxa: a etapa mede transporte e decodificação, não o governador
+        config = dataclasses.replace(
+            CONFIG_PADRAO, API_URL=servidor.url, CACHE_ARQUIVO=f"{diretorio}/respostas.sqlite3",
+            TAXA_CHAMADAS=1e6, RAJADA_CHAMADAS=10 ** 6
+        )
+        api_client = APIClient(config)
+
+        def requisitar():
+            return [api_client.atualizar_cache(payload) for _, _, payload in consultas]
+
+        try:
+            etapas = {
+                "payloads": medir(construir_payloads, repeticoes),
+                "requisicao_http": medir(requisitar, repeticoes),
+                "decodificacao_json": medir(decodificar_json, repeticoes),
+                "decodificacao_incremental": medir(decodificar_incremental, repeticoes),
+                "dataframes": medir(construir_dataframes, repeticoes),
+                "agregacao": medir(agregar, repeticoes),
+                "figuras": medir(construir_figuras, repeticoes),
+                "serializacao_figuras": medir(serializar_figuras, repeticoes),
+            }
+        finally:
+            servidor.encerrar()
+
+    return {
+        "linhas": {"geral": len(df_geral), "habilidades": len(df_habilidades)},
+        "bytes_respostas": sum(len(corpo) for corpo in corpos),
+        "etapas": {nome: asdict(medicao) for nome, medicao in etapas.items()},
+    }
+
+
+def descrever_ambiente() -> Dict[str, str]:
+    """Versões e máquina, para que resultados de ambientes diferentes não sejam confundidos"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+
+    return {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+    }
+
+
+def imprimir_resultados(resultados: Dict):
+    for escala, dados in resultados["escalas"].items():
+        linhas = dados["linhas"]
+        print(f"\nEscala {escala}x: {linhas['geral']} linhas gerais, {linhas['habilidades']} de habilidades, "
+              f"{dados['bytes_respostas'] / 1024:.0f} KB de respostas")
+        for nome, medicao in dados["etapas"].items():
+            print(f"  {nome:<27} mediana {medicao['mediana_ms']:>9.2f} ms  mín {medicao['minimo_ms']:>9.2f} ms  "
+                  f"pico {medicao['pico_kb']:>9.0f} KB")
+
+
+def comparar(base: Dict, atual: Dict, limiar: float) -> int:
+    """Imprime a razão atual/base de cada etapa e retorna o número de regressões"""
+    regressoes = 0
+    print(f"\nBase: {base['ambiente'].get('commit') or '?'} ({base['ambiente']['data']})  "
+          f"Atual: {atual['ambiente'].get('commit') or '?'} ({atual['ambiente']['data']})")
+
+    for escala, dados in atual["escalas"].items():
+        etapas_base = base["escalas"].get(escala, {}).get("etapas", {})
+        print(f"\nEscala {escala}x")
+        for nome, medicao in dados["etapas"].items():
+            anterior = etapas_base.get(nome)
+            if anterior is None:
+                print(f"  {nome:<27} {medicao['mediana_ms']:>9.2f} ms  (sem base)")
+                continue
+
+            razao = medicao["mediana_ms"] / anterior["mediana_ms"] if anterior["mediana_ms"] else float("inf")
+            razao_memoria = medicao["pico_kb"] / anterior["pico_kb"] if anterior["pico_kb"] else float("inf")
+            marca = ""
+            if razao > limiar:
+                regressoes += 1
+                marca = "  <-- REGRESSÃO"
+            print(f"  {nome:<27} {anterior['mediana_ms']:>9.2f} -> {medicao['mediana_ms']:>9.2f} ms  "
+                  f"x{razao:.2f}  memória x{razao_memoria:.2f}{marca}")
+
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline do painel, sem acesso à rede")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS_PADRAO),
+                        help="múltiplos do tamanho de uma entidade (padrão: 1 10 100)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="execuções cronometradas por etapa (padrão: 5)")
+    parser.add_argument("--saida", help="grava os resultados neste arquivo JSON")
+    parser.add_argument("--comparar", nargs="+", metavar="JSON",
+                        help="compara com um resultado anterior (BASE) ou dois resultados já gravados (BASE ATUAL)")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_REGRESSAO,
+                        help=f"razão de tempo considerada regressão (padrão: {LIMIAR_REGRESSAO})")
+    args = parser.parse_args(argv)
+
+    if args.comparar and len(args.comparar) > 2:
+        parser.error("--comparar aceita BASE ou BASE ATUAL")
+
+    if args.comparar and len(args.comparar) == 2:
+        base, atual = (json.loads(Path(arquivo).read_text(encoding="utf-8")) for arquivo in args.comparar)
+        return 1 if comparar(base, atual, args.limiar) else 0
+
+    resultados = {"ambiente": descrever_ambiente(), "escalas": {}}
+    for escala in args.escalas:
+        print(f"Medindo escala {escala}x...", flush=True)
+        resultados["escalas"][str(escala)] = medir_escala(escala, args.repeticoes)
+
+    imprimir_resultados(resultados)
+
+    if args.saida:
+        Path(args.saida).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.saida).write_text(json.dumps(resultados, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nResultados gravados em {args.saida}")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar[0]).read_text(encoding="utf-8"))
+        return 1 if comparar(base, resultados, args.limiar) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Núcleo do painel de resultados, sem dependência do Streamlit
+
+Montagem de payloads, cliente da API (com cache persistente de respostas),
+processamento e agregação dos dados, exportação em formatos colunares e
+figuras Plotly. Pode ser usado pelo painel, por scripts em lote e por
+benchmarks.
+
+Os nomes abaixo são importados sob demanda: importar apenas a configuração
+ou os payloads não carrega o pandas nem o requests.
+"""
+
+from importlib import import_module
+
+_EXPORTACOES = {
+    "ConfigNucleo": "config",
+    "CONFIG_PADRAO": "config",
+    "PayloadBase": "payloads",
+    "PayloadGeral": "payloads",
+    "PayloadHabilidades": "payloads",
+    "APIClient": "api",
+    "ChamadaUnica": "api",
+    "CircuitoAberto": "api",
+    "Disjuntor": "api",
+    "EsperaExcedida": "api",
+    "FalhaRecente": "api",
+    "Governador": "api",
+    "PRIORIDADE_INTERATIVA": "api",
+    "PRIORIDADE_SEGUNDO_PLANO": "api",
+    "MetricasTransporte": "api",
+    "Revalidador": "api",
+    "TransporteHTTP": "api",
+    "CacheRespostas": "cache_respostas",
+    "chave_consulta": "cache_respostas",
+    "CacheExportacoes": "exportacao",
+    "FORMATOS": "exportacao",
+    "exportar": "exportacao",
+    "AgregadosPainel": "processamento",
+    "ORDEM_CICLOS": "processamento",
+    "ProcessadorDados": "processamento",
+    "METRICAS": "telemetria",
+    "Rastreamento": "telemetria",
+    "medir": "telemetria",
+    "rastrear": "telemetria",
+    "carregar_segredos": "segredos",
+    "CORES_CICLOS": "graficos",
+    "GeradorGraficos": "graficos",
+}
+
+__all__ = sorted(_EXPORTACOES)
+
+
+def __getattr__(nome: str):
+    if nome not in _EXPORTACOES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(f".{_EXPORTACOES[nome]}", __name__), nome)
+    globals()[nome] = valor
+    return valor
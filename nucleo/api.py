@@ -0,0 +1,777 @@
+# --------------------------------------------------------------------------
+# CLIENTE DA API
+# --------------------------------------------------------------------------
+# Transporte HTTP (keep-alive, compressão, novas tentativas), revalidação em
+# segundo plano, coalescência de requisições simultâneas, limite de chamadas
+# por processo, disjuntor com última resposta boa e o cliente com cache
+# persistente. Falhas são propagadas como exceções do requests; cabe a quem
+# chama decidir como apresentá-las.
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, TypeVar, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .cache_respostas import CacheRespostas, chave_consulta
+from .config import CONFIG_PADRAO, ConfigNucleo
+from .json_incremental import decodificar_em_colunas
+from .telemetria import medir
+
+
+@dataclass
+class MetricasTransporte:
+    """Contadores do transporte HTTP compartilhado"""
+    requisicoes: int = 0
+    handshakes: int = 0
+    tentativas_repetidas: int = 0
+    bytes_recebidos: int = 0
+    bytes_descomprimidos: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def incrementar(self, **valores: int):
+        with self._lock:
+            for campo, valor in valores.items():
+                setattr(self, campo, getattr(self, campo) + valor)
+
+    @property
+    def conexoes_reutilizadas(self) -> int:
+        return max(self.requisicoes - self.handshakes, 0)
+
+    def resumo(self) -> Dict[str, int]:
+        """Retorna uma cópia dos contadores"""
+        with self._lock:
+            return {
+                "requisicoes": self.requisicoes,
+                "handshakes": self.handshakes,
+                "conexoes_reutilizadas": self.conexoes_reutilizadas,
+                "tentativas_repetidas": self.tentativas_repetidas,
+                "bytes_recebidos": self.bytes_recebidos,
+                "bytes_descomprimidos": self.bytes_descomprimidos,
+            }
+
+
+class _AdaptadorContador(HTTPAdapter):
+    """HTTPAdapter que conta conexões novas (handshakes) e requisições enviadas"""
+
+    def __init__(self, metricas: MetricasTransporte, **kwargs):
+        self.metricas = metricas
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        metricas = self.metricas
+
+        def contar_conexoes(pool_base):
+            class PoolContador(pool_base):
+                def _new_conn(self):
+                    metricas.incrementar(handshakes=1)
+                    return super()._new_conn()
+            return PoolContador
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": contar_conexoes(HTTPConnectionPool),
+            "https": contar_conexoes(HTTPSConnectionPool),
+        }
+
+    def send(self, request, **kwargs):
+        self.metricas.incrementar(requisicoes=1)
+        return super().send(request, **kwargs)
+
+
+class TransporteHTTP:
+    """
+    Sessão HTTP com keep-alive, compressão e novas tentativas
+
+    Uma única instância deve ser compartilhada pelo processo, de modo que as
+    conexões TLS com a API sejam reaproveitadas entre requisições e usuários.
+    """
+
+    def __init__(self, config: ConfigNucleo = CONFIG_PADRAO):
+        self.config = config
+        self.max_tentativas = config.MAX_TENTATIVAS
+        self.metricas = MetricasTransporte()
+
+        # Novas tentativas são feitas aqui, com backoff, e não pelo urllib3
+        adaptador = _AdaptadorContador(
+            self.metricas, pool_connections=config.POOL_CONEXOES, pool_maxsize=config.POOL_MAXIMO, max_retries=0
+        )
+        self.sessao = requests.Session()
+        self.sessao.mount("https://", adaptador)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Envia um POST, repetindo em timeouts, erros de conexão e status transitórios
+
+        getDadosResultado é uma consulta somente leitura, então repetir o POST é seguro.
+        """
+        for tentativa in range(self.max_tentativas):
+            ultima = tentativa == self.max_tentativas - 1
+            try:
+                response = self.sessao.post(url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if ultima:
+                    raise
+            else:
+                if response.status_code not in self.config.STATUS_TRANSITORIOS or ultima:
+                    # Em modo stream o corpo ainda não foi lido; quem consome registra
+                    if not kwargs.get("stream"):
+                        self.registrar_recebimento(response, len(response.content))
+                    return response
+                response.close()
+
+            self.metricas.incrementar(tentativas_repetidas=1)
+            time.sleep(self._calcular_espera(tentativa))
+
+    def registrar_recebimento(self, response: requests.Response, bytes_descomprimidos: int):
+        """Contabiliza os bytes recebidos pela rede (comprimidos) e após descompressão"""
+        self.metricas.incrementar(
+            bytes_recebidos=response.raw.tell() or bytes_descomprimidos,
+            bytes_descomprimidos=bytes_descomprimidos
+        )
+
+    def _calcular_espera(self, tentativa: int) -> float:
+        """Backoff exponencial com jitter completo"""
+        limite = min(self.config.BACKOFF_MAXIMO, self.config.BACKOFF_BASE * (2 ** tentativa))
+        return random.uniform(0, limite)
+
+
+class Revalidador:
+    """
+    Atualiza entradas expiradas do cache em segundo plano
+
+    Atualizações concorrentes da mesma chave são deduplicadas: enquanto uma
+    chave está sendo revalidada, novos pedidos para ela são ignorados.
+    """
+
+    def __init__(self, max_workers: int = CONFIG_PADRAO.REVALIDACAO_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="revalidacao")
+        self._em_andamento = set()
+        self._lock = threading.Lock()
+
+    def agendar(self, chave: str, atualizar: Callable[[], object]) -> bool:
+        """Agenda atualizar() para a chave; retorna False se já houver uma em andamento"""
+        with self._lock:
+            if chave in self._em_andamento:
+                return False
+            self._em_andamento.add(chave)
+
+        def executar():
+            try:
+                atualizar()
+            except Exception as e:
+                logging.warning(f"Falha ao revalidar {chave}: {e}")
+            finally:
+                with self._lock:
+                    self._em_andamento.discard(chave)
+
+        self._executor.submit(executar)
+        return True
+
+
+T = TypeVar("T")
+
+# Prioridades das chamadas à API (menor é atendida primeiro)
+PRIORIDADE_INTERATIVA = 0
+PRIORIDADE_SEGUNDO_PLANO = 1
+
+_NOMES_PRIORIDADES = {PRIORIDADE_INTERATIVA: "interativa", PRIORIDADE_SEGUNDO_PLANO: "segundo_plano"}
+
+
+class EsperaExcedida(requests.exceptions.Timeout):
+    """A chamada não obteve vaga no limite de chamadas à API dentro da espera máxima"""
+
+
+class Governador:
+    """
+    Limite de chamadas à API do processo
+
+    Combina um máximo de chamadas em andamento com um balde de fichas (taxa
+    sustentada e rajada). Quem espera forma uma fila por prioridade e, dentro
+    da mesma prioridade, por ordem de chegada: carregamentos de página
+    (interativos) passam à frente do aquecimento e de lotes (segundo plano).
+    A prioridade pode ser uma função, consultada de novo em reavaliar(), para
+    que uma chamada já na fila seja promovida. Uma única instância deve ser
+    compartilhada pelo processo; processos diferentes não se coordenam, e
+    para_processo() dá a cada um a sua parte do orçamento configurado.
+    """
+
+    def __init__(self, max_em_andamento: int = CONFIG_PADRAO.MAX_CHAMADAS_SIMULTANEAS,
+                 taxa: float = CONFIG_PADRAO.TAXA_CHAMADAS, rajada: int = CONFIG_PADRAO.RAJADA_CHAMADAS,
+                 espera_maxima: float = CONFIG_PADRAO.ESPERA_MAXIMA_FILA):
+        if max_em_andamento < 1 or rajada < 1:
+            raise ValueError(f"Máximo em andamento e rajada devem ser ao menos 1: {max_em_andamento}, {rajada}")
+        if taxa <= 0:
+            raise ValueError(f"Taxa de chamadas deve ser positiva: {taxa}")
+        if espera_maxima < 0:
+            raise ValueError(f"Espera máxima na fila não pode ser negativa: {espera_maxima}")
+
+        self.max_em_andamento = max_em_andamento
+        self.taxa = taxa
+        self.rajada = rajada
+        self.espera_maxima = espera_maxima
+
+        self._condicao = threading.Condition()
+        self._fila = []
+        self._sequencia = itertools.count()
+        self._em_andamento = 0
+        self._fichas = float(rajada)
+        self._reposicao = time.monotonic()
+
+        self.fila_maxima = 0
+        self.atendidas = {nome: 0 for nome in _NOMES_PRIORIDADES.values()}
+        self.espera_total = {nome: 0.0 for nome in _NOMES_PRIORIDADES.values()}
+        self.esperas_excedidas = 0
+
+    @classmethod
+    def para_processo(cls, config: ConfigNucleo = CONFIG_PADRAO,
+                      prioridade: int = PRIORIDADE_INTERATIVA) -> "Governador":
+        """
+        Governador com a parte do orçamento de chamadas que cabe ao processo
+
+        Processos interativos (painel) ficam com o que sobra da
+        FRACAO_SEGUNDO_PLANO; cada processo de segundo plano, com a fração
+        dividida pelos PROCESSOS_SEGUNDO_PLANO.
+        """
+        if not 0 < config.FRACAO_SEGUNDO_PLANO < 1 or config.PROCESSOS_SEGUNDO_PLANO < 1:
+            raise ValueError(
+                f"Divisão do orçamento de chamadas inválida: fração {config.FRACAO_SEGUNDO_PLANO}, "
+                f"{config.PROCESSOS_SEGUNDO_PLANO} processos de segundo plano"
+            )
+
+        if prioridade == PRIORIDADE_INTERATIVA:
+            parte = 1 - config.FRACAO_SEGUNDO_PLANO
+        else:
+            parte = config.FRACAO_SEGUNDO_PLANO / config.PROCESSOS_SEGUNDO_PLANO
+        return cls(
+            max(1, round(config.MAX_CHAMADAS_SIMULTANEAS * parte)), config.TAXA_CHAMADAS * parte,
+            max(1, round(config.RAJADA_CHAMADAS * parte)), config.ESPERA_MAXIMA_FILA
+        )
+
+    def _repor_fichas(self):
+        agora = time.monotonic()
+        self._fichas = min(self.rajada, self._fichas + (agora - self._reposicao) * self.taxa)
+        self._reposicao = agora
+
+    @contextmanager
+    def reservar(self, prioridade: Union[int, Callable[[], int]] = PRIORIDADE_INTERATIVA) -> Iterator[None]:
+        """
+        Aguarda a vez na fila e ocupa uma vaga durante o bloco
+
+        Raises:
+            EsperaExcedida: Sem vaga dentro da espera máxima
+        """
+        prioridade_atual = prioridade if callable(prioridade) else lambda: prioridade
+        inicio = time.monotonic()
+        prazo = inicio + self.espera_maxima
+
+        with medir("fila_api") as span, self._condicao:
+            # [prioridade, ordem de chegada, função da prioridade]; a ordem desempata antes da função
+            entrada = [prioridade_atual(), next(self._sequencia), prioridade_atual]
+            inicial = entrada[0]
+            heapq.heappush(self._fila, entrada)
+            self.fila_maxima = max(self.fila_maxima, len(self._fila))
+
+            while True:
+                espera = None
+                if self._fila[0] is entrada and self._em_andamento < self.max_em_andamento:
+                    self._repor_fichas()
+                    if self._fichas >= 1:
+                        break
+                    # Próxima ficha
+                    espera = (1 - self._fichas) / self.taxa
+
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    self._fila.remove(entrada)
+                    heapq.heapify(self._fila)
+                    self.esperas_excedidas += 1
+                    self._condicao.notify_all()
+                    raise EsperaExcedida(f"Sem vaga para chamar a API em {self.espera_maxima:g}s")
+                self._condicao.wait(min(espera, restante) if espera is not None else restante)
+
+            heapq.heappop(self._fila)
+            self._fichas -= 1
+            self._em_andamento += 1
+            esperado = time.monotonic() - inicio
+            nome_prioridade = _NOMES_PRIORIDADES.get(entrada[0], str(entrada[0]))
+            span.atributos["prioridade"] = nome_prioridade
+            if entrada[0] < inicial:
+                span.atributos["promovida"] = True
+            self.atendidas[nome_prioridade] = self.atendidas.get(nome_prioridade, 0) + 1
+            self.espera_total[nome_prioridade] = self.espera_total.get(nome_prioridade, 0.0) + esperado
+            span.atributos["fila"] = len(self._fila)
+            # O próximo da fila pode já ter vaga
+            self._condicao.notify_all()
+
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._em_andamento -= 1
+                self._condicao.notify_all()
+
+    def reavaliar(self):
+        """Consulta de novo a prioridade de quem espera na fila; as promovidas passam à frente"""
+        with self._condicao:
+            promovidas = False
+            for entrada in self._fila:
+                atual = entrada[2]()
+                if atual < entrada[0]:
+                    entrada[0] = atual
+                    promovidas = True
+            if promovidas:
+                heapq.heapify(self._fila)
+                self._condicao.notify_all()
+
+    def resumo(self) -> Dict[str, object]:
+        """Ocupação, fila e esperas médias por prioridade"""
+        with self._condicao:
+            return {
+                "em_andamento": self._em_andamento,
+                "na_fila": len(self._fila),
+                "fila_maxima": self.fila_maxima,
+                "atendidas": dict(self.atendidas),
+                "espera_media_s": {
+                    nome: round(self.espera_total[nome] / atendidas, 3) if atendidas else 0.0
+                    for nome, atendidas in self.atendidas.items()
+                },
+                "esperas_excedidas": self.esperas_excedidas,
+            }
+
+
+class ChamadaUnica:
+    """
+    Coalescência de chamadas concorrentes (single-flight)
+
+    Enquanto uma chamada para uma chave está em andamento, novas chamadas com a
+    mesma chave não são executadas: esperam a primeira e recebem o mesmo
+    resultado (ou a mesma exceção). A execução assume a prioridade mais urgente
+    entre as chamadas que a esperam, consultada com prioridade(). Uma única
+    instância deve ser compartilhada pelo processo, para que sessões diferentes
+    também sejam coalescidas.
+    """
+
+    def __init__(self):
+        self._em_andamento: Dict[str, Future] = {}
+        self._prioridades: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.executadas = 0
+        self.coalescidas = 0
+        self.promovidas = 0
+
+    def executar(self, chave: str, funcao: Callable[[], T], prioridade: int = PRIORIDADE_INTERATIVA,
+                 ao_promover: Optional[Callable[[], None]] = None) -> T:
+        """
+        Executa funcao() ou, se já houver uma execução para a chave, espera o resultado dela
+
+        Quem chega com prioridade mais urgente que a da execução em andamento a
+        promove e chama ao_promover() (por exemplo, Governador.reavaliar).
+        """
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            lider = futuro is None
+            promovida = False
+            if lider:
+                futuro = self._em_andamento[chave] = Future()
+                self._prioridades[chave] = prioridade
+                self.executadas += 1
+            else:
+                self.coalescidas += 1
+                promovida = prioridade < self._prioridades[chave]
+                if promovida:
+                    self._prioridades[chave] = prioridade
+                    self.promovidas += 1
+
+        if not lider:
+            if promovida and ao_promover is not None:
+                ao_promover()
+            with medir("espera_coalescida"):
+                return futuro.result()
+
+        try:
+            resultado = funcao()
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+                del self._prioridades[chave]
+
+    def prioridade(self, chave: str, padrao: int) -> int:
+        """Prioridade atual da execução em andamento para a chave (padrao se não houver)"""
+        with self._lock:
+            return self._prioridades.get(chave, padrao)
+
+    def resumo(self) -> Dict[str, int]:
+        """Chamadas executadas, coalescidas e promovidas, e chaves em andamento"""
+        with self._lock:
+            return {
+                "executadas": self.executadas,
+                "coalescidas": self.coalescidas,
+                "promovidas": self.promovidas,
+                "em_andamento": len(self._em_andamento),
+            }
+
+
+class FalhaRecente(requests.exceptions.RequestException):
+    """A consulta falhou há pouco e a falha ainda está dentro da validade no cache"""
+
+
+class CircuitoAberto(requests.exceptions.ConnectionError):
+    """O disjuntor está aberto e não há resposta anterior da consulta no cache"""
+
+
+# Estados do disjuntor
+FECHADO = "fechado"
+ABERTO = "aberto"
+MEIO_ABERTO = "meio_aberto"
+ESTADOS_DISJUNTOR = (FECHADO, MEIO_ABERTO, ABERTO)
+
+
+class Disjuntor:
+    """
+    Disjuntor das chamadas à API
+
+    Fechado, deixa passar tudo e conta falhas seguidas (erros de conexão,
+    tempo esgotado, HTTP 5xx e respostas mais lentas que o limite). Ao atingir
+    o limite, abre: as chamadas falham na hora com CircuitoAberto. Passada a
+    espera, fica meio aberto e libera um número limitado de sondas; sucessos
+    suficientes fecham o circuito, e qualquer falha o reabre. Uma única
+    instância deve ser compartilhada pelo processo.
+    """
+
+    def __init__(self, falhas: int = CONFIG_PADRAO.DISJUNTOR_FALHAS,
+                 lentidao: float = CONFIG_PADRAO.DISJUNTOR_LENTIDAO, espera: float = CONFIG_PADRAO.DISJUNTOR_ESPERA,
+                 sondas: int = CONFIG_PADRAO.DISJUNTOR_SONDAS, sucessos: int = CONFIG_PADRAO.DISJUNTOR_SUCESSOS):
+        self.falhas = falhas
+        self.lentidao = lentidao
+        self.espera = espera
+        self.sondas = sondas
+        self.sucessos = sucessos
+
+        self._lock = threading.Lock()
+        self.estado = FECHADO
+        self._falhas_seguidas = 0
+        self._sucessos_sondas = 0
+        self._sondas_em_andamento = 0
+        self._aberto_em = 0.0
+
+        self.aberturas = 0
+        self.rejeitadas = 0
+
+    def _liberar(self) -> bool:
+        """
+        Libera a chamada, reservando uma sonda quando meio aberto
+
+        Returns:
+            Se a chamada é uma sonda
+
+        Raises:
+            CircuitoAberto: O circuito está aberto (ou sem sonda livre)
+        """
+        with self._lock:
+            if self.estado == ABERTO and time.monotonic() - self._aberto_em >= self.espera:
+                self.estado = MEIO_ABERTO
+                self._sucessos_sondas = 0
+                logging.info("Disjuntor da API meio aberto: sondando")
+
+            if self.estado == FECHADO:
+                return False
+            if self.estado == MEIO_ABERTO and self._sondas_em_andamento < self.sondas:
+                self._sondas_em_andamento += 1
+                return True
+
+            self.rejeitadas += 1
+        raise CircuitoAberto("API indisponível: disjuntor aberto")
+
+    def verificar(self):
+        """
+        Rejeita na hora, sem reservar sonda, a chamada que o circuito não liberaria
+
+        Permite falhar antes de esperar na fila do governador; a liberação
+        efetiva continua em proteger.
+
+        Raises:
+            CircuitoAberto: O circuito está aberto (ou sem sonda livre)
+        """
+        with self._lock:
+            if self.estado == FECHADO:
+                return
+            if self.estado == ABERTO and time.monotonic() - self._aberto_em >= self.espera:
+                return
+            if self.estado == MEIO_ABERTO and self._sondas_em_andamento < self.sondas:
+                return
+
+            self.rejeitadas += 1
+        raise CircuitoAberto("API indisponível: disjuntor aberto")
+
+    def _registrar(self, sucesso: bool, sonda: bool):
+        with self._lock:
+            if sonda:
+                self._sondas_em_andamento -= 1
+
+            if sucesso:
+                self._falhas_seguidas = 0
+                if self.estado == MEIO_ABERTO:
+                    self._sucessos_sondas += 1
+                    if self._sucessos_sondas >= self.sucessos:
+                        self.estado = FECHADO
+                        logging.info("Disjuntor da API fechado: serviço recuperado")
+                return
+
+            self._falhas_seguidas += 1
+            if self.estado == MEIO_ABERTO or self._falhas_seguidas >= self.falhas:
+                if self.estado != ABERTO:
+                    self.aberturas += 1
+                    logging.warning(f"Disjuntor da API aberto após {self._falhas_seguidas} falha(s) seguida(s)")
+                self.estado = ABERTO
+                self._aberto_em = time.monotonic()
+
+    @staticmethod
+    def _indica_falha(erro: BaseException) -> bool:
+        """Erros que indicam serviço degradado (4xx é problema da consulta, não da API)"""
+        if isinstance(erro, EsperaExcedida):
+            return False
+        if isinstance(erro, requests.exceptions.HTTPError):
+            return erro.response is None or erro.response.status_code >= 500
+        return isinstance(erro, requests.exceptions.RequestException)
+
+    @contextmanager
+    def proteger(self) -> Iterator[None]:
+        """
+        Executa o bloco se o circuito permitir, registrando sucesso, falha ou lentidão
+
+        Raises:
+            CircuitoAberto: O circuito está aberto (ou sem sonda livre)
+        """
+        sonda = self._liberar()
+        inicio = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if self._indica_falha(e):
+                self._registrar(False, sonda)
+            elif sonda:
+                with self._lock:
+                    self._sondas_em_andamento -= 1
+            raise
+        else:
+            self._registrar(time.monotonic() - inicio <= self.lentidao, sonda)
+
+    def resumo(self) -> Dict[str, object]:
+        """Estado, falhas seguidas, aberturas e chamadas rejeitadas"""
+        with self._lock:
+            return {
+                "estado": self.estado,
+                "falhas_seguidas": self._falhas_seguidas,
+                "aberturas": self.aberturas,
+                "rejeitadas": self.rejeitadas,
+            }
+
+
+class APIClient:
+    """
+    Cliente para comunicação com a API, com cache persistente de respostas
+
+    Transporte, cache, revalidador, coalescência, governador e disjuntor podem
+    ser compartilhados entre clientes; os ausentes são criados a partir da
+    configuração. Sem revalidador, entradas expiradas não são servidas: a
+    resposta é buscada de novo na hora. Buscas simultâneas da mesma consulta
+    resultam em uma única requisição à API, e toda requisição passa pelo
+    governador, com a prioridade do cliente (revalidações em segundo plano).
+
+    A validade de cada resposta depende do ciclo (encerrado ou em aberto) e de
+    ela estar vazia; falhas da API ficam registradas por pouco tempo, e a mesma
+    consulta não é reenviada enquanto isso.
+
+    Se a API falhar ou o disjuntor estiver aberto, a última resposta boa da
+    consulta no cache é servida, qualquer que seja a idade; a data dela fica
+    em contingencias (chave -> criado_em) para que a interface a indique.
+    """
+
+    def __init__(self, config: ConfigNucleo = CONFIG_PADRAO, transporte: Optional[TransporteHTTP] = None,
+                 cache: Optional[CacheRespostas] = None, revalidador: Optional[Revalidador] = None,
+                 chamada_unica: Optional[ChamadaUnica] = None, governador: Optional[Governador] = None,
+                 prioridade: int = PRIORIDADE_INTERATIVA, disjuntor: Optional[Disjuntor] = None):
+        self.config = config
+        self.base_url = config.API_URL
+        self.timeout = config.REQUEST_TIMEOUT
+        self.headers = {"Content-Type": "application/json"}
+        self.transporte = transporte or TransporteHTTP(config)
+        self.cache = cache or CacheRespostas(config.CACHE_ARQUIVO, config.CACHE_TAMANHO_MAXIMO)
+        self.revalidador = revalidador
+        self.chamada_unica = chamada_unica or ChamadaUnica()
+        self.governador = governador or Governador.para_processo(config, prioridade)
+        self.prioridade = prioridade
+        self.disjuntor = disjuntor or Disjuntor(
+            config.DISJUNTOR_FALHAS, config.DISJUNTOR_LENTIDAO, config.DISJUNTOR_ESPERA,
+            config.DISJUNTOR_SONDAS, config.DISJUNTOR_SUCESSOS
+        )
+        self.contingencias: Dict[str, float] = {}
+
+    def requisitar_dados(self, payload: Dict) -> Dict:
+        """
+        Retorna a resposta da API para o payload, do cache quando possível
+
+        Args:
+            payload: Dados da requisição
+
+        Returns:
+            Resposta da API
+
+        Raises:
+            requests.exceptions.RequestException: Falha na requisição
+        """
+        chave, dimensoes = chave_consulta(payload)
+
+        with medir("requisicao", dataset=dimensoes["dataset"], ciclo=dimensoes["ciclo"]) as span:
+            entrada = self.cache.obter(chave)
+            if entrada is not None:
+                if entrada.valida:
+                    span.atributos["cache"] = "acerto"
+                    return entrada.valor
+
+                # Expirada, mas ainda aceitável: servir já e atualizar em segundo plano
+                if (self.revalidador is not None and self.config.CACHE_SERVIR_EXPIRADO
+                        and entrada.idade <= self.config.CACHE_IDADE_MAXIMA):
+                    self.revalidador.agendar(
+                        chave, lambda: self.atualizar_cache(payload, prioridade=PRIORIDADE_SEGUNDO_PLANO)
+                    )
+                    span.atributos["cache"] = "expirado"
+                    if self.disjuntor.estado != FECHADO:
+                        self.contingencias[chave] = entrada.criado_em
+                    return entrada.valor
+
+            try:
+                falha = self.cache.obter_falha(chave)
+                if falha is not None:
+                    span.atributos["cache"] = "negativo"
+                    raise FalhaRecente(falha)
+
+                span.atributos["cache"] = "falha"
+                return self.atualizar_cache(payload)
+            except requests.exceptions.RequestException as e:
+                if entrada is None:
+                    raise
+                # Última resposta boa, qualquer que seja a idade
+                logging.warning(f"API indisponível ({type(e).__name__}); servindo resposta de "
+                                f"{time.strftime('%d/%m/%Y %H:%M', time.localtime(entrada.criado_em))}")
+                span.atributos["cache"] = "contingencia"
+                self.contingencias[chave] = entrada.criado_em
+                return entrada.valor
+
+    def atualizar_cache(self, payload: Dict, prioridade: Optional[int] = None) -> Dict:
+        """
+        Busca a resposta na API e grava no cache (somente respostas bem-sucedidas)
+
+        Chamadas simultâneas para a mesma consulta compartilham a mesma requisição.
+        A prioridade na fila do governador é a do cliente, salvo se informada, e
+        sobe se uma chamada mais urgente passar a esperar a mesma requisição.
+        """
+        chave, dimensoes = chave_consulta(payload)
+        prioridade = self.prioridade if prioridade is None else prioridade
+
+        def prioridade_atual() -> int:
+            return self.chamada_unica.prioridade(chave, prioridade)
+
+        def buscar_e_gravar() -> Dict:
+            try:
+                # Circuito aberto falha na hora, sem ocupar a fila do governador
+                self.disjuntor.verificar()
+                with self.governador.reservar(prioridade_atual), self.disjuntor.proteger():
+                    resposta = self._requisitar_api(payload)
+            except (CircuitoAberto, EsperaExcedida):
+                # Condições locais, não da consulta
+                raise
+            except requests.exceptions.RequestException as e:
+                self.cache.gravar_falha(chave, f"{type(e).__name__}: {e}", self.config.CACHE_TTL_FALHA)
+                raise
+
+            self.cache.gravar(chave, dimensoes, resposta, self.validade(dimensoes, resposta))
+            return resposta
+
+        return self.chamada_unica.executar(chave, buscar_e_gravar, prioridade, self.governador.reavaliar)
+
+    def validade(self, dimensoes: Dict[str, str], resposta: Dict) -> Optional[float]:
+        """Validade (s) da resposta no cache; None para ciclos encerrados que não expiram"""
+        if not resposta.get("result"):
+            return self.config.CACHE_TTL_VAZIO
+        if dimensoes["ciclo"] in self.config.CICLOS_ENCERRADOS:
+            return self.config.CACHE_TTL_ENCERRADO
+        return self.config.CACHE_TTL
+
+    def em_cache(self, payload: Dict) -> bool:
+        """Indica se há resposta ainda válida para o payload"""
+        chave, _ = chave_consulta(payload)
+        entrada = self.cache.obter(chave)
+        return entrada is not None and entrada.valida
+
+    def _resposta_grande(self, response: requests.Response) -> bool:
+        """Indica se o corpo compensa a decodificação incremental (tamanho na rede desconhecido conta como grande)"""
+        tamanho = response.headers.get("Content-Length")
+        if tamanho is None or not tamanho.isdigit():
+            return True
+        return int(tamanho) >= self.config.DECODIFICACAO_INCREMENTAL_MINIMO
+
+    def _requisitar_api(self, payload: Dict) -> Dict:
+        """Envia o payload à API, levantando exceção em caso de falha"""
+        incremental = self.config.DECODIFICACAO_INCREMENTAL
+        with medir("http_espera"):
+            response = self.transporte.post(
+                self.base_url,
+                json=payload,
+                headers=self.headers,
+                timeout=self.timeout,
+                stream=incremental
+            )
+
+        if incremental and not self._resposta_grande(response):
+            # Corpo pequeno: json.loads sai mais barato que o decodificador incremental
+            with response:
+                response.raise_for_status()
+                self.transporte.registrar_recebimento(response, len(response.content))
+            incremental = False
+
+        if not incremental:
+            response.raise_for_status()
+            with medir("decodificacao", bytes=len(response.content)):
+                return response.json()
+
+        with response, medir("decodificacao") as span:
+            response.raise_for_status()
+
+            recebidos = 0
+            def pedacos():
+                nonlocal recebidos
+                for pedaco in response.iter_content(chunk_size=self.config.TAMANHO_PEDACO):
+                    recebidos += len(pedaco)
+                    yield pedaco
+
+            # "result" chega em formato colunar, sem a lista intermediária de dicionários.
+            # Corpo malformado vira erro do requests, como no response.json()
+            try:
+                resposta = decodificar_em_colunas(pedacos())
+            except ValueError as e:
+                raise requests.exceptions.InvalidJSONError(f"Resposta inválida da API: {e}", response=response) from e
+            self.transporte.registrar_recebimento(response, recebidos)
+            span.atributos["bytes"] = recebidos
+
+        return resposta
@@ -0,0 +1,215 @@
+# --------------------------------------------------------------------------
+# CACHE PERSISTENTE DE RESPOSTAS DA API
+# --------------------------------------------------------------------------
+# Cache em disco (SQLite) compartilhado entre processos e reinicializações.
+# As respostas são gravadas como JSON comprimido (zlib) e o tamanho total é
+# limitado, com descarte das entradas usadas há mais tempo (LRU). Cada entrada
+# tem a própria validade (ou nenhuma, para dados que não mudam mais), e falhas
+# recentes ficam em tabela separada, sem apagar a última resposta boa.
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Campos do payload que não identificam a consulta
+_CAMPOS_CREDENCIAIS = ("_InstallationId", "_SessionToken")
+
+# Intervalo mínimo (s) entre atualizações do último acesso de uma entrada: a
+# ordem LRU não precisa de precisão maior, e leituras não disputam a escrita
+INTERVALO_ACESSO = 60
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    chave TEXT PRIMARY KEY,
+    entidade TEXT,
+    etapa TEXT,
+    componente TEXT,
+    ciclo TEXT,
+    dataset TEXT,
+    dados BLOB NOT NULL,
+    tamanho INTEGER NOT NULL,
+    criado_em REAL NOT NULL,
+    acessado_em REAL NOT NULL,
+    expira_em REAL
+);
+CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em);
+CREATE TABLE IF NOT EXISTS falhas (
+    chave TEXT PRIMARY KEY,
+    erro TEXT NOT NULL,
+    expira_em REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class EntradaCache:
+    """Resposta armazenada no cache (expira_em None: não expira)"""
+    valor: Dict
+    criado_em: float
+    expira_em: Optional[float] = None
+
+    @property
+    def idade(self) -> float:
+        return time.time() - self.criado_em
+
+    @property
+    def valida(self) -> bool:
+        return self.expira_em is None or time.time() < self.expira_em
+
+
+def chave_consulta(payload: Dict) -> Tuple[str, Dict[str, str]]:
+    """
+    Gera a chave de cache de um payload e suas dimensões
+
+    A chave combina entidade, etapa, componente, ciclo e dataset com um resumo
+    do payload completo (sem credenciais), para que qualquer outra diferença
+    na consulta gere uma entrada distinta.
+    """
+    filtros = {filtro["field"]: filtro["value"] for filtro in payload.get("filtros", [])}
+    dimensoes = {
+        "entidade": str(payload.get("agregado", "")),
+        "etapa": str(filtros.get("DADOS.VL_FILTRO_ETAPA", "")),
+        "componente": str(filtros.get("DADOS.VL_FILTRO_DISCIPLINA", "")),
+        "ciclo": str(filtros.get("DADOS.VL_FILTRO_AVALIACAO", "")),
+        "dataset": "habilidades" if "DADOS.DC_FAIXA_PERCENTUAL_HABILIDADE" in filtros else "geral",
+    }
+
+    consulta = {campo: valor for campo, valor in payload.items() if campo not in _CAMPOS_CREDENCIAIS}
+    resumo = hashlib.sha256(json.dumps(consulta, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
+    chave = "|".join([*dimensoes.values(), str(payload.get("nivelAbaixo", "")), resumo])
+
+    return chave, dimensoes
+
+
+class CacheRespostas:
+    """Cache de respostas em SQLite, seguro para várias threads e processos"""
+
+    def __init__(self, caminho: str, tamanho_maximo: int):
+        self.caminho = Path(caminho)
+        self.tamanho_maximo = tamanho_maximo
+        self._local = threading.local()
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        with self._conexao() as conexao:
+            conexao.executescript(_ESQUEMA)
+        self._migrar()
+
+    def _migrar(self):
+        """Acrescenta a validade por entrada a arquivos antigos, uma única vez entre processos"""
+        conexao = self._conexao()
+        try:
+            # A transação exclusiva serializa processos que abrem o mesmo arquivo antigo
+            conexao.execute("BEGIN IMMEDIATE")
+            colunas = {linha[1] for linha in conexao.execute("PRAGMA table_info(respostas)")}
+            if "expira_em" not in colunas:
+                # Arquivos anteriores à validade por entrada: tudo expirado (revalidado no próximo acesso)
+                conexao.execute("ALTER TABLE respostas ADD COLUMN expira_em REAL")
+                conexao.execute("UPDATE respostas SET expira_em = criado_em")
+            conexao.commit()
+        except sqlite3.OperationalError as e:
+            conexao.rollback()
+            if "duplicate column" not in str(e):
+                raise
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Conexão própria de cada thread (conexões SQLite não são compartilháveis)"""
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=10)
+            # WAL permite leituras concorrentes enquanto outro processo grava
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    def obter(self, chave: str) -> Optional[EntradaCache]:
+        """Retorna a entrada da chave (válida ou expirada), ou None se ausente"""
+        try:
+            with self._conexao() as conexao:
+                linha = conexao.execute(
+                    "SELECT dados, criado_em, expira_em, acessado_em FROM respostas WHERE chave = ?", (chave,)
+                ).fetchone()
+                if linha is None:
+                    return None
+
+                dados, criado_em, expira_em, acessado_em = linha
+                agora = time.time()
+                if agora - acessado_em > INTERVALO_ACESSO:
+                    conexao.execute("UPDATE respostas SET acessado_em = ? WHERE chave = ?", (agora, chave))
+
+            return EntradaCache(json.loads(zlib.decompress(dados)), criado_em, expira_em)
+
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logging.warning(f"Falha ao ler o cache de respostas: {e}")
+            return None
+
+    def gravar(self, chave: str, dimensoes: Dict[str, str], valor: Dict, validade: Optional[float] = None):
+        """
+        Grava uma resposta e descarta as entradas menos usadas se o limite for excedido
+
+        A validade (s) conta a partir de agora; None grava uma entrada que não
+        expira. Uma falha registrada para a chave é apagada.
+        """
+        dados = zlib.compress(json.dumps(valor, ensure_ascii=False).encode(), 6)
+        agora = time.time()
+        expira_em = None if validade is None else agora + validade
+
+        try:
+            with self._conexao() as conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (chave, dimensoes.get("entidade"), dimensoes.get("etapa"), dimensoes.get("componente"),
+                     dimensoes.get("ciclo"), dimensoes.get("dataset"), dados, len(dados), agora, agora, expira_em)
+                )
+                conexao.execute("DELETE FROM falhas WHERE chave = ?", (chave,))
+                self._descartar_excedente(conexao)
+
+        except sqlite3.Error as e:
+            logging.warning(f"Falha ao gravar no cache de respostas: {e}")
+
+    def obter_falha(self, chave: str) -> Optional[str]:
+        """Retorna a descrição da falha recente da chave, ou None se não houver (ou já expirou)"""
+        try:
+            with self._conexao() as conexao:
+                linha = conexao.execute(
+                    "SELECT erro FROM falhas WHERE chave = ? AND expira_em > ?", (chave, time.time())
+                ).fetchone()
+            return linha[0] if linha is not None else None
+
+        except sqlite3.Error as e:
+            logging.warning(f"Falha ao ler o cache de respostas: {e}")
+            return None
+
+    def gravar_falha(self, chave: str, erro: str, validade: float):
+        """Registra a falha de uma consulta por validade (s), mantendo a última resposta boa"""
+        try:
+            with self._conexao() as conexao:
+                conexao.execute("DELETE FROM falhas WHERE expira_em <= ?", (time.time(),))
+                conexao.execute(
+                    "INSERT OR REPLACE INTO falhas VALUES (?, ?, ?)", (chave, erro, time.time() + validade)
+                )
+
+        except sqlite3.Error as e:
+            logging.warning(f"Falha ao gravar no cache de respostas: {e}")
+
+    def _descartar_excedente(self, conexao: sqlite3.Connection):
+        """Remove as entradas acessadas há mais tempo até caber no tamanho máximo"""
+        total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+
+        descartar = []
+        for chave, tamanho in conexao.execute("SELECT chave, tamanho FROM respostas ORDER BY acessado_em"):
+            if total <= self.tamanho_maximo:
+                break
+            descartar.append((chave,))
+            total -= tamanho
+
+        conexao.executemany("DELETE FROM respostas WHERE chave = ?", descartar)
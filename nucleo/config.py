@@ -0,0 +1,141 @@
+# --------------------------------------------------------------------------
+# CONFIGURAÇÃO DO NÚCLEO
+# --------------------------------------------------------------------------
+# Parâmetros da API, do transporte HTTP e do cache de respostas, além das
+# dimensões das avaliações (etapas, ciclos, componentes). A configuração é
+# passada explicitamente às classes do núcleo; CONFIG_PADRAO é usada quando
+# nenhuma é informada.
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Endpoint de produção da CAEd
+API_URL_CAED = "https://criancaalfabetizada.caeddigital.net/portal/functions/getDadosResultado"
+
+# Endpoint consultado: CAED_API_URL aponta o cliente para outro servidor,
+# como o simulador local (simulador_caed.py)
+_API_URL = os.environ.get("CAED_API_URL", API_URL_CAED)
+
+
+@dataclass(frozen=True)
+class ConfigNucleo:
+    """Configuração do núcleo (sem parâmetros de interface)"""
+    # URLs e endpoints
+    API_URL: str = _API_URL
+
+    # Timeout para requisições
+    REQUEST_TIMEOUT: int = 30
+
+    # Pool de conexões HTTP (compartilhado por todas as sessões do processo)
+    POOL_CONEXOES: int = 4
+    POOL_MAXIMO: int = 16
+
+    # Novas tentativas com backoff exponencial (com jitter) em falhas transitórias
+    MAX_TENTATIVAS: int = 3
+    BACKOFF_BASE: float = 0.5
+    BACKOFF_MAXIMO: float = 8.0
+    STATUS_TRANSITORIOS: set = frozenset({429, 500, 502, 503, 504})
+
+    # Cache persistente de respostas (SQLite, compartilhado entre processos);
+    # respostas de outro servidor ficam em arquivo separado das de produção
+    CACHE_ARQUIVO: str = ".cache/respostas.sqlite3" if _API_URL == API_URL_CAED else ".cache/respostas-local.sqlite3"
+    CACHE_TAMANHO_MAXIMO: int = 256 * 1024 * 1024
+
+    # Validade das respostas (s) conforme o ciclo (filtro de avaliação):
+    # ciclos encerrados não mudam mais (None: não expira), o ciclo em aberto
+    # muda raramente. Respostas vazias e falhas têm validades curtas próprias;
+    # falhas não apagam a última resposta boa
+    CICLOS_ENCERRADOS: set = frozenset({"AV12025", "AV22025"})
+    CACHE_TTL_ENCERRADO: Optional[int] = None
+    CACHE_TTL: int = 300
+    CACHE_TTL_VAZIO: int = 60
+    CACHE_TTL_FALHA: int = 15
+
+    # Stale-while-revalidate: entradas expiradas são servidas na hora e
+    # atualizadas em segundo plano, até a idade máxima (s)
+    CACHE_SERVIR_EXPIRADO: bool = True
+    CACHE_IDADE_MAXIMA: int = 24 * 3600
+    REVALIDACAO_WORKERS: int = 2
+
+    # Orçamento total de chamadas à API: máximo em andamento, taxa sustentada
+    # (chamadas/s) com rajada, e espera máxima na fila (s). O limite é aplicado
+    # por processo, sem coordenação entre processos: o painel fica com uma parte
+    # e os processos de segundo plano (aquecimento, relatórios) dividem a
+    # FRACAO_SEGUNDO_PLANO entre os PROCESSOS_SEGUNDO_PLANO que rodam ao mesmo
+    # tempo. Dentro de um processo, chamadas interativas passam à frente
+    MAX_CHAMADAS_SIMULTANEAS: int = 8
+    TAXA_CHAMADAS: float = 10.0
+    RAJADA_CHAMADAS: int = 10
+    ESPERA_MAXIMA_FILA: float = 20.0
+    FRACAO_SEGUNDO_PLANO: float = 0.25
+    PROCESSOS_SEGUNDO_PLANO: int = 1
+
+    # Disjuntor da API: abre após falhas (ou respostas lentas, em s) seguidas e,
+    # aberto, falha na hora servindo a última resposta boa do cache. Depois da
+    # espera (s), libera sondas simultâneas limitadas; fecha após os sucessos
+    DISJUNTOR_FALHAS: int = 3
+    DISJUNTOR_LENTIDAO: float = 10.0
+    DISJUNTOR_ESPERA: float = 30.0
+    DISJUNTOR_SONDAS: int = 1
+    DISJUNTOR_SUCESSOS: int = 2
+
+    # Decodificação incremental do corpo das respostas, direto em colunas. Custa
+    # cerca de 2x a CPU do json.loads, então só é usada quando o corpo na rede
+    # (Content-Length, já comprimido) passa do mínimo ou tem tamanho desconhecido
+    DECODIFICACAO_INCREMENTAL: bool = True
+    DECODIFICACAO_INCREMENTAL_MINIMO: int = 256 * 1024
+    TAMANHO_PEDACO: int = 64 * 1024
+
+    # Telemetria: linhas JSON com os tempos de cada etapa e métricas no formato
+    # texto do Prometheus (coletor textfile do node_exporter)
+    TELEMETRIA_LOG: str = ".cache/telemetria.jsonl"
+    TELEMETRIA_LOG_TAMANHO_MAXIMO: int = 16 * 1024 * 1024
+    METRICAS_ARQUIVO: str = ".cache/metricas.prom"
+
+    # Exportação dos dados consolidados (Parquet/Arrow/CSV): arquivos gerados
+    # sob demanda, reaproveitados pela impressão digital dos dados
+    EXPORTACAO_DIRETORIO: str = ".cache/exportacoes"
+    EXPORTACAO_TAMANHO_MAXIMO: int = 512 * 1024 * 1024
+
+    # Gráfico de habilidades: barras acima das quais o gráfico passa a usar
+    # WebGL e barras acima das quais os rótulos de valor são omitidos
+    LIMITE_BARRAS_SVG: int = 60
+    LIMITE_BARRAS_ROTULO: int = 45
+
+    # Etapas disponíveis
+    ETAPAS: set = frozenset({1, 2, 3, 4, 5})
+
+    # Nível de agregação abaixo da entidade consultada (0 = a própria entidade)
+    NIVEL_ENTIDADE: str = "0"
+    NIVEL_ABAIXO: str = "1"
+
+    # Ciclos de avaliação
+    CICLOS: Dict[str, str] = frozenset({
+        "1": "1º Ciclo",
+        "2": "2º Ciclo",
+        "3": "3º Ciclo",
+    }.items())
+
+    # Componentes curriculares
+    COMPONENTES: Dict[str, str] = frozenset({
+        "Língua Portuguesa": "LÍNGUA PORTUGUESA",
+        "Matemática": "MATEMÁTICA"
+    }.items())
+
+    # Siglas dos componentes nos códigos de indicadores
+    SIGLAS_COMPONENTES: Dict[str, str] = frozenset({
+        "Língua Portuguesa": "LP",
+        "Matemática": "MT"
+    }.items())
+
+    # Escolas indígenas (códigos conhecidos)
+    ESCOLAS_INDIGENAS: set = frozenset({
+        "23000291", "23244755", "23239174", "23564067", "23283610",
+        "23215674", "23263423", "23061642", "23462353", "23062770",
+        "23241462", "23235411", "23241454", "23215682", "23263555"
+    })
+
+
+# Configuração usada quando nenhuma é passada explicitamente
+CONFIG_PADRAO = ConfigNucleo()
@@ -0,0 +1,133 @@
+# --------------------------------------------------------------------------
+# EXPORTAÇÃO DOS DADOS CONSOLIDADOS
+# --------------------------------------------------------------------------
+# Grava os DataFrames tipados em Parquet, Arrow IPC ou CSV via pyarrow, em
+# lotes de linhas: cada lote é convertido e escrito antes do próximo, então o
+# pico de memória é o de um lote, não o de uma segunda cópia do DataFrame.
+# Os arquivos ficam em disco, indexados pela impressão digital dos dados, e
+# são reaproveitados enquanto os dados não mudarem.
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# Linhas convertidas e gravadas por vez
+TAMANHO_LOTE = 50_000
+
+
+@dataclass(frozen=True)
+class FormatoExportacao:
+    """Formato de arquivo oferecido para exportação"""
+    rotulo: str
+    mimetype: str
+    extensao: str
+
+
+FORMATOS: Dict[str, FormatoExportacao] = {
+    "parquet": FormatoExportacao("Parquet", "application/vnd.apache.parquet", ".parquet"),
+    "arrow": FormatoExportacao("Arrow IPC", "application/vnd.apache.arrow.file", ".arrow"),
+    "csv": FormatoExportacao("CSV", "text/csv", ".csv"),
+}
+
+
+def _decodificar_dicionarios(lote: pa.RecordBatch) -> pa.RecordBatch:
+    """Substitui colunas dictionary (categorias do pandas) pelos valores, para o CSV"""
+    colunas = [
+        coluna.dictionary_decode() if pa.types.is_dictionary(coluna.type) else coluna
+        for coluna in lote.columns
+    ]
+    return pa.RecordBatch.from_arrays(colunas, names=lote.schema.names)
+
+
+def exportar(df: pd.DataFrame, formato: str, destino: Path, tamanho_lote: int = TAMANHO_LOTE):
+    """
+    Grava o DataFrame no formato pedido, lote a lote
+
+    Args:
+        df: DataFrame tipado (categorias viram colunas dictionary no Arrow/Parquet)
+        formato: Chave de FORMATOS
+        destino: Arquivo de saída
+        tamanho_lote: Linhas por lote
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+
+    esquema = pa.Schema.from_pandas(df, preserve_index=False)
+    lotes = (
+        pa.RecordBatch.from_pandas(df.iloc[inicio:inicio + tamanho_lote], schema=esquema, preserve_index=False)
+        for inicio in range(0, len(df), tamanho_lote)
+    )
+
+    if formato == "parquet":
+        with pq.ParquetWriter(destino, esquema, compression="zstd") as escritor:
+            for lote in lotes:
+                escritor.write_batch(lote)
+
+    elif formato == "arrow":
+        with pa.OSFile(str(destino), "wb") as arquivo, pa.ipc.new_file(arquivo, esquema) as escritor:
+            for lote in lotes:
+                escritor.write_batch(lote)
+
+    else:
+        esquema_csv = pa.schema([
+            campo.with_type(campo.type.value_type) if pa.types.is_dictionary(campo.type) else campo
+            for campo in esquema
+        ])
+        with pacsv.CSVWriter(str(destino), esquema_csv) as escritor:
+            for lote in lotes:
+                escritor.write_batch(_decodificar_dicionarios(lote))
+
+
+class CacheExportacoes:
+    """Arquivos exportados em disco, indexados pela impressão digital dos dados e limitados em bytes"""
+
+    def __init__(self, diretorio: str, tamanho_maximo: int):
+        self.diretorio = Path(diretorio)
+        self.tamanho_maximo = tamanho_maximo
+        self._lock = threading.Lock()
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+    def obter(self, df: pd.DataFrame, impressao: str, formato: str) -> Path:
+        """Retorna o arquivo exportado dos dados, gravando-o apenas se ainda não existir"""
+        destino = self.diretorio / f"{impressao}{FORMATOS[formato].extensao}"
+
+        with self._lock:
+            if destino.exists():
+                destino.touch()
+                return destino
+
+            temporario = destino.with_name(f"{destino.name}.{threading.get_ident()}.tmp")
+            try:
+                exportar(df, formato, temporario)
+                os.replace(temporario, destino)
+            finally:
+                temporario.unlink(missing_ok=True)
+
+            self._descartar_excedente()
+
+        return destino
+
+    def _descartar_excedente(self):
+        """Remove os arquivos usados há mais tempo até caber no tamanho máximo"""
+        arquivos = sorted(
+            (arquivo.stat().st_mtime, arquivo.stat().st_size, arquivo)
+            for arquivo in self.diretorio.iterdir() if arquivo.suffix != ".tmp"
+        )
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+
+        for _, tamanho, arquivo in arquivos[:-1]:
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                arquivo.unlink()
+                total -= tamanho
+            except OSError as e:
+                logging.warning(f"Falha ao remover a exportação {arquivo}: {e}")
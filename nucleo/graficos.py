@@ -0,0 +1,170 @@
+# --------------------------------------------------------------------------
+# VISUALIZAÇÕES
+# --------------------------------------------------------------------------
+# Figuras Plotly do painel, usadas também pelos relatórios em lote.
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .config import CONFIG_PADRAO, ConfigNucleo
+from .processamento import ORDEM_CICLOS
+
+# Cores de cada ciclo nos gráficos e cartões
+CORES_CICLOS = {"1º Ciclo": "#0c87a1", "2º Ciclo": "#7e84fa", "3º Ciclo": "#20ac52"}
+
+
+class GeradorGraficos:
+    """Classe para gerar gráficos e visualizações"""
+
+    @staticmethod
+    def criar_grafico_habilidades(df_habilidades: pd.DataFrame, config: ConfigNucleo = CONFIG_PADRAO) -> go.Figure:
+        """
+        Cria gráfico de taxa de acertos por habilidade e ciclo
+
+        Recebe as linhas já selecionadas (ver ProcessadorDados.selecionar_habilidades),
+        na ordem de exibição. Acima de LIMITE_BARRAS_SVG barras, usa marcadores em
+        WebGL no lugar das barras em SVG.
+        """
+        if df_habilidades.empty:
+            return None
+
+        total_barras = len(df_habilidades)
+        parametros = dict(
+            x='DC_HABILIDADE',
+            y='TX_ACERTO',
+            title='Taxa de Acertos por Habilidades por Ciclo',
+            color='Ciclo',
+            color_discrete_map=CORES_CICLOS,
+            category_orders={
+                'Ciclo': ORDEM_CICLOS,
+                'DC_HABILIDADE': list(dict.fromkeys(df_habilidades['DC_HABILIDADE']))
+            },
+            labels={
+                'TX_ACERTO': 'Taxa de Acertos (%)', 
+                'Ciclo': 'Ciclo de Avaliação',
+                'DC_HABILIDADE': 'Habilidade'
+            },
+            hover_data=['CD_HABILIDADE'],
+            range_y=[0, 109]
+        )
+
+        if total_barras > config.LIMITE_BARRAS_SVG:
+            # O Plotly não tem barras em WebGL: marcadores agrupados por ciclo
+            fig = px.scatter(df_habilidades, render_mode='webgl', **parametros)
+            fig.update_traces(marker=dict(size=9))
+            fig.update_layout(scattermode='group')
+        else:
+            rotulos = df_habilidades['TX_ACERTO'].round(1) if total_barras <= config.LIMITE_BARRAS_ROTULO else None
+            fig = px.bar(df_habilidades, text=rotulos, **parametros)
+            fig.update_traces(textfont=dict(size=14), textposition='outside', cliponaxis=False)
+            # Rótulos que não cabem na largura da barra são ocultados
+            fig.update_layout(barmode='group', uniformtext=dict(minsize=10, mode='hide'))
+
+        # Personalizações
+        fig.update_traces(
+            hovertemplate="<b>Habilidade:</b> %{customdata[0]}<br>" +
+                         "<b>Taxa de Acerto:</b> %{y:.1f}%<br>" +
+                         "<b>Descrição:</b> %{x}<br>" +
+                         "<extra></extra>",
+            hoverlabel=dict(font_size=14)
+        )
+
+        fig.update_layout(
+            showlegend=True,
+            yaxis=dict(dtick=10, title_font=dict(size=14), tickfont=dict(size=12)),
+            xaxis=dict(showticklabels=False, title_font=dict(size=14)),
+            height=400
+        )
+
+        return fig
+
+    @staticmethod
+    def criar_gauge_participacao(valor: float, cor: str) -> go.Figure:
+        """Cria gráfico gauge para participação"""
+        fig = go.Figure(go.Indicator(
+            mode="gauge+number",
+            value=valor,
+            number={'suffix': '%'},
+            gauge={
+                'axis': {'range': [0, 100]},
+                'bar': {'color': cor},
+                'steps': [
+                    {'range': [0, 80], 'color': "#d7f5df"},
+                    {'range': [80, 90], 'color': "#f5eed7"},
+                    {'range': [90, 100], 'color': "#f5d7d7"}
+                ],
+                'threshold': {
+                    'line': {'color': "#454545", 'width': 4},
+                    'thickness': 0.85,
+                    'value': 100
+                }
+            }
+        ))
+
+        fig.update_layout(height=200, margin=dict(l=10, r=10, t=30, b=10))
+        return fig
+
+    @staticmethod
+    def criar_grafico_evolucao_niveis(df_niveis: pd.DataFrame) -> go.Figure:
+        """Cria gráfico de evolução dos níveis em barras horizontais
+
+        Recebe as médias dos níveis por ciclo (AgregadosPainel.por_ciclo), já na ordem dos ciclos.
+        """
+        if df_niveis.empty:
+            return None
+
+        df_agrupado = df_niveis.reset_index()
+
+        fig = go.Figure()
+
+        # Configurações das barras
+        barras_config = [
+            ('NU_N01', 'Defasagem', '#FF4444'),
+            ('NU_N02', 'Aprendizado Intermediário', '#FFA500'),
+            ('NU_N03', 'Aprendizado Adequado', '#32CD32')
+        ]
+
+        for coluna, nome, cor in barras_config:
+            if coluna in df_agrupado.columns:
+                valores = df_agrupado[coluna].fillna(0)
+
+                fig.add_trace(go.Bar(
+                    y=df_agrupado['Ciclo'].astype(str),  # eixo Y (categorias)
+                    x=valores,                           # valores no eixo X
+                    name=nome,
+                    orientation='h',                     # barras horizontais
+                    marker=dict(color=cor),
+                    text=[f"{v:.0f}" for v in valores], # labels com %
+                    textposition='inside',
+                    hovertemplate=f"<b>{nome}</b><br>" +
+                                "Ciclo: %{y}<br>" +
+                                "Quantidade de Estudantes: %{x:.1f}<br>" +
+                                "<extra></extra>"
+                ))
+
+                fig.update_layout(
+                    barmode='stack',  # barras lado a lado
+                    title=dict(
+                        text='Evolução dos Níveis de Aprendizagem',
+                        font=dict(size=18),
+                        x=0.5
+                    ),
+                    xaxis=dict(
+                        title='Quantidade de Estudantes',
+                        tickfont=dict(size=16)
+                    ),
+                    yaxis=dict(
+                        title='Ciclo',
+                        tickfont=dict(size=16)
+                    ),
+                    legend=dict(font=dict(size=18)),
+                    bargap=0.3
+                )
+                # aumentar tamanho dos rótulos
+                fig.update_traces(
+                    textfont=dict(size=20),
+                    textposition='inside'
+                )
+
+        return fig
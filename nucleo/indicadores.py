@@ -1,3 +1,7 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Tuple
+
 INDIC_GERAL = {
             "11988LP14","11988LP15","11988LP16","11988LP17","11988LP18", "11988MT14","11988MT15","11988MT16","11988MT17","11988MT18",
             "61988LP14","61988LP15","61988LP16","61988LP17","61988LP18", "61988MT14","61988MT15","61988MT16","61988MT17","61988MT18",
@@ -84,4 +88,81 @@ INDIC_HABILIDADES = {
     "72016MT173","72016MT174","72016MT175","72016MT176","72016MT177","72016MT178","72016MT179","72016MT181","72016MT1810","72016MT1811","72016MT1812","72016MT1813",
     "72016MT1814","72016MT1815","72016MT1816","72016MT1817","72016MT1818","72016MT1819","72016MT182","72016MT183","72016MT184","72016MT185","72016MT186","72016MT187","72016MT188","72016MT189",
     "02061LP141","02061LP1410","02061LP1411","02061LP142","02061LP143","02061LP144","02061LP145","02061LP146","02061LP147","02061LP148","02061LP149","02061LP151","02061LP1510","02061LP1511","02061LP152","02061LP153","02061LP154","02061LP155","02061LP156","02061LP157","02061LP158","02061LP159","02061LP161","02061LP1610","02061LP1611","02061LP1612","02061LP1613","02061LP1614","02061LP1615","02061LP1616","02061LP162","02061LP163","02061LP164","02061LP165","02061LP166","02061LP167","02061LP168","02061LP169","02061LP171","02061LP1710","02061LP1711","02061LP1712","02061LP172","02061LP173","02061LP174","02061LP175","02061LP176","02061LP177","02061LP178","02061LP179","02061LP181","02061LP1810","02061LP1811","02061LP1812","02061LP1813","02061LP1814","02061LP1815","02061LP1816","02061LP1817","02061LP1818","02061LP1819","02061LP182","02061LP1820","02061LP1821","02061LP183","02061LP184","02061LP185","02061LP186","02061LP187","02061LP188","02061LP189","02061MT141","02061MT142","02061MT143","02061MT144","02061MT145","02061MT146","02061MT147","02061MT148","02061MT149","02061MT151","02061MT1510","02061MT1511","02061MT1512","02061MT152","02061MT153","02061MT154","02061MT155","02061MT156","02061MT157","02061MT158","02061MT159","02061MT161","02061MT1610","02061MT1611","02061MT1612","02061MT1613","02061MT1614","02061MT1615","02061MT162","02061MT163","02061MT164","02061MT165","02061MT166","02061MT167","02061MT168","02061MT169","02061MT171","02061MT1710","02061MT1711","02061MT1712","02061MT1713","02061MT1714","02061MT1715","02061MT1716","02061MT172","02061MT173","02061MT174","02061MT175","02061MT176","02061MT177","02061MT178","02061MT179","02061MT181","02061MT1810","02061MT1811","02061MT1812","02061MT1813","02061MT1814","02061MT182","02061MT183","02061MT184","02061MT185","02061MT186","02061MT187","02061MT188","02061MT189","62061LP141","62061LP1410","62061LP1411","62061LP142","62061LP143","62061LP144","62061LP145","62061LP146","62061LP147","62061LP148","62061LP149","62061LP151","62061LP1510","62061LP1511","62061LP152","62061LP153","62061LP154","62061LP155","62061LP156","62061LP157","62061LP158","62061LP159","62061LP161","62061LP1610","62061LP1611","62061LP1612","62061LP1613","62061LP1614","62061LP1615","62061LP1616","62061LP162","62061LP163","62061LP164","62061LP165","62061LP166","62061LP167","62061LP168","62061LP169","62061LP171","62061LP1710","62061LP1711","62061LP1712","62061LP172","62061LP173","62061LP174","62061LP175","62061LP176","62061LP177","62061LP178","62061LP179","62061LP181","62061LP1810","62061LP1811","62061LP1812","62061LP1813","62061LP1814","62061LP1815","62061LP1816","62061LP1817","62061LP1818","62061LP1819","62061LP182","62061LP1820","62061LP1821","62061LP183","62061LP184","62061LP185","62061LP186","62061LP187","62061LP188","62061LP189","62061MT141","62061MT142","62061MT143","62061MT144","62061MT145","62061MT146","62061MT147","62061MT148","62061MT149","62061MT151","62061MT1510","62061MT1511","62061MT1512","62061MT152","62061MT153","62061MT154","62061MT155","62061MT156","62061MT157","62061MT158","62061MT159","62061MT161","62061MT1610","62061MT1611","62061MT1612","62061MT1613","62061MT1614","62061MT1615","62061MT162","62061MT163","62061MT164","62061MT165","62061MT166","62061MT167","62061MT168","62061MT169","62061MT171","62061MT1710","62061MT1711","62061MT1712","62061MT1713","62061MT1714","62061MT1715","62061MT1716","62061MT172","62061MT173","62061MT174","62061MT175","62061MT176","62061MT177","62061MT178","62061MT179","62061MT181","62061MT1810","62061MT1811","62061MT1812","62061MT1813","62061MT1814","62061MT182","62061MT183","62061MT184","62061MT185","62061MT186","62061MT187","62061MT188","62061MT189","72061LP141","72061LP1410","72061LP1411","72061LP142","72061LP143","72061LP144","72061LP145","72061LP146","72061LP147","72061LP148","72061LP149","72061LP151","72061LP1510","72061LP1511","72061LP152","72061LP153","72061LP154","72061LP155","72061LP156","72061LP157","72061LP158","72061LP159","72061LP161","72061LP1610","72061LP1611","72061LP1612","72061LP1613","72061LP1614","72061LP1615","72061LP1616","72061LP162","72061LP163","72061LP164","72061LP165","72061LP166","72061LP167","72061LP168","72061LP169","72061LP171","72061LP1710","72061LP1711","72061LP1712","72061LP172","72061LP173","72061LP174","72061LP175","72061LP176","72061LP177","72061LP178","72061LP179","72061LP181","72061LP1810","72061LP1811","72061LP1812","72061LP1813","72061LP1814","72061LP1815","72061LP1816","72061LP1817","72061LP1818","72061LP1819","72061LP182","72061LP1820","72061LP1821","72061LP183","72061LP184","72061LP185","72061LP186","72061LP187","72061LP188","72061LP189","72061MT141","72061MT142","72061MT143","72061MT144","72061MT145","72061MT146","72061MT147","72061MT148","72061MT149","72061MT151","72061MT1510","72061MT1511","72061MT1512","72061MT152","72061MT153","72061MT154","72061MT155","72061MT156","72061MT157","72061MT158","72061MT159","72061MT161","72061MT1610","72061MT1611","72061MT1612","72061MT1613","72061MT1614","72061MT1615","72061MT162","72061MT163","72061MT164","72061MT165","72061MT166","72061MT167","72061MT168","72061MT169","72061MT171","72061MT1710","72061MT1711","72061MT1712","72061MT1713","72061MT1714","72061MT1715","72061MT1716","72061MT172","72061MT173","72061MT174","72061MT175","72061MT176","72061MT177","72061MT178","72061MT179","72061MT181","72061MT1810","72061MT1811","72061MT1812","72061MT1813","72061MT1814","72061MT182","72061MT183","72061MT184","72061MT185","72061MT186","72061MT187","72061MT188","72061MT189"
-    }
\ No newline at end of file
+    }
+
+# --------------------------------------------------------------------------
+# CATÁLOGO ESTRUTURADO DOS INDICADORES
+# --------------------------------------------------------------------------
+# Os códigos codificam suas dimensões: prefixo + coleção (4 dígitos) +
+# componente (LP/MT) + "1" + série (4 a 8, correspondendo ao 1º ao 5º ano) +
+# habilidade (vazia nos indicadores gerais). Ex.: 62016MT1714 -> prefixo 6,
+# coleção 2016, Matemática, 4º ano, habilidade 14.
+
+_PADRAO_CODIGO = re.compile(r"^(?P<prefixo>\d*)(?P<colecao>\d{4})(?P<componente>LP|MT)1(?P<serie>[4-8])(?P<habilidade>\d*)$")
+
+# A série 4 corresponde ao 1º ano do Ensino Fundamental
+_DESLOCAMENTO_SERIE = 3
+
+
+@dataclass(frozen=True)
+class Indicador:
+    """Código de indicador decomposto em suas dimensões"""
+    prefixo: str
+    colecao: str
+    componente: str
+    etapa: int
+    habilidade: str = ""
+
+    @property
+    def codigo(self) -> str:
+        """Reconstrói o código original"""
+        serie = self.etapa + _DESLOCAMENTO_SERIE
+        return f"{self.prefixo}{self.colecao}{self.componente}1{serie}{self.habilidade}"
+
+    @classmethod
+    def de_codigo(cls, codigo: str) -> "Indicador":
+        """Decompõe um código de indicador"""
+        encontrado = _PADRAO_CODIGO.match(codigo)
+        if not encontrado:
+            raise ValueError(f"Código de indicador fora do padrão: {codigo}")
+        return cls(
+            prefixo=encontrado["prefixo"],
+            colecao=encontrado["colecao"],
+            componente=encontrado["componente"],
+            etapa=int(encontrado["serie"]) - _DESLOCAMENTO_SERIE,
+            habilidade=encontrado["habilidade"],
+        )
+
+
+class CatalogoIndicadores:
+    """Conjunto de indicadores indexado por (etapa, componente)"""
+
+    def __init__(self, codigos: Iterable[str]):
+        self.indicadores = tuple(Indicador.de_codigo(codigo) for codigo in sorted(codigos))
+        self._indice: Dict[Tuple[int, str], Tuple[str, ...]] = {}
+
+        for indicador in self.indicadores:
+            chave = (indicador.etapa, indicador.componente)
+            self._indice[chave] = self._indice.get(chave, ()) + (indicador.codigo,)
+
+    def codigos(self) -> FrozenSet[str]:
+        """Todos os códigos do catálogo"""
+        return frozenset(indicador.codigo for indicador in self.indicadores)
+
+    def filtrar(self, etapa: int, componente: str) -> Tuple[str, ...]:
+        """Códigos de uma etapa (1 a 5) e componente (sigla LP ou MT)"""
+        return self._indice.get((etapa, componente), ())
+
+    def validar(self, originais: Iterable[str]):
+        """Garante que os códigos decompostos reconstroem exatamente o conjunto original"""
+        originais = frozenset(originais)
+        if self.codigos() != originais:
+            divergentes = sorted(self.codigos() ^ originais)
+            raise ValueError(f"Catálogo de indicadores divergente do conjunto original: {divergentes[:10]}")
+
+
+CATALOGO_GERAL = CatalogoIndicadores(INDIC_GERAL)
+CATALOGO_GERAL.validar(INDIC_GERAL)
+
+CATALOGO_HABILIDADES = CatalogoIndicadores(INDIC_HABILIDADES)
+CATALOGO_HABILIDADES.validar(INDIC_HABILIDADES)
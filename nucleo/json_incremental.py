@@ -0,0 +1,148 @@
+# --------------------------------------------------------------------------
+# DECODIFICAÇÃO INCREMENTAL DE RESPOSTAS JSON
+# --------------------------------------------------------------------------
+# Lê o corpo da resposta em pedaços e monta a lista "result" diretamente em
+# colunas ({campo: [valores]}), sem materializar a lista de dicionários
+# inteira. pd.DataFrame aceita tanto o formato colunar quanto a lista de
+# registros, então o restante do processamento não muda.
+
+import codecs
+import json
+from typing import Dict, Iterable, Iterator, List
+
+_ESPACOS = " \t\n\r"
+
+# Quanto do buffer já consumido pode ficar retido antes de ser descartado
+_LIMITE_DESCARTE = 1 << 16
+
+
+class _LeitorIncremental:
+    """Buffer de texto alimentado sob demanda pelos pedaços da resposta"""
+
+    def __init__(self, pedacos: Iterable[bytes]):
+        self._pedacos: Iterator[bytes] = iter(pedacos)
+        self._decodificador = codecs.getincrementaldecoder("utf-8")()
+        self._decoder_json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.fim = False
+
+    def _ler_mais(self) -> bool:
+        """Acrescenta o próximo pedaço ao buffer; retorna False no fim da resposta"""
+        if self.fim:
+            return False
+
+        if self.pos > _LIMITE_DESCARTE:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        for pedaco in self._pedacos:
+            texto = self._decodificador.decode(pedaco)
+            if texto:
+                self.buffer += texto
+                return True
+
+        self.buffer += self._decodificador.decode(b"", final=True)
+        self.fim = True
+        return True
+
+    def proximo_caractere(self) -> str:
+        """Pula espaços e retorna o próximo caractere significativo, sem consumi-lo"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _ESPACOS:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._ler_mais():
+                raise ValueError("Resposta JSON incompleta")
+
+    def consumir(self, esperado: str):
+        """Consome o caractere esperado"""
+        caractere = self.proximo_caractere()
+        if caractere != esperado:
+            raise ValueError(f"JSON inválido: esperado '{esperado}', encontrado '{caractere}' na posição {self.pos}")
+        self.pos += 1
+
+    def valor(self):
+        """Decodifica o próximo valor JSON completo"""
+        self.proximo_caractere()
+        while True:
+            try:
+                valor, fim = self._decoder_json.raw_decode(self.buffer, self.pos)
+                # Um número no fim do buffer pode continuar no próximo pedaço
+                if fim < len(self.buffer) or self.fim:
+                    self.pos = fim
+                    return valor
+            except json.JSONDecodeError:
+                if self.fim:
+                    raise
+            self._ler_mais()
+
+
+def _ler_registros_em_colunas(leitor: _LeitorIncremental) -> Dict[str, List]:
+    """Lê um array de objetos, acumulando os valores por campo"""
+    colunas: Dict[str, List] = {}
+    total = 0
+
+    leitor.consumir("[")
+    if leitor.proximo_caractere() == "]":
+        leitor.pos += 1
+        return colunas
+
+    while True:
+        registro = leitor.valor()
+        if not isinstance(registro, dict):
+            raise ValueError(f"JSON inválido: registro que não é objeto na posição {leitor.pos}")
+        for campo, valor in registro.items():
+            coluna = colunas.get(campo)
+            if coluna is None:
+                # Campo novo: preencher as linhas anteriores
+                coluna = colunas[campo] = [None] * total
+            coluna.append(valor)
+        total += 1
+
+        # Campos ausentes neste registro
+        if len(registro) != len(colunas):
+            for coluna in colunas.values():
+                if len(coluna) < total:
+                    coluna.append(None)
+
+        if leitor.proximo_caractere() == ",":
+            leitor.pos += 1
+        else:
+            leitor.consumir("]")
+            return colunas
+
+
+def decodificar_em_colunas(pedacos: Iterable[bytes], campo_registros: str = "result") -> Dict:
+    """
+    Decodifica um objeto JSON lido em pedaços, convertendo a lista de registros em colunas
+
+    Args:
+        pedacos: Bytes da resposta (ex.: response.iter_content())
+        campo_registros: Campo do objeto que contém a lista de registros
+
+    Returns:
+        O objeto decodificado, com campo_registros no formato {campo: [valores]}
+    """
+    leitor = _LeitorIncremental(pedacos)
+    resultado = {}
+
+    leitor.consumir("{")
+    if leitor.proximo_caractere() == "}":
+        return resultado
+
+    while True:
+        chave = leitor.valor()
+        leitor.consumir(":")
+
+        if chave == campo_registros and leitor.proximo_caractere() == "[":
+            resultado[chave] = _ler_registros_em_colunas(leitor)
+        else:
+            resultado[chave] = leitor.valor()
+
+        if leitor.proximo_caractere() == ",":
+            leitor.pos += 1
+        else:
+            leitor.consumir("}")
+            return resultado
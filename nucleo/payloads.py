@@ -0,0 +1,87 @@
+# --------------------------------------------------------------------------
+# PAYLOADS DA API
+# --------------------------------------------------------------------------
+
+import logging
+from dataclasses import dataclass, field
+from typing import Collection, Dict, List
+
+from . import indicadores
+from .config import CONFIG_PADRAO, ConfigNucleo
+
+
+@dataclass
+class PayloadBase:
+    """Classe base para payloads da API"""
+    entidade: str
+    componente: str
+    etapa: int
+    ciclo: str
+    installation_id: str
+    session_token: str
+    nivel_abaixo: str = CONFIG_PADRAO.NIVEL_ENTIDADE
+    # Códigos dos municípios cadastrados (consultados sempre na rede municipal)
+    municipios: Collection[str] = frozenset()
+    config: ConfigNucleo = field(default=CONFIG_PADRAO, repr=False)
+
+    def _criar_filtros_base(self) -> List[Dict]:
+        """Cria filtros básicos comuns"""
+        return [
+            {"operation": "equalTo", "field": "DADOS.VL_FILTRO_DISCIPLINA", "value": dict(self.config.COMPONENTES)[self.componente]},
+            {"operation": "equalTo", "field": "DADOS.VL_FILTRO_ETAPA", "value": f"ENSINO FUNDAMENTAL DE 9 ANOS - {self.etapa}º ANO"},
+            {"operation": "equalTo", "field": "DADOS.VL_FILTRO_AVALIACAO", "value": f"AV{self.ciclo}2025"},
+        ]
+
+    def _filtrar_indicadores(self, catalogo: indicadores.CatalogoIndicadores) -> List[str]:
+        """Seleciona apenas os indicadores da etapa e do componente consultados"""
+        return list(catalogo.filtrar(self.etapa, dict(self.config.SIGLAS_COMPONENTES)[self.componente]))
+
+    def _determinar_dependencia(self) -> str:
+        """Rede da entidade: estadual apenas para as escolas indígenas, municipal nos demais casos"""
+        if self.entidade not in self.municipios and self.entidade in self.config.ESCOLAS_INDIGENAS:
+            return "ESTADUAL"
+        return "MUNICIPAL"
+
+    def _criar_payload_base(self, indicadores_list: List, filtros_extras: List = None) -> Dict:
+        """Cria estrutura base do payload"""
+        filtros_extras = filtros_extras or []
+
+        dependencia = self._determinar_dependencia()
+        logging.debug(f"Entidade {self.entidade}: rede {dependencia}")
+        return {
+            "CD_INDICADOR": indicadores_list,
+            "agregado": self.entidade,
+            "filtros": self._criar_filtros_base() + filtros_extras,
+            "filtrosAdicionais": [{"field": "DADOS.VL_FILTRO_REDE", "value": dependencia, "operation": "equalTo"}],
+            "ordenacao": [["NM_ENTIDADE", "ASC"]],
+            "nivelAbaixo": self.nivel_abaixo,
+            "collectionResultado": None,
+            "CD_INDICADOR_LABEL": [],
+            "TP_ENTIDADE_LABEL": "01",
+            "_ApplicationId": "portal",
+            "_ClientVersion": "js2.19.0",
+            "_InstallationId": self.installation_id,
+            "_SessionToken": self.session_token
+        }
+
+
+class PayloadGeral(PayloadBase):
+    """Payload para dados gerais"""
+
+    def criar_payload(self) -> Dict:
+        return self._criar_payload_base(self._filtrar_indicadores(indicadores.CATALOGO_GERAL))
+
+
+class PayloadHabilidades(PayloadBase):
+    """Payload para dados de habilidades"""
+
+    def criar_payload(self) -> Dict:
+        filtros_extras = [
+            {"operation": "containedIn", "field": "DADOS.DC_FAIXA_PERCENTUAL_HABILIDADE",
+             "value": ["Alto", "Médio Baixo", "Médio Alto", "Baixo"]}
+        ]
+
+        payload = self._criar_payload_base(self._filtrar_indicadores(indicadores.CATALOGO_HABILIDADES), filtros_extras)
+        payload["ordenacao"] = [["DADOS.CD_HABILIDADE", "ASC"]]
+
+        return payload
@@ -0,0 +1,249 @@
+# --------------------------------------------------------------------------
+# PROCESSAMENTO DE DADOS
+# --------------------------------------------------------------------------
+# Conversão das respostas da API em DataFrames tipados e cálculo dos
+# agregados e rankings usados pelo painel.
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import CONFIG_PADRAO
+from .telemetria import medir
+
+# Ciclos na ordem de exibição
+ORDEM_CICLOS = [ciclo_label for _, ciclo_label in sorted(dict(CONFIG_PADRAO.CICLOS).items())]
+
+# Esquemas declarados dos datasets: colunas mantidas e seus tipos.
+# Colunas não listadas são descartadas; None mantém o tipo original (textos únicos por linha).
+ESQUEMA_GERAL = {
+    'NM_ENTIDADE': 'category',
+    'VL_FILTRO_ETAPA': 'category',
+    'VL_FILTRO_DISCIPLINA': 'category',
+    'VL_FILTRO_AVALIACAO': 'category',
+    'VL_FILTRO_REDE': 'category',
+    'TX_ACERTOS': 'float32',
+    'TX_PARTICIPACAO': 'float32',
+    'QT_PREVISTO': 'Int32',
+    'QT_EFETIVO': 'Int32',
+    'NU_N01': 'Int32',
+    'NU_N02': 'Int32',
+    'NU_N03': 'Int32',
+}
+
+ESQUEMA_HABILIDADES = {
+    'NM_ENTIDADE': 'category',
+    'VL_FILTRO_ETAPA': 'category',
+    'VL_FILTRO_DISCIPLINA': 'category',
+    'VL_FILTRO_AVALIACAO': 'category',
+    'VL_FILTRO_REDE': 'category',
+    'DC_FAIXA_PERCENTUAL_HABILIDADE': 'category',
+    'CD_HABILIDADE': None,
+    'DC_HABILIDADE': None,
+    'TX_ACERTO': 'float32',
+}
+
+
+@dataclass
+class AgregadosPainel:
+    """Agregados calculados uma única vez e lidos por todas as seções do painel"""
+    # Informações da entidade (primeira linha dos dados gerais)
+    info_entidade: Optional[pd.Series]
+    # Por ciclo: médias de acertos, participação e níveis; totais de previstos e efetivos
+    por_ciclo: pd.DataFrame
+    # Por ciclo: habilidades com maiores e menores taxas de acerto
+    maiores_habilidades: Dict[str, pd.DataFrame]
+    menores_habilidades: Dict[str, pd.DataFrame]
+
+
+class ProcessadorDados:
+    """Classe para processar dados da API"""
+
+    @staticmethod
+    def processar_dados_gerais(resposta: Dict, ciclo_label: str) -> Optional[pd.DataFrame]:
+        """Processa dados gerais da API"""
+        if not resposta or "result" not in resposta or not resposta["result"]:
+            return None
+
+        with medir("dataframe", dataset="geral", ciclo=ciclo_label) as span:
+            df = pd.DataFrame(resposta["result"])
+            if df.empty:
+                return None
+
+            span.atributos["linhas"] = len(df)
+            return ProcessadorDados._aplicar_esquema(df, ESQUEMA_GERAL, ciclo_label)
+
+    @staticmethod
+    def processar_dados_habilidades(resposta: Dict, ciclo_label: str) -> Optional[pd.DataFrame]:
+        """Processa dados de habilidades da API"""
+        if not resposta or "result" not in resposta or not resposta["result"]:
+            return None
+
+        with medir("dataframe", dataset="habilidades", ciclo=ciclo_label) as span:
+            df = pd.DataFrame(resposta["result"])
+            if df.empty:
+                return None
+
+            span.atributos["linhas"] = len(df)
+            return ProcessadorDados._aplicar_esquema(df, ESQUEMA_HABILIDADES, ciclo_label)
+
+    @staticmethod
+    def _aplicar_esquema(df: pd.DataFrame, esquema: Dict[str, Optional[str]], ciclo_label: str) -> pd.DataFrame:
+        """Converte o DataFrame bruto para o esquema em uma única passada, descartando colunas não usadas"""
+        colunas = {}
+
+        for col, tipo in esquema.items():
+            if col not in df.columns:
+                continue
+
+            serie = df[col]
+            if tipo in ('float32', 'Int32'):
+                serie = pd.to_numeric(serie, errors='coerce')
+                # Contagens fracionárias não devem ser arredondadas
+                if tipo == 'Int32' and not (serie.dropna() % 1 == 0).all():
+                    tipo = 'float32'
+
+            colunas[col] = serie.astype(tipo) if tipo else serie
+
+        # Limpar nome da etapa (apenas nas categorias, não em cada linha)
+        if 'VL_FILTRO_ETAPA' in colunas:
+            colunas['VL_FILTRO_ETAPA'] = colunas['VL_FILTRO_ETAPA'].cat.rename_categories(
+                lambda etapa: etapa.replace('ENSINO FUNDAMENTAL DE 9 ANOS - ', '')
+            )
+
+        # Ciclo como categoria ordenada, para ordenar e agrupar sem novas conversões
+        colunas['Ciclo'] = pd.Categorical([ciclo_label] * len(df), categories=ORDEM_CICLOS, ordered=True)
+
+        return pd.DataFrame(colunas)
+
+    @staticmethod
+    def consolidar(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatena os DataFrames dos ciclos preservando as colunas categóricas"""
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+
+        # pd.concat só mantém o tipo category quando as categorias são idênticas
+        for col in frames[0].columns:
+            if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+
+        return df
+
+    @staticmethod
+    def impressao_digital(*frames: pd.DataFrame) -> str:
+        """Resumo barato (vetorizado) do conteúdo dos DataFrames, para chaves de cache"""
+        resumo = hashlib.sha1()
+        for df in frames:
+            resumo.update(repr((df.shape, list(df.columns))).encode())
+            if not df.empty:
+                resumo.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return resumo.hexdigest()
+
+    @staticmethod
+    def calcular_agregados(df_geral: pd.DataFrame, df_habilidades: pd.DataFrame, k: int = 5) -> AgregadosPainel:
+        """Calcula, em uma passada por dataset, todos os agregados por ciclo usados pelo painel"""
+        agregacoes = {
+            'TX_ACERTOS': 'mean',
+            'TX_PARTICIPACAO': 'mean',
+            'QT_PREVISTO': 'sum',
+            'QT_EFETIVO': 'sum',
+            'NU_N01': 'mean',
+            'NU_N02': 'mean',
+            'NU_N03': 'mean',
+        }
+
+        if df_geral.empty:
+            info_entidade = None
+            por_ciclo = pd.DataFrame(columns=list(agregacoes))
+        else:
+            info_entidade = df_geral.iloc[0]
+            agregacoes = {col: funcao for col, funcao in agregacoes.items() if col in df_geral.columns}
+            por_ciclo = df_geral.groupby('Ciclo', observed=True).agg(agregacoes)
+
+        maiores, menores = {}, {}
+        if not df_habilidades.empty:
+            colunas = ['CD_HABILIDADE', 'DC_HABILIDADE', 'TX_ACERTO']
+            validas = df_habilidades.dropna(subset=['TX_ACERTO'])
+
+            # Uma ordenação estável por sentido equivale a nlargest/nsmallest em cada ciclo
+            for destino, crescente in ((maiores, False), (menores, True)):
+                ordenado = validas.sort_values('TX_ACERTO', ascending=crescente, kind='stable')
+                for ciclo, grupo in ordenado.groupby('Ciclo', observed=True):
+                    destino[ciclo] = grupo.head(k)[colunas]
+
+        return AgregadosPainel(info_entidade, por_ciclo, maiores, menores)
+
+    @staticmethod
+    def calcular_ranking_regional(df_regional: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula a participação nos níveis e os rankings de cada entidade por ciclo
+
+        Posição 1 é o melhor resultado: maiores acertos, participação e níveis
+        intermediário/adequado, e menor proporção em defasagem.
+        """
+        if df_regional.empty:
+            return pd.DataFrame()
+
+        colunas_niveis = [col for col in ['NU_N01', 'NU_N02', 'NU_N03'] if col in df_regional.columns]
+        agregacoes = {col: 'mean' for col in ['TX_ACERTOS', 'TX_PARTICIPACAO'] if col in df_regional.columns}
+        agregacoes.update({col: 'sum' for col in ['QT_PREVISTO', 'QT_EFETIVO'] + colunas_niveis if col in df_regional.columns})
+
+        ranking = df_regional.groupby(['Ciclo', 'NM_ENTIDADE'], as_index=False, observed=True).agg(agregacoes)
+
+        # Proporção de estudantes em cada nível
+        total_niveis = ranking[colunas_niveis].sum(axis=1).replace(0, float('nan'))
+        colunas_percentuais = {}
+        for col in colunas_niveis:
+            colunas_percentuais[f'PC_{col}'] = ranking[col].div(total_niveis).mul(100)
+        ranking = ranking.assign(**colunas_percentuais)
+
+        criterios = {'TX_ACERTOS': False, 'TX_PARTICIPACAO': False, 'PC_NU_N01': True, 'PC_NU_N02': False, 'PC_NU_N03': False}
+        por_ciclo = ranking.groupby('Ciclo', observed=True)
+        posicoes = {
+            f'POS_{col}': por_ciclo[col].rank(ascending=crescente, method='min').astype('Int64')
+            for col, crescente in criterios.items() if col in ranking.columns
+        }
+
+        return ranking.assign(**posicoes).sort_values(['Ciclo', 'POS_TX_ACERTOS' if 'POS_TX_ACERTOS' in posicoes else 'NM_ENTIDADE'])
+
+    @staticmethod
+    def selecionar_habilidades(df_habilidades: pd.DataFrame, ciclos: List[str], modo: str,
+                               quantidade: int, pagina: int = 1) -> Tuple[pd.DataFrame, int]:
+        """
+        Seleciona as habilidades exibidas no gráfico
+
+        Args:
+            df_habilidades: Dados de habilidades consolidados
+            ciclos: Ciclos considerados
+            modo: "maiores" ou "menores" (pela média de acerto nos ciclos), ou "todas" (paginado por código)
+            quantidade: Habilidades selecionadas (ou por página)
+            pagina: Página exibida no modo "todas", a partir de 1
+
+        Returns:
+            Linhas das habilidades selecionadas, na ordem de exibição, e o total de páginas
+        """
+        df = df_habilidades[df_habilidades['Ciclo'].isin(ciclos)]
+        if df.empty:
+            return df, 0
+
+        quantidade = max(1, quantidade)
+        medias = df.groupby('CD_HABILIDADE', observed=True)['TX_ACERTO'].mean()
+
+        if modo == "todas":
+            total_paginas = -(-len(medias) // quantidade)
+            pagina = min(max(pagina, 1), total_paginas)
+            codigos = medias.index[(pagina - 1) * quantidade:pagina * quantidade]
+        else:
+            total_paginas = 1
+            codigos = (medias.nlargest(quantidade) if modo == "maiores" else medias.nsmallest(quantidade)).index
+
+        posicao = pd.Series(range(len(codigos)), index=codigos)
+        selecionadas = df[df['CD_HABILIDADE'].isin(codigos)]
+        ordem = selecionadas['CD_HABILIDADE'].map(posicao)
+        selecionadas = selecionadas.iloc[ordem.argsort(kind='stable')]
+
+        return selecionadas, total_paginas
@@ -0,0 +1,48 @@
+# --------------------------------------------------------------------------
+# SEGREDOS DO PAINEL FORA DO STREAMLIT
+# --------------------------------------------------------------------------
+# Lê o mesmo .streamlit/secrets.toml do painel com tomllib, para que scripts
+# em lote (e os processos de trabalho que eles criam) não importem o
+# Streamlit. Como no Streamlit, o arquivo da pasta do usuário é lido primeiro
+# e o do projeto tem precedência.
+
+import tomllib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ARQUIVO_SEGREDOS = Path(".streamlit") / "secrets.toml"
+
+
+def _mesclar(base: Dict, novos: Dict) -> Dict:
+    """Mescla tabelas TOML, com precedência dos novos valores"""
+    for chave, valor in novos.items():
+        if isinstance(valor, dict) and isinstance(base.get(chave), dict):
+            _mesclar(base[chave], valor)
+        else:
+            base[chave] = valor
+    return base
+
+
+def carregar_segredos(caminhos: Optional[List[Path]] = None) -> Dict:
+    """
+    Lê e mescla os arquivos de segredos existentes
+
+    Args:
+        caminhos: Arquivos em ordem crescente de precedência (padrão: pasta do
+            usuário e diretório atual)
+
+    Raises:
+        FileNotFoundError: Nenhum dos arquivos existe
+    """
+    if caminhos is None:
+        caminhos = [Path.home() / ARQUIVO_SEGREDOS, Path.cwd() / ARQUIVO_SEGREDOS]
+
+    existentes = [caminho for caminho in caminhos if caminho.is_file()]
+    if not existentes:
+        raise FileNotFoundError(f"Nenhum arquivo de segredos encontrado: {', '.join(map(str, caminhos))}")
+
+    segredos: Dict = {}
+    for caminho in existentes:
+        with open(caminho, "rb") as arquivo:
+            _mesclar(segredos, tomllib.load(arquivo))
+    return segredos
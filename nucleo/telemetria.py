@@ -0,0 +1,190 @@
+# --------------------------------------------------------------------------
+# TELEMETRIA: TEMPOS POR ETAPA
+# --------------------------------------------------------------------------
+# Intervalos (spans) medidos em cada etapa do pipeline: montagem do payload,
+# espera HTTP, decodificação, DataFrames, agregação, figuras e renderização.
+# Cada intervalo é:
+#   - anexado ao rastreamento corrente (uma reexecução do painel, por exemplo),
+#     propagado por contextvars; threads recebem uma cópia do contexto;
+#   - acumulado nos histogramas do processo, exportados no formato texto do
+#     Prometheus;
+#   - registrado como uma linha JSON no logger "nucleo.telemetria".
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+_log = logging.getLogger(__name__)
+
+# Limites dos baldes dos histogramas (s)
+LIMITES_HISTOGRAMA = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class Span:
+    """Duração de uma etapa, com atributos como cache (acerto/falha), dataset e bytes"""
+    etapa: str
+    atributos: Dict[str, object] = field(default_factory=dict)
+    # Início em relação ao rastreamento (ms) e duração (ms)
+    inicio_ms: float = 0.0
+    duracao_ms: float = 0.0
+
+
+class Rastreamento:
+    """Intervalos medidos durante uma execução, em ordem de término"""
+
+    def __init__(self):
+        self.identificador = uuid.uuid4().hex[:12]
+        self.inicio = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def registrar(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def resumo(self) -> List[Dict[str, object]]:
+        """Um dicionário por intervalo, ordenado pelo início"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.inicio_ms)
+        return [
+            {"etapa": span.etapa, "inicio_ms": round(span.inicio_ms, 1), "duracao_ms": round(span.duracao_ms, 1),
+             **span.atributos}
+            for span in spans
+        ]
+
+
+class MetricasEtapas:
+    """Histogramas de duração por etapa e resultado do cache, bytes recebidos e medidores"""
+
+    def __init__(self, limites: Tuple[float, ...] = LIMITES_HISTOGRAMA):
+        self.limites = limites
+        self._histogramas: Dict[Tuple[str, str], List[float]] = {}
+        self._bytes: Dict[str, int] = {}
+        self._medidores: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def registrar_medidor(self, nome: str, ajuda: str, funcao: Callable[[], float]):
+        """Medidor (gauge) lido no momento da exportação, como a ocupação de uma fila"""
+        with self._lock:
+            self._medidores[nome] = (ajuda, funcao)
+
+    def observar(self, etapa: str, cache: str, segundos: float, bytes_recebidos: int = 0):
+        with self._lock:
+            # Contagem por balde (não cumulativa), seguida de contagem total e soma
+            valores = self._histogramas.setdefault((etapa, cache), [0] * (len(self.limites) + 2))
+            for i, limite in enumerate(self.limites):
+                if segundos <= limite:
+                    valores[i] += 1
+                    break
+            valores[-2] += 1
+            valores[-1] += segundos
+            if bytes_recebidos:
+                self._bytes[etapa] = self._bytes.get(etapa, 0) + bytes_recebidos
+
+    def exportar(self) -> str:
+        """Métricas no formato texto de exposição do Prometheus"""
+        linhas = [
+            "# HELP painel_etapa_duracao_segundos Duração das etapas do pipeline do painel",
+            "# TYPE painel_etapa_duracao_segundos histogram",
+        ]
+        with self._lock:
+            histogramas = {chave: list(valores) for chave, valores in sorted(self._histogramas.items())}
+            bytes_por_etapa = dict(sorted(self._bytes.items()))
+            medidores = dict(sorted(self._medidores.items()))
+
+        for (etapa, cache), valores in histogramas.items():
+            rotulos = f'etapa="{etapa}",cache="{cache}"'
+            acumulado = 0
+            for limite, quantidade in zip(self.limites, valores):
+                acumulado += quantidade
+                linhas.append(f'painel_etapa_duracao_segundos_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+            linhas.append(f'painel_etapa_duracao_segundos_bucket{{{rotulos},le="+Inf"}} {valores[-2]}')
+            linhas.append(f"painel_etapa_duracao_segundos_count{{{rotulos}}} {valores[-2]}")
+            linhas.append(f"painel_etapa_duracao_segundos_sum{{{rotulos}}} {valores[-1]:.6f}")
+
+        linhas += [
+            "# HELP painel_bytes_recebidos_total Bytes recebidos da API (após descompressão)",
+            "# TYPE painel_bytes_recebidos_total counter",
+        ]
+        linhas += [f'painel_bytes_recebidos_total{{etapa="{etapa}"}} {total}' for etapa, total in bytes_por_etapa.items()]
+
+        for nome, (ajuda, funcao) in medidores.items():
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} gauge", f"{nome} {funcao()}"]
+
+        return "\n".join(linhas) + "\n"
+
+    def gravar(self, caminho: str):
+        """Grava as métricas no arquivo (substituição atômica, para o coletor textfile do node_exporter)"""
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                arquivo.write(self.exportar())
+            os.replace(temporario, caminho)
+        except OSError as e:
+            logging.warning(f"Falha ao gravar as métricas em {caminho}: {e}")
+
+
+# Histogramas do processo
+METRICAS = MetricasEtapas()
+
+_rastreamento_atual: ContextVar[Optional[Rastreamento]] = ContextVar("rastreamento_atual", default=None)
+
+
+@contextmanager
+def rastrear() -> Iterator[Rastreamento]:
+    """Coleta os intervalos medidos no contexto atual (e nas threads que recebem uma cópia dele)"""
+    rastreamento = Rastreamento()
+    token = _rastreamento_atual.set(rastreamento)
+    try:
+        yield rastreamento
+    finally:
+        _rastreamento_atual.reset(token)
+
+
+@contextmanager
+def medir(etapa: str, **atributos) -> Iterator[Span]:
+    """
+    Mede a duração do bloco como um intervalo da etapa
+
+    Atributos podem ser acrescentados durante o bloco (span.atributos["cache"] = "acerto").
+    Exceções são registradas no atributo "erro" e propagadas.
+    """
+    span = Span(etapa, dict(atributos))
+    inicio = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.atributos["erro"] = type(e).__name__
+        raise
+    finally:
+        span.duracao_ms = (time.perf_counter() - inicio) * 1000
+        _finalizar(span, inicio)
+
+
+def _finalizar(span: Span, inicio: float):
+    rastreamento = _rastreamento_atual.get()
+    if rastreamento is not None:
+        span.inicio_ms = (inicio - rastreamento.inicio) * 1000
+        rastreamento.registrar(span)
+
+    bytes_recebidos = span.atributos.get("bytes", 0)
+    METRICAS.observar(span.etapa, str(span.atributos.get("cache", "")), span.duracao_ms / 1000,
+                      bytes_recebidos if isinstance(bytes_recebidos, int) else 0)
+
+    if _log.isEnabledFor(logging.INFO):
+        _log.info(json.dumps({
+            "ts": round(time.time(), 3),
+            "rastreamento": rastreamento.identificador if rastreamento is not None else None,
+            "etapa": span.etapa,
+            "duracao_ms": round(span.duracao_ms, 2),
+            **span.atributos,
+        }, ensure_ascii=False, default=str))
@@ -0,0 +1,392 @@
+# --------------------------------------------------------------------------
+# RELATÓRIOS EM LOTE
+# --------------------------------------------------------------------------
+# Gera um relatório HTML estático por município e por escola indígena, com
+# os mesmos dados e gráficos do painel, para envio ao fim de cada ciclo:
+#
+#   python relatorios.py --saida relatorios/ --processos 4 --concorrencia-api 4
+#
+# As requisições à API são feitas por threads (limitadas por
+# --concorrencia-api) e passam pelo cache persistente de respostas; a
+# montagem dos relatórios é distribuída por um pool de processos. Um
+# manifesto guarda o resumo (hash) dos dados de cada entidade, e entidades
+# cujos dados não mudaram desde a última execução não são regeradas.
+#
+# As credenciais são lidas do mesmo .streamlit/secrets.toml usado pelo painel.
+
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tomllib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from nucleo.api import PRIORIDADE_SEGUNDO_PLANO, APIClient
+from nucleo.cache_respostas import chave_consulta
+from nucleo.config import CONFIG_PADRAO as config
+from nucleo.payloads import PayloadGeral, PayloadHabilidades
+from nucleo.segredos import carregar_segredos
+
+# Alterar quando o modelo do relatório mudar, para forçar a regeração de todos
+VERSAO_MODELO = "1"
+
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# (etapa, componente, ciclo, dataset)
+ChaveResposta = Tuple[int, str, str, str]
+
+
+@dataclass
+class ResultadoRelatorio:
+    """Resultado da geração do relatório de uma entidade"""
+    entidade: str
+    status: str
+    arquivo: Optional[str] = None
+    duracao: float = 0.0
+    erro: Optional[str] = None
+
+
+def listar_entidades(segredos: Dict) -> List[str]:
+    """Municípios cadastrados e escolas indígenas"""
+    return sorted(set(segredos["users"]) | set(config.ESCOLAS_INDIGENAS))
+
+
+def listar_requisicoes(entidade: str, municipios: List[str], installation_id: str,
+                       session_token: str) -> List[Tuple[ChaveResposta, Dict]]:
+    """Monta (chave, payload) de cada etapa x componente x ciclo x dataset da entidade"""
+    requisicoes = []
+
+    for etapa in sorted(config.ETAPAS):
+        for componente in sorted(dict(config.COMPONENTES)):
+            for ciclo in sorted(dict(config.CICLOS)):
+                for dataset, classe in (("geral", PayloadGeral), ("habilidades", PayloadHabilidades)):
+                    payload = classe(entidade, componente, etapa, ciclo, installation_id, session_token,
+                                     municipios=municipios, config=config).criar_payload()
+                    requisicoes.append(((etapa, componente, ciclo, dataset), payload))
+
+    return requisicoes
+
+
+def resumir_respostas(respostas: Dict[ChaveResposta, Dict], dados_de: Optional[float] = None) -> str:
+    """Hash do conteúdo das respostas de uma entidade (da versão do modelo e do aviso de dados antigos)"""
+    resumo = hashlib.sha256(VERSAO_MODELO.encode())
+    if dados_de is not None:
+        resumo.update(f"dados_de={dados_de}".encode())
+    for chave in sorted(respostas):
+        resumo.update(json.dumps([chave, respostas[chave]], sort_keys=True, ensure_ascii=False).encode())
+    return resumo.hexdigest()
+
+
+# --------------------------------------------------------------------------
+# Montagem do HTML (executada nos processos do pool)
+# --------------------------------------------------------------------------
+
+_ESTILO = """
+body { font-family: 'Inter', Arial, sans-serif; color: #1f2937; margin: 0; background: #f8fafc; }
+header { background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%); color: white; padding: 2rem; }
+header h1 { margin: 0 0 0.5rem 0; }
+header p { margin: 0; opacity: 0.9; }
+main { padding: 1rem 2rem; }
+section { background: white; border-radius: 10px; padding: 1.5rem; margin: 1.5rem 0; box-shadow: 0 2px 8px rgba(0,0,0,0.06); }
+h2 { color: #1e40af; border-bottom: 2px solid #e5e7eb; padding-bottom: 0.5rem; }
+h3 { color: #374151; }
+table { border-collapse: collapse; margin: 0.5rem 0 1rem 0; font-size: 0.95rem; }
+th, td { border: 1px solid #e5e7eb; padding: 0.4rem 0.8rem; text-align: right; }
+th { background: #f1f5f9; }
+td:first-child, th:first-child { text-align: left; }
+.colunas { display: flex; gap: 2rem; flex-wrap: wrap; }
+footer { text-align: center; color: #6b7280; padding: 2rem; font-size: 0.9rem; }
+"""
+
+_COLUNAS_CICLO = {
+    'TX_ACERTOS': 'Acertos (%)',
+    'TX_PARTICIPACAO': 'Participação (%)',
+    'QT_PREVISTO': 'Previstos',
+    'QT_EFETIVO': 'Efetivos',
+    'NU_N01': 'Defasagem',
+    'NU_N02': 'Intermediário',
+    'NU_N03': 'Adequado',
+}
+
+
+def _tabela(df, colunas: Dict[str, str], indice: bool = True) -> str:
+    """Tabela HTML com as colunas renomeadas e números com uma casa decimal"""
+    colunas = {col: nome for col, nome in colunas.items() if col in df.columns}
+    return df[list(colunas)].rename(columns=colunas).to_html(
+        index=indice, float_format=lambda valor: f"{valor:.1f}", na_rep="-", border=0
+    )
+
+
+def _figura(fig) -> str:
+    return fig.to_html(full_html=False, include_plotlyjs=False) if fig is not None else ""
+
+
+def _montar_secao(etapa: int, componente: str, respostas: Dict[ChaveResposta, Dict]) -> Tuple[Optional[str], Optional[str]]:
+    """HTML da etapa x componente e o nome da entidade, ou (None, None) se não houver dados"""
+    from nucleo.graficos import GeradorGraficos
+    from nucleo.processamento import ORDEM_CICLOS, ProcessadorDados
+
+    gerais, habilidades = [], []
+    for ciclo, ciclo_label in sorted(dict(config.CICLOS).items()):
+        df = ProcessadorDados.processar_dados_gerais(respostas.get((etapa, componente, ciclo, "geral")), ciclo_label)
+        if df is not None:
+            gerais.append(df)
+        df = ProcessadorDados.processar_dados_habilidades(respostas.get((etapa, componente, ciclo, "habilidades")), ciclo_label)
+        if df is not None:
+            habilidades.append(df)
+
+    if not gerais and not habilidades:
+        return None, None
+
+    df_geral = ProcessadorDados.consolidar(gerais)
+    df_habilidades = ProcessadorDados.consolidar(habilidades)
+    agregados = ProcessadorDados.calcular_agregados(df_geral, df_habilidades)
+    nome = str(agregados.info_entidade['NM_ENTIDADE']) if agregados.info_entidade is not None else None
+
+    partes = [f"<section><h2>{etapa}º Ano — {html.escape(componente)}</h2>"]
+
+    if not agregados.por_ciclo.empty:
+        partes.append("<h3>Resultados por ciclo</h3>")
+        partes.append(_tabela(agregados.por_ciclo, _COLUNAS_CICLO))
+        colunas_niveis = [col for col in ['NU_N01', 'NU_N02', 'NU_N03'] if col in agregados.por_ciclo.columns]
+        partes.append(_figura(GeradorGraficos.criar_grafico_evolucao_niveis(agregados.por_ciclo[colunas_niveis])))
+
+    if not df_habilidades.empty:
+        total = df_habilidades['CD_HABILIDADE'].nunique()
+        selecionadas, _ = ProcessadorDados.selecionar_habilidades(df_habilidades, ORDEM_CICLOS, "todas", total)
+        partes.append("<h3>Taxa de acertos por habilidade</h3>")
+        partes.append(_figura(GeradorGraficos.criar_grafico_habilidades(selecionadas, config)))
+
+        colunas_habilidades = {'CD_HABILIDADE': 'Código', 'DC_HABILIDADE': 'Habilidade', 'TX_ACERTO': 'Acertos (%)'}
+        for ciclo in ORDEM_CICLOS:
+            if ciclo not in agregados.maiores_habilidades:
+                continue
+            partes.append(f"<h3>{ciclo}: maiores e menores desempenhos</h3><div class='colunas'>")
+            partes.append(f"<div>{_tabela(agregados.maiores_habilidades[ciclo], colunas_habilidades, indice=False)}</div>")
+            partes.append(f"<div>{_tabela(agregados.menores_habilidades[ciclo], colunas_habilidades, indice=False)}</div>")
+            partes.append("</div>")
+
+    partes.append("</section>")
+    return "\n".join(partes), nome
+
+
+def renderizar_relatorio(entidade: str, respostas: Dict[ChaveResposta, Dict], caminho: str,
+                         autocontido: bool, dados_de: Optional[float] = None) -> int:
+    """
+    Monta e grava o relatório HTML da entidade; retorna o tamanho do arquivo (bytes)
+
+    dados_de é a data da resposta mais antiga servida do cache com a API
+    indisponível, indicada no cabeçalho.
+    """
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    secoes, nome = [], None
+    for etapa in sorted(config.ETAPAS):
+        for componente in sorted(dict(config.COMPONENTES)):
+            secao, nome_secao = _montar_secao(etapa, componente, respostas)
+            if secao:
+                secoes.append(secao)
+                nome = nome or nome_secao
+
+    if autocontido:
+        script_plotly = f"<script>{get_plotlyjs()}</script>"
+    else:
+        script_plotly = f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+    corpo = "\n".join(secoes) or "<section><p>Não foram encontrados dados para esta entidade.</p></section>"
+    titulo = html.escape(nome or entidade)
+    aviso = ""
+    if dados_de is not None:
+        aviso = (f"<p><strong>⚠️ API do CAEd indisponível: relatório com dados de "
+                 f"{datetime.fromtimestamp(dados_de):%d/%m/%Y %H:%M}.</strong></p>")
+
+    documento = f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Resultados das Avaliações - {titulo}</title>
+<style>{_ESTILO}</style>
+{script_plotly}
+</head>
+<body>
+<header>
+<h1>📊 Resultados das Avaliações - {titulo}</h1>
+<p>Código {html.escape(entidade)} · Dados consolidados dos ciclos de avaliação - CREDE 01 · Gerado em {datetime.now():%d/%m/%Y %H:%M}</p>
+{aviso}
+</header>
+<main>
+{corpo}
+</main>
+<footer>Painel de Resultados das Avaliações - CECOM/CREDE 01 · Secretaria da Educação do Estado do Ceará</footer>
+</body>
+</html>
+"""
+    destino = Path(caminho)
+    temporario = destino.with_suffix(".tmp")
+    temporario.write_text(documento, encoding="utf-8")
+    temporario.replace(destino)
+    return destino.stat().st_size
+
+
+# --------------------------------------------------------------------------
+# Orquestração
+# --------------------------------------------------------------------------
+
+def carregar_manifesto(saida: Path) -> Dict[str, str]:
+    """Hashes dos dados usados na última geração de cada entidade"""
+    try:
+        return json.loads((saida / ARQUIVO_MANIFESTO).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def gravar_manifesto(saida: Path, manifesto: Dict[str, str]):
+    temporario = saida / f"{ARQUIVO_MANIFESTO}.tmp"
+    temporario.write_text(json.dumps(manifesto, indent=2, sort_keys=True), encoding="utf-8")
+    temporario.replace(saida / ARQUIVO_MANIFESTO)
+
+
+def gerar_relatorios(entidades: List[str], municipios: List[str], installation_id: str, session_token: str,
+                     saida: Path, processos: int, concorrencia_api: int, forcar: bool,
+                     autocontido: bool) -> List[ResultadoRelatorio]:
+    """
+    Busca os dados (threads) e monta os relatórios (processos) de todas as entidades
+
+    O relatório de uma entidade é enviado ao pool de processos assim que
+    todas as suas respostas chegam, então busca e montagem se sobrepõem.
+    """
+    saida.mkdir(parents=True, exist_ok=True)
+    manifesto = carregar_manifesto(saida)
+    api_client = APIClient(config, prioridade=PRIORIDADE_SEGUNDO_PLANO)
+
+    respostas: Dict[str, Dict[ChaveResposta, Dict]] = defaultdict(dict)
+    pendentes: Dict[str, int] = {}
+    falhas: Dict[str, str] = {}
+    # Data da resposta mais antiga servida do cache por indisponibilidade da API
+    dados_de: Dict[str, float] = {}
+    inicio_entidade: Dict[str, float] = {}
+    resultados: List[ResultadoRelatorio] = []
+
+    # spawn: os processos não herdam as threads e conexões abertas do processo principal
+    contexto = multiprocessing.get_context("spawn")
+
+    with ThreadPoolExecutor(max_workers=concorrencia_api) as busca, \
+            ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as montagem:
+        futuros_busca = {}
+        for entidade in entidades:
+            requisicoes = listar_requisicoes(entidade, municipios, installation_id, session_token)
+            pendentes[entidade] = len(requisicoes)
+            inicio_entidade[entidade] = time.perf_counter()
+            for chave, payload in requisicoes:
+                futuros_busca[busca.submit(api_client.requisitar_dados, payload)] = (entidade, chave, payload)
+
+        futuros_montagem = {}
+        for futuro in as_completed(futuros_busca):
+            entidade, chave, payload = futuros_busca[futuro]
+            try:
+                respostas[entidade][chave] = futuro.result()
+                contingencia = api_client.contingencias.get(chave_consulta(payload)[0])
+                if contingencia is not None:
+                    dados_de[entidade] = min(contingencia, dados_de.get(entidade, contingencia))
+            except Exception as e:
+                falhas.setdefault(entidade, f"{chave}: {e}")
+
+            pendentes[entidade] -= 1
+            if pendentes[entidade]:
+                continue
+
+            arquivo = saida / f"{entidade}.html"
+            dados = respostas.pop(entidade)
+            if entidade in falhas:
+                resultados.append(ResultadoRelatorio(entidade, "falha", erro=falhas[entidade],
+                                                     duracao=time.perf_counter() - inicio_entidade[entidade]))
+                continue
+
+            resumo = resumir_respostas(dados, dados_de.get(entidade))
+            if not forcar and manifesto.get(entidade) == resumo and arquivo.exists():
+                resultados.append(ResultadoRelatorio(entidade, "inalterado", arquivo=str(arquivo)))
+                continue
+
+            futuro_montagem = montagem.submit(
+                renderizar_relatorio, entidade, dados, str(arquivo), autocontido, dados_de.get(entidade)
+            )
+            futuros_montagem[futuro_montagem] = (entidade, resumo, arquivo)
+
+        for futuro in as_completed(futuros_montagem):
+            entidade, resumo, arquivo = futuros_montagem[futuro]
+            duracao = time.perf_counter() - inicio_entidade[entidade]
+            try:
+                futuro.result()
+                manifesto[entidade] = resumo
+                resultados.append(ResultadoRelatorio(entidade, "gerado", arquivo=str(arquivo), duracao=duracao))
+            except Exception as e:
+                resultados.append(ResultadoRelatorio(entidade, "falha", duracao=duracao, erro=str(e)))
+
+    gravar_manifesto(saida, manifesto)
+    return resultados
+
+
+def imprimir_resumo(resultados: List[ResultadoRelatorio], duracao: float):
+    """Imprime o resumo da geração, com a vazão em relatórios por minuto"""
+    contagem = {status: sum(r.status == status for r in resultados) for status in ("gerado", "inalterado", "falha")}
+    vazao = contagem["gerado"] / (duracao / 60) if duracao > 0 else 0.0
+
+    print(f"\nEntidades: {len(resultados)} em {duracao:.1f}s")
+    print(f"  gerados: {contagem['gerado']}  inalterados: {contagem['inalterado']}  falhas: {contagem['falha']}")
+    print(f"  vazão: {vazao:.1f} relatórios/min")
+
+    for r in sorted(resultados, key=lambda r: r.entidade):
+        if r.status == "falha":
+            print(f"  FALHA {r.entidade}: {r.erro}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera os relatórios HTML de resultados de cada município e escola indígena")
+    parser.add_argument("--saida", default="relatorios", help="diretório dos relatórios (padrão: relatorios)")
+    parser.add_argument("--entidades", nargs="*", help="restringe a geração a estes códigos")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1,
+                        help="processos que montam os relatórios (padrão: número de CPUs)")
+    parser.add_argument("--concorrencia-api", type=int, default=4, help="requisições simultâneas à API (padrão: 4)")
+    parser.add_argument("--forcar", action="store_true", help="regera mesmo os relatórios cujos dados não mudaram")
+    parser.add_argument("--autocontido", action="store_true",
+                        help="embute o plotly.js em cada relatório (abre sem internet, ~4 MB a mais por arquivo)")
+    parser.add_argument("--relatorio", help="grava o resultado de cada entidade neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        segredos = carregar_segredos()
+        installation_id = segredos["api"]["installation_id"]
+        session_token = segredos["api"]["session_token"]
+        municipios = list(segredos["users"])
+        entidades = args.entidades or listar_entidades(segredos)
+    except (KeyError, FileNotFoundError, tomllib.TOMLDecodeError) as e:
+        print(f"Erro na configuração: {e}. Verifique o arquivo secrets.toml", file=sys.stderr)
+        return 2
+
+    print(f"Gerando relatórios de {len(entidades)} entidades em {args.saida} "
+          f"({args.processos} processos, {args.concorrencia_api} requisições simultâneas)...")
+
+    inicio = time.perf_counter()
+    resultados = gerar_relatorios(
+        entidades, municipios, installation_id, session_token, Path(args.saida),
+        args.processos, args.concorrencia_api, args.forcar, args.autocontido
+    )
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+
+    if args.relatorio:
+        with open(args.relatorio, "w", encoding="utf-8") as arquivo:
+            json.dump([asdict(r) for r in resultados], arquivo, ensure_ascii=False, indent=2)
+
+    return 1 if any(r.status == "falha" for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+# --------------------------------------------------------------------------
+# SIMULADOR LOCAL DA API DA CAEd (getDadosResultado)
+# --------------------------------------------------------------------------
+# Servidor HTTP que aceita o mesmo corpo JSON montado pelos payloads do núcleo
+# e responde sem credenciais reais, para desenvolvimento e testes de
+# desempenho. Respeita CD_INDICADOR, filtros (equalTo/containedIn),
+# filtrosAdicionais, nivelAbaixo e ordenacao. Os dados vêm de fixtures
+# gravadas ou são gerados de forma determinística, em escala configurável.
+# Também permite injetar latência, erros e timeouts:
+#
+#   python simulador_caed.py --porta 8765 --escala 10 --latencia 0.2 --taxa-erros 0.05
+#   CAED_API_URL=http://127.0.0.1:8765/ streamlit run Avaliacoes.py
+#
+# No modo de gravação, as requisições são repassadas à API real e as respostas
+# gravadas como fixtures, sem as credenciais, para reprodução posterior:
+#
+#   python simulador_caed.py --gravar fixtures/
+#   python simulador_caed.py --fixtures fixtures/
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from nucleo import indicadores
+from nucleo.cache_respostas import chave_consulta
+from nucleo.config import API_URL_CAED, CONFIG_PADRAO as config
+
+# Campos do payload com credenciais, nunca gravados nas fixtures
+CAMPOS_CREDENCIAIS = ("_InstallationId", "_SessionToken")
+
+# Entidades devolvidas em consultas um nível abaixo, na escala 1
+ENTIDADES_POR_NIVEL = 20
+
+# Faixas de acerto das habilidades (limite inferior, em %)
+FAIXAS_HABILIDADE = ((75, "Alto"), (50, "Médio Alto"), (25, "Médio Baixo"), (0, "Baixo"))
+
+
+def _campo(nome: str) -> str:
+    """Nome da coluna na resposta (os filtros usam o prefixo DADOS.)"""
+    return nome.split(".", 1)[1] if nome.startswith("DADOS.") else nome
+
+
+def _faixa(taxa: float) -> str:
+    return next(faixa for limite, faixa in FAIXAS_HABILIDADE if taxa >= limite)
+
+
+def _codigo_habilidade(codigo: str) -> Tuple[str, str]:
+    """Código e descrição de habilidade derivados do código do indicador"""
+    indicador = indicadores.Indicador.de_codigo(codigo)
+    cd = f"{indicador.componente}{indicador.etapa}H{int(indicador.habilidade or 0):02d}"
+    return cd, f"Habilidade simulada {cd} ({indicador.etapa}º ano)"
+
+
+def gerar_resposta(payload: Dict, escala: float = 1.0, semente: int = 0) -> Dict:
+    """
+    Gera uma resposta sintética para o payload
+
+    O mesmo payload (sem credenciais), escala e semente produzem sempre a mesma
+    resposta. Há uma linha por entidade e indicador; consultas um nível abaixo
+    devolvem ENTIDADES_POR_NIVEL x escala entidades.
+    """
+    consulta = {campo: valor for campo, valor in payload.items() if campo not in CAMPOS_CREDENCIAIS}
+    resumo = json.dumps(consulta, sort_keys=True, ensure_ascii=False)
+    aleatorio = random.Random(hashlib.sha256(f"{semente}|{escala}|{resumo}".encode()).digest())
+
+    agregado = str(payload.get("agregado", ""))
+    filtros = payload.get("filtros", []) + payload.get("filtrosAdicionais", [])
+    fixos = {_campo(f["field"]): f["value"] for f in filtros if f.get("operation") == "equalTo"}
+
+    if str(payload.get("nivelAbaixo", config.NIVEL_ENTIDADE)) == config.NIVEL_ENTIDADE:
+        entidades = [(agregado, f"ENTIDADE {agregado}")]
+    else:
+        quantidade = max(1, round(ENTIDADES_POR_NIVEL * escala))
+        entidades = [(f"{agregado}{i:04d}", f"ENTIDADE {agregado}-{i:04d}") for i in range(1, quantidade + 1)]
+
+    habilidades = indicadores.CATALOGO_HABILIDADES.codigos()
+    linhas = []
+    for cd_entidade, nm_entidade in entidades:
+        # Cada entidade tem um nível de desempenho próprio, para rankings estáveis
+        base = aleatorio.uniform(35, 85)
+        for codigo in payload.get("CD_INDICADOR", []):
+            linha = {"CD_ENTIDADE": cd_entidade, "NM_ENTIDADE": nm_entidade, "CD_INDICADOR": codigo, **fixos}
+
+            if codigo in habilidades:
+                taxa = min(100.0, max(0.0, aleatorio.gauss(base, 15)))
+                cd_habilidade, dc_habilidade = _codigo_habilidade(codigo)
+                linha.update({
+                    "CD_HABILIDADE": cd_habilidade,
+                    "DC_HABILIDADE": dc_habilidade,
+                    "TX_ACERTO": round(taxa, 1),
+                    "DC_FAIXA_PERCENTUAL_HABILIDADE": _faixa(taxa),
+                })
+            else:
+                previstos = aleatorio.randint(20, 400)
+                efetivos = round(previstos * aleatorio.uniform(0.75, 1.0))
+                adequado = round(efetivos * min(0.9, max(0.05, base / 100 + aleatorio.uniform(-0.1, 0.1))))
+                defasagem = round((efetivos - adequado) * aleatorio.uniform(0.2, 0.6))
+                linha.update({
+                    "TX_ACERTOS": round(min(100.0, max(0.0, aleatorio.gauss(base, 5))), 2),
+                    "TX_PARTICIPACAO": round(100 * efetivos / previstos, 2),
+                    "QT_PREVISTO": previstos,
+                    "QT_EFETIVO": efetivos,
+                    "NU_N01": defasagem,
+                    "NU_N02": efetivos - adequado - defasagem,
+                    "NU_N03": adequado,
+                })
+
+            linhas.append(linha)
+
+    return {"result": aplicar_consulta(linhas, payload)}
+
+
+def aplicar_consulta(linhas: List[Dict], payload: Dict) -> List[Dict]:
+    """Aplica os filtros (equalTo/containedIn) e a ordenação do payload às linhas"""
+    for filtro in payload.get("filtros", []) + payload.get("filtrosAdicionais", []):
+        campo, valor = _campo(filtro["field"]), filtro["value"]
+        if filtro.get("operation") == "equalTo":
+            linhas = [linha for linha in linhas if linha.get(campo, valor) == valor]
+        elif filtro.get("operation") == "containedIn":
+            linhas = [linha for linha in linhas if linha.get(campo) in valor]
+
+    # Ordenações estáveis aplicadas da última para a primeira chave
+    for campo, sentido in reversed(payload.get("ordenacao") or []):
+        campo = _campo(campo)
+        linhas.sort(key=lambda linha: (linha.get(campo) is None, linha.get(campo)),
+                    reverse=str(sentido).upper() == "DESC")
+
+    return linhas
+
+
+def _nome_fixture(payload: Dict) -> str:
+    chave, _ = chave_consulta(payload)
+    return hashlib.sha256(chave.encode()).hexdigest()[:24] + ".json"
+
+
+class Simulador:
+    """Estado do simulador: fixtures, injeção de falhas e contadores"""
+
+    def __init__(self, escala: float = 1.0, semente: int = 0, latencia: float = 0.0, jitter: float = 0.0,
+                 taxa_erros: float = 0.0, taxa_timeouts: float = 0.0, duracao_timeout: float = 2 * config.REQUEST_TIMEOUT,
+                 fixtures: Optional[str] = None, somente_fixtures: bool = False,
+                 gravar: Optional[str] = None, origem: str = API_URL_CAED):
+        self.escala = escala
+        self.semente = semente
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_erros = taxa_erros
+        self.taxa_timeouts = taxa_timeouts
+        self.duracao_timeout = duracao_timeout
+        self.somente_fixtures = somente_fixtures
+        self.gravar = Path(gravar) if gravar else None
+        self.origem = origem
+
+        self.fixtures: Dict[str, Dict] = {}
+        if fixtures:
+            for arquivo in Path(fixtures).glob("*.json"):
+                self.fixtures[arquivo.name] = json.loads(arquivo.read_text(encoding="utf-8"))
+        if self.gravar:
+            self.gravar.mkdir(parents=True, exist_ok=True)
+
+        # Falhas sorteadas em sequência reprodutível para a mesma semente
+        self._falhas = random.Random(semente)
+        self._lock = threading.Lock()
+        self.contadores = {"requisicoes": 0, "sinteticas": 0, "reproduzidas": 0, "gravadas": 0,
+                           "erros_injetados": 0, "timeouts_injetados": 0}
+
+    def adicionar_fixture(self, payload: Dict, resposta: Dict, status: int = 200):
+        """Registra em memória a resposta servida para o payload"""
+        self.fixtures[_nome_fixture(payload)] = {"status": status, "resposta": resposta}
+
+    def contar(self, contador: str):
+        with self._lock:
+            self.contadores[contador] += 1
+
+    def sortear_falha(self) -> Optional[str]:
+        """Retorna "timeout", "erro" ou None para a próxima requisição"""
+        with self._lock:
+            sorteio = self._falhas.random()
+            atraso = self.latencia + self._falhas.uniform(0, self.jitter)
+        time.sleep(atraso)
+
+        if sorteio < self.taxa_timeouts:
+            return "timeout"
+        if sorteio < self.taxa_timeouts + self.taxa_erros:
+            return "erro"
+        return None
+
+    def responder(self, payload: Dict) -> Tuple[int, Dict]:
+        """Status e corpo da resposta ao payload"""
+        nome = _nome_fixture(payload)
+
+        if self.gravar:
+            return self._gravar(nome, payload)
+
+        fixture = self.fixtures.get(nome)
+        if fixture is not None:
+            self.contar("reproduzidas")
+            return fixture["status"], fixture["resposta"]
+
+        if self.somente_fixtures:
+            return 404, {"code": 101, "error": f"Fixture não encontrada: {nome}"}
+
+        self.contar("sinteticas")
+        return 200, gerar_resposta(payload, self.escala, self.semente)
+
+    def _gravar(self, nome: str, payload: Dict) -> Tuple[int, Dict]:
+        """Repassa o payload à API real e grava a resposta (sem credenciais) como fixture"""
+        response = requests.post(self.origem, json=payload, timeout=config.REQUEST_TIMEOUT)
+        try:
+            resposta = response.json()
+        except ValueError:
+            resposta = {"code": response.status_code, "error": response.text[:500]}
+
+        fixture = {
+            "consulta": {campo: valor for campo, valor in payload.items() if campo not in CAMPOS_CREDENCIAIS},
+            "status": response.status_code,
+            "resposta": resposta,
+        }
+        destino = self.gravar / nome
+        temporario = destino.with_suffix(".tmp")
+        temporario.write_text(json.dumps(fixture, ensure_ascii=False), encoding="utf-8")
+        temporario.replace(destino)
+
+        self.contar("gravadas")
+        return response.status_code, resposta
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    """Atende POST (consultas) e GET /status (contadores)"""
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo saem em escritas separadas; sem isso, cada resposta
+    # esperaria o ACK atrasado do cliente (~40 ms)
+    disable_nagle_algorithm = True
+    simulador: Simulador = None
+
+    def log_message(self, formato, *args):
+        logging.debug(f"{self.address_string()} {formato % args}")
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/status":
+            with self.simulador._lock:
+                self._enviar(200, dict(self.simulador.contadores))
+        else:
+            self._enviar(404, {"code": 404, "error": "Não encontrado"})
+
+    def do_POST(self):
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self._enviar(400, {"code": 107, "error": "JSON inválido"})
+            return
+
+        self.simulador.contar("requisicoes")
+        falha = self.simulador.sortear_falha()
+
+        if falha == "timeout":
+            # Sem resposta: o cliente esgota o próprio timeout
+            self.simulador.contar("timeouts_injetados")
+            time.sleep(self.simulador.duracao_timeout)
+            self.close_connection = True
+            return
+
+        if falha == "erro":
+            self.simulador.contar("erros_injetados")
+            self._enviar(503, {"code": 503, "error": "Erro injetado pelo simulador"})
+            return
+
+        try:
+            status, corpo = self.simulador.responder(payload)
+        except requests.exceptions.RequestException as e:
+            status, corpo = 502, {"code": 502, "error": f"Falha ao consultar a origem: {e}"}
+        self._enviar(status, corpo)
+
+    def _enviar(self, status: int, corpo: Dict):
+        dados = json.dumps(corpo, ensure_ascii=False).encode()
+        comprimir = "gzip" in self.headers.get("Accept-Encoding", "")
+        if comprimir:
+            dados = gzip.compress(dados, compresslevel=5)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if comprimir:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+
+def criar_servidor(simulador: Simulador, host: str = "127.0.0.1", porta: int = 8765) -> ThreadingHTTPServer:
+    """Cria o servidor HTTP do simulador (porta 0 escolhe uma porta livre)"""
+    manipulador = type("Manipulador", (_Manipulador,), {"simulador": simulador})
+    servidor = ThreadingHTTPServer((host, porta), manipulador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulador local do endpoint getDadosResultado da CAEd")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8765, help="porta de escuta (padrão: 8765)")
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help=f"multiplica as {ENTIDADES_POR_NIVEL} entidades das consultas um nível abaixo (padrão: 1)")
+    parser.add_argument("--semente", type=int, default=0, help="semente dos dados sintéticos e das falhas (padrão: 0)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="latência fixa por requisição, em segundos")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latência adicional aleatória máxima, em segundos")
+    parser.add_argument("--taxa-erros", type=float, default=0.0, help="fração de requisições respondidas com 503")
+    parser.add_argument("--taxa-timeouts", type=float, default=0.0, help="fração de requisições sem resposta")
+    parser.add_argument("--duracao-timeout", type=float, default=2 * config.REQUEST_TIMEOUT,
+                        help="tempo (s) que uma requisição sem resposta fica presa")
+    parser.add_argument("--fixtures", help="diretório de fixtures gravadas a reproduzir")
+    parser.add_argument("--somente-fixtures", action="store_true",
+                        help="responde 404 às consultas sem fixture, em vez de gerar dados")
+    parser.add_argument("--gravar", help="repassa as consultas à API real e grava as respostas neste diretório")
+    parser.add_argument("--origem", default=API_URL_CAED, help="endpoint real usado no modo de gravação")
+    parser.add_argument("--verbose", action="store_true", help="registra cada requisição no log")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(message)s")
+
+    if args.gravar and args.fixtures:
+        parser.error("--gravar e --fixtures não podem ser usados juntos")
+
+    simulador = Simulador(
+        escala=args.escala, semente=args.semente, latencia=args.latencia, jitter=args.jitter,
+        taxa_erros=args.taxa_erros, taxa_timeouts=args.taxa_timeouts, duracao_timeout=args.duracao_timeout,
+        fixtures=args.fixtures, somente_fixtures=args.somente_fixtures, gravar=args.gravar, origem=args.origem
+    )
+    servidor = criar_servidor(simulador, args.host, args.porta)
+    host, porta = servidor.server_address[:2]
+
+    modo = "gravação" if args.gravar else f"reprodução ({len(simulador.fixtures)} fixtures)" if args.fixtures else "sintético"
+    print(f"Simulador em http://{host}:{porta}/ (modo {modo}, escala {args.escala})")
+    print(f"Use CAED_API_URL=http://{host}:{porta}/ para apontar o painel e os scripts para ele", flush=True)
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print(f"Encerrado: {simulador.contadores}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+def _esperar(condicao, prazo: float = 5.0):
+    limite = time.monotonic() + prazo
+    while not condicao():
+        assert time.monotonic() < limite, "condição não atingida a tempo"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def esperar():
+    """Espera (com prazo) até a condição ser verdadeira"""
+    return _esperar
+
+
+@pytest.fixture
+def pool(request):
+    """Pool de threads para chamadas simultâneas (8 threads, ou o parâmetro indireto)"""
+    with ThreadPoolExecutor(max_workers=getattr(request, "param", 8)) as executor:
+        yield executor
@@ -0,0 +1,175 @@
+import json
+import sqlite3
+import zlib
+
+import pytest
+
+from nucleo import cache_respostas
+from nucleo.cache_respostas import CacheRespostas, chave_consulta
+from nucleo.payloads import PayloadGeral
+
+
+class Relogio:
+    """Substitui o módulo time em nucleo.cache_respostas, com o tempo avançado à mão"""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def time(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_respostas, "time", relogio)
+    return relogio
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheRespostas(str(tmp_path / "respostas.sqlite"), 10 * 1024 * 1024)
+
+
+@pytest.fixture
+def consulta():
+    return chave_consulta(PayloadGeral("2300101", "Matemática", 2, "3", "i", "s").criar_payload())
+
+
+def test_chave_ignora_credenciais():
+    chave, dimensoes = chave_consulta(PayloadGeral("2300101", "Matemática", 2, "3", "i", "s").criar_payload())
+    outra, _ = chave_consulta(PayloadGeral("2300101", "Matemática", 2, "3", "x", "y").criar_payload())
+    ciclo, _ = chave_consulta(PayloadGeral("2300101", "Matemática", 2, "4", "i", "s").criar_payload())
+
+    assert chave == outra
+    assert chave != ciclo
+    assert dimensoes["dataset"] == "geral"
+    assert dimensoes["entidade"] == "2300101"
+
+
+def test_ausente(cache, consulta):
+    chave, _ = consulta
+    assert cache.obter(chave) is None
+    assert cache.obter_falha(chave) is None
+
+
+def test_entrada_expira_apos_validade(cache, consulta, relogio):
+    chave, dimensoes = consulta
+    cache.gravar(chave, dimensoes, {"dados": [1]}, validade=60)
+
+    relogio.agora += 59
+    entrada = cache.obter(chave)
+    assert entrada.valor == {"dados": [1]}
+    assert entrada.valida
+    assert entrada.idade == 59
+
+    relogio.agora += 1
+    entrada = cache.obter(chave)
+    assert not entrada.valida
+    assert entrada.valor == {"dados": [1]}  # expirada continua disponível como fallback
+
+
+def test_entrada_sem_validade_nao_expira(cache, consulta, relogio):
+    chave, dimensoes = consulta
+    cache.gravar(chave, dimensoes, {"dados": [1]})
+
+    relogio.agora += 10 * 365 * 86400
+    entrada = cache.obter(chave)
+    assert entrada.expira_em is None
+    assert entrada.valida
+
+
+def test_regravar_renova_validade(cache, consulta, relogio):
+    chave, dimensoes = consulta
+    cache.gravar(chave, dimensoes, {"dados": [1]}, validade=60)
+    relogio.agora += 120
+    cache.gravar(chave, dimensoes, {"dados": [2]}, validade=60)
+
+    entrada = cache.obter(chave)
+    assert entrada.valida
+    assert entrada.valor == {"dados": [2]}
+
+
+def test_falha_expira_apos_validade(cache, consulta, relogio):
+    chave, _ = consulta
+    cache.gravar_falha(chave, "HTTP 503", validade=30)
+
+    relogio.agora += 29
+    assert cache.obter_falha(chave) == "HTTP 503"
+
+    relogio.agora += 1
+    assert cache.obter_falha(chave) is None
+
+
+def test_falha_nao_apaga_resposta(cache, consulta, relogio):
+    chave, dimensoes = consulta
+    cache.gravar(chave, dimensoes, {"dados": [1]}, validade=60)
+    cache.gravar_falha(chave, "HTTP 503", validade=30)
+
+    assert cache.obter(chave).valor == {"dados": [1]}
+    assert cache.obter_falha(chave) == "HTTP 503"
+
+
+def test_gravar_apaga_falha(cache, consulta, relogio):
+    chave, dimensoes = consulta
+    cache.gravar_falha(chave, "HTTP 503", validade=30)
+    cache.gravar(chave, dimensoes, {"dados": [1]}, validade=60)
+
+    assert cache.obter_falha(chave) is None
+
+
+def test_falhas_expiradas_sao_descartadas(cache, consulta, relogio):
+    chave, _ = consulta
+    cache.gravar_falha(chave, "HTTP 503", validade=30)
+    cache.gravar_falha("outra", "HTTP 500", validade=60)
+
+    relogio.agora += 30
+    cache.gravar_falha("terceira", "HTTP 502", validade=30)
+
+    with sqlite3.connect(cache.caminho) as conexao:
+        chaves = {linha[0] for linha in conexao.execute("SELECT chave FROM falhas")}
+    assert chaves == {"outra", "terceira"}
+
+
+def test_descarta_menos_acessadas(tmp_path, relogio):
+    valor = {"dados": list(range(200))}
+    cache = CacheRespostas(str(tmp_path / "respostas.sqlite"), 10 * 1024 * 1024)
+    cache.gravar("a", {}, valor)
+    tamanho = len(zlib.compress(json.dumps(valor).encode(), 6))
+
+    cache.tamanho_maximo = 2 * tamanho
+    relogio.agora += 1
+    cache.gravar("b", {}, valor)
+    relogio.agora += cache_respostas.INTERVALO_ACESSO + 1
+    cache.obter("a")  # "a" passa a ser a mais recente
+    cache.gravar("c", {}, valor)
+
+    assert cache.obter("a") is not None
+    assert cache.obter("b") is None
+    assert cache.obter("c") is not None
+
+
+def test_migra_arquivo_antigo_como_expirado(tmp_path, relogio):
+    caminho = tmp_path / "respostas.sqlite"
+    dados = zlib.compress(json.dumps({"dados": [1]}).encode())
+    with sqlite3.connect(caminho) as conexao:
+        conexao.execute(
+            "CREATE TABLE respostas (chave TEXT PRIMARY KEY, entidade TEXT, etapa TEXT, componente TEXT, "
+            "ciclo TEXT, dataset TEXT, dados BLOB NOT NULL, tamanho INTEGER NOT NULL, "
+            "criado_em REAL NOT NULL, acessado_em REAL NOT NULL)"
+        )
+        conexao.execute(
+            "INSERT INTO respostas VALUES ('a', '', '', '', '', 'geral', ?, ?, 900, 900)", (dados, len(dados))
+        )
+    conexao.close()
+
+    cache = CacheRespostas(str(caminho), 10 * 1024 * 1024)
+    entrada = cache.obter("a")
+    assert entrada.valor == {"dados": [1]}
+    assert entrada.expira_em == 900
+    assert not entrada.valida
+
+    # Abrir de novo não repete a migração nem altera entradas novas
+    cache.gravar("b", {}, {"dados": [2]})
+    CacheRespostas(str(caminho), 10 * 1024 * 1024)
+    assert cache.obter("b").expira_em is None
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from nucleo.api import PRIORIDADE_INTERATIVA, PRIORIDADE_SEGUNDO_PLANO, ChamadaUnica, Governador
+
+
+def test_chamadas_simultaneas_executam_uma_vez(pool, esperar):
+    chamada = ChamadaUnica()
+    liberar = threading.Event()
+    execucoes = []
+
+    def funcao():
+        execucoes.append(threading.current_thread().name)
+        liberar.wait(5)
+        return {"result": [1]}
+
+    futuros = [pool.submit(chamada.executar, "k", funcao) for _ in range(6)]
+    esperar(lambda: chamada.resumo()["coalescidas"] == 5)
+    liberar.set()
+
+    resultados = [futuro.result(5) for futuro in futuros]
+    assert len(execucoes) == 1
+    assert all(resultado is resultados[0] for resultado in resultados)
+    assert chamada.resumo() == {"executadas": 1, "coalescidas": 5, "promovidas": 0, "em_andamento": 0}
+
+
+def test_excecao_chega_a_todos_e_libera_a_chave(pool, esperar):
+    chamada = ChamadaUnica()
+    liberar = threading.Event()
+
+    def falha():
+        liberar.wait(5)
+        raise RuntimeError("falhou")
+
+    futuros = [pool.submit(chamada.executar, "k", falha) for _ in range(4)]
+    esperar(lambda: chamada.resumo()["coalescidas"] == 3)
+    liberar.set()
+
+    for futuro in futuros:
+        with pytest.raises(RuntimeError, match="falhou"):
+            futuro.result(5)
+    # Sem resultado guardado: a próxima chamada executa de novo
+    assert chamada.executar("k", lambda: "nova") == "nova"
+    assert chamada.resumo()["executadas"] == 2
+
+
+def test_chaves_diferentes_nao_sao_coalescidas(pool):
+    chamada = ChamadaUnica()
+    barreira = threading.Barrier(3)
+
+    def funcao(chave):
+        return lambda: (barreira.wait(5), chave)[1]
+
+    futuros = [pool.submit(chamada.executar, chave, funcao(chave)) for chave in ("a", "b", "c")]
+
+    assert [futuro.result(5) for futuro in futuros] == ["a", "b", "c"]
+    assert chamada.resumo()["executadas"] == 3
+
+
+def test_chamada_mais_urgente_promove_a_execucao(pool, esperar):
+    chamada = ChamadaUnica()
+    liberar = threading.Event()
+    promocoes = []
+
+    def funcao():
+        liberar.wait(5)
+        return "ok"
+
+    lider = pool.submit(chamada.executar, "k", funcao, PRIORIDADE_SEGUNDO_PLANO, lambda: promocoes.append(1))
+    esperar(lambda: chamada.resumo()["em_andamento"] == 1)
+    assert chamada.prioridade("k", PRIORIDADE_SEGUNDO_PLANO) == PRIORIDADE_SEGUNDO_PLANO
+
+    # Mesma prioridade: apenas espera
+    pool.submit(chamada.executar, "k", funcao, PRIORIDADE_SEGUNDO_PLANO, lambda: promocoes.append(2))
+    esperar(lambda: chamada.resumo()["coalescidas"] == 1)
+    assert promocoes == []
+
+    interativa = pool.submit(chamada.executar, "k", funcao, PRIORIDADE_INTERATIVA, lambda: promocoes.append(3))
+    esperar(lambda: promocoes == [3])
+    assert chamada.prioridade("k", PRIORIDADE_SEGUNDO_PLANO) == PRIORIDADE_INTERATIVA
+
+    liberar.set()
+    assert lider.result(5) == interativa.result(5) == "ok"
+    assert chamada.resumo()["promovidas"] == 1
+    # Sem execução em andamento, vale o padrão
+    assert chamada.prioridade("k", PRIORIDADE_SEGUNDO_PLANO) == PRIORIDADE_SEGUNDO_PLANO
+
+
+def test_promocao_adianta_a_execucao_na_fila_do_governador(pool, esperar):
+    chamada = ChamadaUnica()
+    governador = Governador(max_em_andamento=1, taxa=1000, rajada=1000, espera_maxima=5)
+    liberar = threading.Event()
+    ordem = []
+
+    def chamar(chave, prioridade, trabalho=lambda: None):
+        def funcao():
+            with governador.reservar(lambda: chamada.prioridade(chave, prioridade)):
+                ordem.append(chave)
+                trabalho()
+            return chave
+        return chamada.executar(chave, funcao, prioridade, governador.reavaliar)
+
+    ocupando = pool.submit(chamar, "ocupando", PRIORIDADE_INTERATIVA, lambda: liberar.wait(5))
+    esperar(lambda: ordem == ["ocupando"])
+    fundo = []
+    for chave in ("l1", "l2", "k"):
+        fundo.append(pool.submit(chamar, chave, PRIORIDADE_SEGUNDO_PLANO))
+        esperar(lambda: governador.resumo()["na_fila"] == len(fundo))
+
+    interativa = pool.submit(chamar, "k", PRIORIDADE_INTERATIVA)
+    esperar(lambda: chamada.resumo()["promovidas"] == 1)
+    liberar.set()
+
+    assert interativa.result(5) == "k"
+    assert [futuro.result(5) for futuro in [ocupando, *fundo]] == ["ocupando", "l1", "l2", "k"]
+    assert ordem == ["ocupando", "k", "l1", "l2"]
+    assert governador.resumo()["atendidas"] == {"interativa": 2, "segundo_plano": 2}
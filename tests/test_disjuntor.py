@@ -0,0 +1,210 @@
+import pytest
+import requests
+
+from nucleo import api
+from nucleo.api import (ABERTO, FECHADO, MEIO_ABERTO, PRIORIDADE_INTERATIVA, APIClient, CircuitoAberto, Disjuntor,
+                        EsperaExcedida, Governador)
+from nucleo.cache_respostas import CacheRespostas
+from nucleo.payloads import PayloadGeral
+
+
+class Relogio:
+    """Substitui o módulo time em nucleo.api, com o tempo avançado à mão"""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(api, "time", relogio)
+    return relogio
+
+
+def chamar(disjuntor: Disjuntor, erro: BaseException = None, relogio: Relogio = None, duracao: float = 0.0):
+    with disjuntor.proteger():
+        if relogio is not None:
+            relogio.agora += duracao
+        if erro is not None:
+            raise erro
+
+
+def falhar(disjuntor: Disjuntor, erro: BaseException = None):
+    erro = erro or requests.exceptions.ConnectionError("fora do ar")
+    with pytest.raises(type(erro)):
+        chamar(disjuntor, erro)
+
+
+def erro_http(status: int) -> requests.exceptions.HTTPError:
+    resposta = requests.models.Response()
+    resposta.status_code = status
+    return requests.exceptions.HTTPError(f"HTTP {status}", response=resposta)
+
+
+def test_abre_apos_falhas_seguidas(relogio):
+    disjuntor = Disjuntor(falhas=3, lentidao=10, espera=30, sondas=1, sucessos=2)
+
+    falhar(disjuntor)
+    falhar(disjuntor)
+    chamar(disjuntor)  # sucesso zera a contagem
+    falhar(disjuntor)
+    falhar(disjuntor)
+    assert disjuntor.resumo()["estado"] == FECHADO
+
+    falhar(disjuntor)
+    assert disjuntor.resumo() == {"estado": ABERTO, "falhas_seguidas": 3, "aberturas": 1, "rejeitadas": 0}
+
+
+def test_aberto_rejeita_sem_executar(relogio):
+    disjuntor = Disjuntor(falhas=1, espera=30)
+    falhar(disjuntor)
+    executou = []
+
+    with pytest.raises(CircuitoAberto):
+        with disjuntor.proteger():
+            executou.append(True)
+
+    assert executou == []
+    assert disjuntor.resumo()["rejeitadas"] == 1
+    assert isinstance(CircuitoAberto(), requests.exceptions.ConnectionError)
+
+
+def test_meio_aberto_limita_sondas_e_fecha_apos_sucessos(relogio):
+    disjuntor = Disjuntor(falhas=1, espera=30, sondas=1, sucessos=2)
+    falhar(disjuntor)
+
+    relogio.agora += 29.9
+    with pytest.raises(CircuitoAberto):
+        chamar(disjuntor)
+
+    relogio.agora += 0.1
+    with disjuntor.proteger():
+        assert disjuntor.estado == MEIO_ABERTO
+        # A única sonda está em andamento
+        with pytest.raises(CircuitoAberto):
+            chamar(disjuntor)
+
+    assert disjuntor.estado == MEIO_ABERTO
+    chamar(disjuntor)
+    assert disjuntor.resumo()["estado"] == FECHADO
+    assert disjuntor.resumo()["rejeitadas"] == 2
+
+
+def test_falha_da_sonda_reabre(relogio):
+    disjuntor = Disjuntor(falhas=2, espera=30, sondas=1, sucessos=2)
+    falhar(disjuntor)
+    falhar(disjuntor)
+
+    relogio.agora += 30
+    chamar(disjuntor)
+    falhar(disjuntor)
+
+    assert disjuntor.resumo()["estado"] == ABERTO
+    assert disjuntor.resumo()["aberturas"] == 2
+    # A espera recomeça a partir da nova abertura
+    relogio.agora += 29
+    with pytest.raises(CircuitoAberto):
+        chamar(disjuntor)
+
+
+def test_resposta_lenta_conta_como_falha(relogio):
+    disjuntor = Disjuntor(falhas=2, lentidao=10)
+
+    chamar(disjuntor, relogio=relogio, duracao=10)
+    assert disjuntor.resumo()["falhas_seguidas"] == 0
+
+    chamar(disjuntor, relogio=relogio, duracao=10.5)
+    chamar(disjuntor, relogio=relogio, duracao=11)
+    assert disjuntor.resumo()["estado"] == ABERTO
+
+
+@pytest.mark.parametrize("erro, conta", [
+    (requests.exceptions.ConnectionError("conexão"), True),
+    (requests.exceptions.ReadTimeout("lento"), True),
+    (requests.exceptions.InvalidJSONError("corpo malformado"), True),
+    (erro_http(503), True),
+    (erro_http(404), False),
+    (EsperaExcedida("fila cheia"), False),
+    (KeyError("erro do chamador"), False),
+])
+def test_erros_que_contam_como_falha(relogio, erro, conta):
+    disjuntor = Disjuntor(falhas=1)
+
+    falhar(disjuntor, erro)
+
+    assert (disjuntor.resumo()["estado"] == ABERTO) is conta
+
+
+def test_erro_que_nao_conta_libera_a_sonda(relogio):
+    disjuntor = Disjuntor(falhas=1, espera=30, sondas=1, sucessos=1)
+    falhar(disjuntor)
+    relogio.agora += 30
+
+    falhar(disjuntor, erro_http(404))
+    assert disjuntor.estado == MEIO_ABERTO
+
+    chamar(disjuntor)
+    assert disjuntor.estado == FECHADO
+
+
+def test_verificar_nao_reserva_sonda(relogio):
+    disjuntor = Disjuntor(falhas=1, espera=30, sondas=1, sucessos=1)
+    falhar(disjuntor)
+
+    with pytest.raises(CircuitoAberto):
+        disjuntor.verificar()
+
+    relogio.agora += 30
+    disjuntor.verificar()
+    disjuntor.verificar()
+    with disjuntor.proteger():
+        # A única sonda está em andamento
+        with pytest.raises(CircuitoAberto):
+            disjuntor.verificar()
+
+    disjuntor.verificar()
+    assert disjuntor.resumo() == {"estado": FECHADO, "falhas_seguidas": 0, "aberturas": 1, "rejeitadas": 2}
+
+
+class GovernadorEspiao(Governador):
+    """Governador que registra as reservas"""
+
+    def __init__(self):
+        super().__init__(max_em_andamento=1, taxa=1000, rajada=1000, espera_maxima=5)
+        self.reservas = 0
+
+    def reservar(self, prioridade=PRIORIDADE_INTERATIVA):
+        self.reservas += 1
+        return super().reservar(prioridade)
+
+
+class TransporteEspiao:
+    """Transporte que só conta as requisições"""
+
+    def __init__(self):
+        self.requisicoes = 0
+
+    def post(self, *args, **kwargs):
+        self.requisicoes += 1
+        raise requests.exceptions.ConnectionError("fora do ar")
+
+
+def test_circuito_aberto_nao_passa_pelo_governador(relogio, tmp_path):
+    disjuntor = Disjuntor(falhas=1, espera=30)
+    falhar(disjuntor)
+    governador = GovernadorEspiao()
+    transporte = TransporteEspiao()
+    cliente = APIClient(transporte=transporte, cache=CacheRespostas(str(tmp_path / "respostas.sqlite"), 1024 * 1024),
+                        governador=governador, disjuntor=disjuntor)
+    payload = PayloadGeral("2300101", "Matemática", 2, "3", "i", "s").criar_payload()
+
+    with pytest.raises(CircuitoAberto):
+        cliente.atualizar_cache(payload)
+
+    assert governador.reservas == 0
+    assert transporte.requisicoes == 0
+    assert disjuntor.resumo()["rejeitadas"] == 1
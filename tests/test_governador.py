@@ -0,0 +1,130 @@
+import dataclasses
+import threading
+import time
+
+import pytest
+
+from nucleo.api import PRIORIDADE_INTERATIVA, PRIORIDADE_SEGUNDO_PLANO, EsperaExcedida, Governador
+from nucleo.config import CONFIG_PADRAO
+
+
+def test_interativas_passam_a_frente_e_ordem_de_chegada_se_mantem(pool, esperar):
+    governador = Governador(max_em_andamento=1, taxa=1000, rajada=1000, espera_maxima=5)
+    liberar = threading.Event()
+    ordem = []
+
+    def chamar(nome, prioridade, trabalho=lambda: None):
+        with governador.reservar(prioridade):
+            ordem.append(nome)
+            trabalho()
+
+    futuros = [pool.submit(chamar, "ocupando", PRIORIDADE_INTERATIVA, lambda: liberar.wait(5))]
+    esperar(lambda: ordem == ["ocupando"])
+    chegada = [("b0", PRIORIDADE_SEGUNDO_PLANO), ("i0", PRIORIDADE_INTERATIVA), ("b1", PRIORIDADE_SEGUNDO_PLANO),
+               ("i1", PRIORIDADE_INTERATIVA), ("b2", PRIORIDADE_SEGUNDO_PLANO)]
+    for nome, prioridade in chegada:
+        futuros.append(pool.submit(chamar, nome, prioridade))
+        esperar(lambda: governador.resumo()["na_fila"] == len(futuros) - 1)
+
+    liberar.set()
+    for futuro in futuros:
+        futuro.result(5)
+
+    assert ordem == ["ocupando", "i0", "i1", "b0", "b1", "b2"]
+    resumo = governador.resumo()
+    assert resumo["atendidas"] == {"interativa": 3, "segundo_plano": 3}
+    assert resumo["fila_maxima"] == 5
+    assert (resumo["em_andamento"], resumo["na_fila"]) == (0, 0)
+
+
+@pytest.mark.parametrize("pool", [16], indirect=True)
+def test_limite_de_chamadas_em_andamento(pool):
+    governador = Governador(max_em_andamento=3, taxa=1000, rajada=1000, espera_maxima=5)
+    lock = threading.Lock()
+    em_andamento, pico = 0, 0
+
+    def chamar():
+        nonlocal em_andamento, pico
+        with governador.reservar():
+            with lock:
+                em_andamento += 1
+                pico = max(pico, em_andamento)
+            time.sleep(0.02)
+            with lock:
+                em_andamento -= 1
+
+    for futuro in [pool.submit(chamar) for _ in range(12)]:
+        futuro.result(5)
+
+    assert pico == 3
+
+
+def test_taxa_sustentada_apos_a_rajada():
+    governador = Governador(max_em_andamento=10, taxa=50, rajada=2, espera_maxima=5)
+
+    inicio = time.monotonic()
+    for _ in range(6):
+        with governador.reservar():
+            pass
+    decorrido = time.monotonic() - inicio
+
+    # 2 fichas da rajada na hora, as outras 4 a 50/s
+    assert decorrido >= 4 / 50 * 0.9
+    assert decorrido < 1.0
+
+
+def test_espera_excedida_sai_da_fila_sem_afetar_as_demais(pool, esperar):
+    governador = Governador(max_em_andamento=1, taxa=1000, rajada=1000, espera_maxima=0.1)
+    liberar = threading.Event()
+
+    def ocupar():
+        with governador.reservar():
+            liberar.wait(5)
+
+    ocupando = pool.submit(ocupar)
+    esperar(lambda: governador.resumo()["em_andamento"] == 1)
+
+    with pytest.raises(EsperaExcedida):
+        with governador.reservar():
+            pass
+
+    resumo = governador.resumo()
+    assert (resumo["na_fila"], resumo["esperas_excedidas"]) == (0, 1)
+    liberar.set()
+    ocupando.result(5)
+    with governador.reservar():
+        assert governador.resumo()["em_andamento"] == 1
+
+
+@pytest.mark.parametrize("parametros", [
+    {"taxa": 0},
+    {"taxa": -1.0},
+    {"max_em_andamento": 0},
+    {"rajada": 0},
+    {"espera_maxima": -1},
+])
+def test_parametros_invalidos(parametros):
+    with pytest.raises(ValueError):
+        Governador(**parametros)
+
+
+def test_orcamento_dividido_entre_processos():
+    config = dataclasses.replace(
+        CONFIG_PADRAO, MAX_CHAMADAS_SIMULTANEAS=8, TAXA_CHAMADAS=10.0, RAJADA_CHAMADAS=10,
+        FRACAO_SEGUNDO_PLANO=0.25, PROCESSOS_SEGUNDO_PLANO=2
+    )
+
+    painel = Governador.para_processo(config, PRIORIDADE_INTERATIVA)
+    lote = Governador.para_processo(config, PRIORIDADE_SEGUNDO_PLANO)
+
+    assert (painel.max_em_andamento, painel.taxa, painel.rajada) == (6, 7.5, 8)
+    assert (lote.max_em_andamento, lote.taxa, lote.rajada) == (1, 1.25, 1)
+    assert painel.taxa + 2 * lote.taxa == config.TAXA_CHAMADAS
+
+
+@pytest.mark.parametrize("fracao, processos", [(0, 1), (1, 1), (0.25, 0)])
+def test_divisao_do_orcamento_invalida(fracao, processos):
+    config = dataclasses.replace(CONFIG_PADRAO, FRACAO_SEGUNDO_PLANO=fracao, PROCESSOS_SEGUNDO_PLANO=processos)
+
+    with pytest.raises(ValueError, match="orçamento"):
+        Governador.para_processo(config)
@@ -0,0 +1,63 @@
+import pytest
+
+from nucleo import indicadores
+from nucleo.indicadores import CatalogoIndicadores, Indicador
+
+
+def test_decompoe_codigo_de_habilidade():
+    indicador = Indicador.de_codigo("62016MT1714")
+
+    assert indicador == Indicador(prefixo="6", colecao="2016", componente="MT", etapa=4, habilidade="14")
+    assert indicador.codigo == "62016MT1714"
+
+
+def test_decompoe_codigo_geral_sem_habilidade():
+    indicador = Indicador.de_codigo("11988LP14")
+
+    assert (indicador.componente, indicador.etapa, indicador.habilidade) == ("LP", 1, "")
+    assert indicador.codigo == "11988LP14"
+
+
+@pytest.mark.parametrize("codigo", ["", "XYZ", "11988PT14", "11988LP19", "11988LP04", "11988LP2"])
+def test_codigo_fora_do_padrao(codigo):
+    with pytest.raises(ValueError, match="fora do padrão"):
+        Indicador.de_codigo(codigo)
+
+
+@pytest.mark.parametrize("originais", [indicadores.INDIC_GERAL, indicadores.INDIC_HABILIDADES])
+def test_todos_os_codigos_reconstroem_o_original(originais):
+    for codigo in originais:
+        assert Indicador.de_codigo(codigo).codigo == codigo
+
+
+@pytest.mark.parametrize("catalogo, originais", [
+    (indicadores.CATALOGO_GERAL, indicadores.INDIC_GERAL),
+    (indicadores.CATALOGO_HABILIDADES, indicadores.INDIC_HABILIDADES),
+])
+def test_filtrar_particiona_o_catalogo(catalogo, originais):
+    filtrados = [
+        codigo
+        for etapa in range(1, 6)
+        for componente in ("LP", "MT")
+        for codigo in catalogo.filtrar(etapa, componente)
+    ]
+
+    assert len(filtrados) == len(set(filtrados))
+    assert set(filtrados) == set(originais)
+
+
+def test_filtrar_seleciona_etapa_e_componente():
+    catalogo = CatalogoIndicadores(["11988LP14", "11988MT14", "11988LP15", "62016MT1714", "62016MT1501"])
+
+    assert catalogo.filtrar(1, "LP") == ("11988LP14",)
+    assert catalogo.filtrar(4, "MT") == ("62016MT1714",)
+    assert catalogo.filtrar(2, "MT") == ("62016MT1501",)
+    assert catalogo.filtrar(3, "LP") == ()
+
+
+def test_validar_aponta_codigos_divergentes():
+    catalogo = CatalogoIndicadores(["11988LP14"])
+
+    catalogo.validar(["11988LP14"])
+    with pytest.raises(ValueError, match="11988MT14"):
+        catalogo.validar(["11988LP14", "11988MT14"])
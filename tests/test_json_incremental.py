@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from nucleo.json_incremental import decodificar_em_colunas
+
+
+def em_pedacos(corpo: bytes, tamanho: int):
+    return [corpo[i:i + tamanho] for i in range(0, len(corpo), tamanho)]
+
+
+def em_colunas(objeto: dict, campo: str = "result") -> dict:
+    """O que decodificar_em_colunas deve produzir, a partir do json.loads"""
+    registros = objeto.get(campo)
+    if not isinstance(registros, list):
+        return objeto
+    campos = list(dict.fromkeys(c for registro in registros for c in registro))
+    return {**objeto, campo: {c: [registro.get(c) for registro in registros] for c in campos}}
+
+
+CORPOS = [
+    # Escapes, acentos (UTF-8 de vários bytes), par substituto e emoji cru
+    '{"result": [{"NM_ENTIDADE": "S\\u00c3O GON\\u00c7ALO \\"CE\\"", "DC": "a\\\\b\\/c\\n\\t", '
+    '"X": "\\ud83d\\ude00"}, {"NM_ENTIDADE": "CRATEÚS 😀", "DC": "", "X": null}]}',
+    # Números longos que atravessam pedaços, valores aninhados e campos ausentes
+    '{"total": 3, "result": [{"A": 123456789.125e-3, "B": [1, {"c": true}]}, {"B": -0.5}, '
+    '{"C": false, "A": 1e10}], "extra": {"result": "interno"}}',
+    # Espaços entre os tokens
+    ' \n{ "result" : [ { "A" : 1 } , { "A" : 2 } ] , "code" : 200 } \n',
+    '{"result": []}',
+    '{"result": [], "code": 204}',
+    '{}',
+    '{"result": null, "error": "sem dados"}',
+]
+
+
+@pytest.mark.parametrize("corpo", CORPOS)
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 7, 64 * 1024])
+def test_equivale_ao_json_loads(corpo, tamanho):
+    dados = corpo.encode()
+
+    assert decodificar_em_colunas(em_pedacos(dados, tamanho)) == em_colunas(json.loads(dados))
+
+
+def test_campo_de_registros_configuravel():
+    corpo = b'{"result": [{"A": 1}], "linhas": [{"A": 1}, {"B": 2}]}'
+
+    resultado = decodificar_em_colunas([corpo], campo_registros="linhas")
+
+    assert resultado == {"result": [{"A": 1}], "linhas": {"A": [1, None], "B": [None, 2]}}
+
+
+@pytest.mark.parametrize("corpo", [CORPOS[0], CORPOS[1], '{"result": []}'])
+def test_corpo_truncado_falha_em_qualquer_ponto(corpo):
+    dados = corpo.encode()
+
+    for corte in range(len(dados)):
+        with pytest.raises(ValueError):
+            decodificar_em_colunas(em_pedacos(dados[:corte], 5))
+
+
+@pytest.mark.parametrize("corpo", [
+    b'[{"A": 1}]',
+    b'{"result": [{"A": 1} {"A": 2}]}',
+    b'{"result": [{"A": 1},]}',
+    b'{"result": [1, 2]}',
+    b'{"result" [{"A": 1}]}',
+    b'{"result": [{"A": \xff}]}',
+])
+def test_corpo_malformado(corpo):
+    with pytest.raises(ValueError):
+        decodificar_em_colunas(em_pedacos(corpo, 4))